@@ -1,12 +1,15 @@
-from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi import FastAPI, HTTPException, Depends, Header, Request
 from pydantic import BaseModel
 import os
-import json
+import asyncio
 import time
 from web3 import Web3
 from prometheus_client import Counter, Histogram, Gauge, generate_latest
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, Response
 from typing import Optional
+from sim_chain import SimulatedChain, PRESETS
+from contract_loader import ContractLoader, StartupTimer
+from chain_monitor import ChainMonitor
 
 app = FastAPI(title="AnchorChain API", version="2.0.0")
 
@@ -15,30 +18,49 @@ RPC_URL = os.getenv("RPC_URL", "http://anvil:8545")
 CHAIN_ID = int(os.getenv("CHAIN_ID", "31337"))
 PRIVATE_KEY = os.getenv("PRIVATE_KEY")
 API_TOKEN = os.getenv("API_TOKEN", "demo-token-123")
+DEPLOYMENT_PATH = os.getenv("DEPLOYMENT_PATH", "/shared/anchor/deployment.json")
+CONTRACT_POLL_INTERVAL = float(os.getenv("CONTRACT_POLL_INTERVAL", "2"))
+CHAIN_MONITOR_INTERVAL = float(os.getenv("CHAIN_MONITOR_INTERVAL", "2"))
+# "sim" never contacts RPC_URL; "node" checks it before each simulated transaction
+CHAIN_BACKEND = os.getenv("CHAIN_BACKEND", "node")
+SIM_PRESET = os.getenv("SIM_PRESET", "testnet" if CHAIN_ID != 31337 else "local")
+SIM_CONFIG = {
+    **PRESETS[SIM_PRESET],
+    **{key: os.getenv(f"SIM_{key.upper()}") for key in ("rpc_latency", "gas_price_gwei") if os.getenv(f"SIM_{key.upper()}")},
+}
 
-# Initialize Web3 connection
+# Initialize Web3 connection; handlers read the monitor's snapshot instead of calling the node
 w3 = Web3(Web3.HTTPProvider(RPC_URL))
+chain_monitor = ChainMonitor(w3, interval=CHAIN_MONITOR_INTERVAL)
 
-# Load contract deployment info
+# Simulated chain used for every transaction this API records
+sim_chain = SimulatedChain(
+    chain_id=CHAIN_ID,
+    block_time=float(os.getenv("SIM_BLOCK_TIME", SIM_CONFIG["block_time"])),
+    gas_limit=int(os.getenv("SIM_GAS_LIMIT", "30000000")),
+    rpc_latency=SIM_CONFIG["rpc_latency"],
+    gas_price_gwei=SIM_CONFIG["gas_price_gwei"],
+    failure_rate=float(os.getenv("SIM_FAILURE_RATE", "0")),
+    revert_rate=float(os.getenv("SIM_REVERT_RATE", "0")),
+    max_pending=int(os.getenv("SIM_MAX_PENDING", "5120")),
+    seed=int(os.environ["SIM_SEED"]) if os.getenv("SIM_SEED") else None
+)
+SIM_SENDER = "0x" + "a1" * 20
+
+# Contract deployment info, loaded in the background and reloaded when the file changes
 CONTRACT_ADDRESS = None
 CONTRACT_ABI = []
+background_tasks = set()
 
-def load_contract_info():
-    """Load contract info from shared volume"""
+def apply_deployment(deployment):
+    """Swap in the contract info from a (re)written deployment.json"""
     global CONTRACT_ADDRESS, CONTRACT_ABI
-    try:
-        with open("/shared/anchor/deployment.json", "r") as f:
-            deployment = json.load(f)
-            CONTRACT_ABI = deployment["abi"]
-            CONTRACT_ADDRESS = deployment["contract_address"]
-            print(f"✅ Contract loaded: {CONTRACT_ADDRESS}")
-    except FileNotFoundError:
-        print("⚠️ No deployment.json found, using mock mode")
-    except Exception as e:
-        print(f"⚠️ Error loading contract: {e}")
+    CONTRACT_ABI = deployment["abi"]
+    CONTRACT_ADDRESS = deployment["contract_address"]
+    print(f"✅ Contract loaded: {CONTRACT_ADDRESS}")
 
-# Load contract info on startup
-load_contract_info()
+startup_timer = StartupTimer()
+contract_loader = ContractLoader(DEPLOYMENT_PATH, apply_deployment, poll_interval=CONTRACT_POLL_INTERVAL, timer=startup_timer)
 
 # Enhanced Prometheus Metrics
 anchorchain_tx_success = Counter("anchorchain_tx_success_total", "Successful AnchorChain transactions")
@@ -58,9 +80,33 @@ anchorchain_tx_confirm_time = Histogram(
     buckets=[1, 2, 5, 10, 30, 60, 120, float("inf")]
 )
 
-# System metrics
+# System metrics (endpoint is the route template, e.g. /verify/{soul_hash}, so label values stay bounded)
 api_requests_total = Counter("api_requests_total", "Total API requests", ["endpoint", "method"])
+api_request_duration = Histogram(
+    "api_request_duration_seconds",
+    "API request latency in seconds",
+    ["endpoint", "method"],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf")]
+)
+# Write path broken into stages: validate, encode, broadcast, first_seen (chain inclusion), mined (receipt seen)
+write_stage_seconds = Histogram(
+    "anchorchain_write_stage_seconds",
+    "Time spent in each stage of the anchor write path",
+    ["stage"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, float("inf")]
+)
 blockchain_connection_status = Gauge("blockchain_connection_status", "Blockchain connection status (1=connected, 0=disconnected)")
+chain_head_block = Gauge("chain_head_block", "Latest block number seen by the chain monitor")
+chain_block_age_seconds = Gauge("chain_block_age_seconds", "Seconds since the latest block's timestamp")
+chain_rpc_latency_seconds = Gauge("chain_rpc_latency_seconds", "Latency of the chain monitor's last head query")
+
+def chain_connected():
+    return sim_chain.is_connected() if CHAIN_BACKEND == "sim" else chain_monitor.connected
+
+blockchain_connection_status.set_function(lambda: float(chain_connected()))
+chain_head_block.set_function(lambda: chain_monitor.head_block or 0)
+chain_block_age_seconds.set_function(lambda: chain_monitor.block_age() or 0)
+chain_rpc_latency_seconds.set_function(lambda: chain_monitor.rpc_latency or 0)
 
 class AnchorRequest(BaseModel):
     agentId: str
@@ -88,40 +134,38 @@ def verify_api_token(authorization: Optional[str] = Header(None)):
 async def track_requests(request, call_next):
     """Track API requests"""
     start_time = time.time()
+    request.state.start_time = start_time
     response = await call_next(request)
     
-    # Update metrics
-    api_requests_total.labels(
-        endpoint=request.url.path,
-        method=request.method
-    ).inc()
+    # Label with the matched route template, not the raw path
+    endpoint = getattr(request.scope.get("route"), "path", "unmatched")
+    api_requests_total.labels(endpoint=endpoint, method=request.method).inc()
+    api_request_duration.labels(endpoint=endpoint, method=request.method).observe(time.time() - start_time)
     
     return response
 
 @app.post("/anchor")
-def anchor_soul_state(request: AnchorRequest, token: str = Depends(verify_api_token)):
+async def anchor_soul_state(request: AnchorRequest, http_request: Request, token: str = Depends(verify_api_token)):
     """Anchor soul state to blockchain with enhanced metrics"""
+    # Body parsing, validation and auth happen before the handler runs
+    write_stage_seconds.labels(stage="validate").observe(time.time() - http_request.state.start_time)
     
-    # Update blockchain connection status
-    blockchain_connected = w3.is_connected()
-    blockchain_connection_status.set(1 if blockchain_connected else 0)
+    blockchain_connected = chain_connected()
     
     # For demo purposes, continue even if blockchain is not connected
     if not blockchain_connected:
         print("⚠️ Blockchain not connected, running in mock mode")
     
     try:
-        start_time = time.time()
-        
         # Determine if we're in testnet or local mode
         is_testnet = CHAIN_ID != 31337
         
-        if blockchain_connected and is_testnet and CONTRACT_ADDRESS:
-            # Real testnet transaction (simplified for demo)
-            tx_hash, gas_cost, confirmation_time = simulate_testnet_transaction(request)
-        else:
-            # Local/mock transaction (works even without blockchain connection)
-            tx_hash, gas_cost, confirmation_time = simulate_local_transaction(request)
+        # Transactions go through the simulated chain (works even without blockchain connection)
+        tx_hash, receipt = await simulate_transaction(request)
+        if receipt["status"] != 1:
+            raise Exception(f"Transaction {tx_hash} reverted")
+        gas_cost = receipt["effectiveGasPriceGwei"]
+        confirmation_time = receipt["confirmationTime"]
         
         # Record success metrics
         anchorchain_tx_success.inc()
@@ -141,8 +185,8 @@ def anchor_soul_state(request: AnchorRequest, token: str = Depends(verify_api_to
             "status": "success",
             "txHash": tx_hash,
             "contractAddress": CONTRACT_ADDRESS or "0x" + "0" * 40,
-            "blockNumber": int(time.time()) % 1000000,  # Mock block number
-            "gasUsed": int(gas_cost * 21000),  # Approximate gas used
+            "blockNumber": receipt["blockNumber"],
+            "gasUsed": receipt["gasUsed"],
             "costGwei": gas_cost,
             "confirmationTime": confirmation_time,
             "explorerUrl": explorer_url,
@@ -156,51 +200,29 @@ def anchor_soul_state(request: AnchorRequest, token: str = Depends(verify_api_to
         resurrection_verify_fail.inc()
         raise HTTPException(status_code=500, detail=f"Transaction failed: {str(e)}")
 
-def simulate_testnet_transaction(request: AnchorRequest):
-    """Simulate testnet transaction with realistic metrics"""
-    import hashlib
-    import random
-    
-    # Generate realistic transaction hash
-    tx_data = f"{request.agentId}{request.identityHash}{time.time()}"
-    tx_hash = "0x" + hashlib.sha256(tx_data.encode()).hexdigest()
-    
-    # Realistic testnet metrics
-    gas_cost = random.uniform(25.0, 150.0)  # Gwei
-    confirmation_time = random.uniform(3.0, 15.0)  # seconds
-    
-    # Simulate network delay
-    time.sleep(min(confirmation_time, 5.0))
-    
-    return tx_hash, gas_cost, confirmation_time
+async def simulate_transaction(request: AnchorRequest):
+    """Notarize the request's soul hash on the simulated chain and wait for the receipt"""
+    with write_stage_seconds.labels(stage="encode").time():
+        soul_hash = Web3.keccak(text=f"{request.agentId}:{request.identityHash}:{request.missionHash}")
+    with write_stage_seconds.labels(stage="broadcast").time():
+        tx_hash = await sim_chain.send_transaction(SIM_SENDER, "notarizeResurrection", bytes(soul_hash))
+    with write_stage_seconds.labels(stage="mined").time():
+        receipt = await sim_chain.wait_for_receipt(tx_hash)
+    write_stage_seconds.labels(stage="first_seen").observe(receipt["confirmationTime"])
+    return tx_hash, receipt
 
-def simulate_local_transaction(request: AnchorRequest):
-    """Simulate local transaction with faster metrics"""
-    import hashlib
-    import random
-    
-    # Generate transaction hash
-    tx_data = f"{request.agentId}{request.identityHash}{time.time()}"
-    tx_hash = "0x" + hashlib.sha256(tx_data.encode()).hexdigest()
-    
-    # Local network metrics
-    gas_cost = random.uniform(10.0, 50.0)  # Gwei
-    confirmation_time = random.uniform(0.5, 3.0)  # seconds
-    
-    # Simulate processing time
-    time.sleep(min(confirmation_time, 2.0))
-    
-    return tx_hash, gas_cost, confirmation_time
+@app.get("/sim/status")
+def sim_status():
+    """Simulated chain state: head block, mempool depth, mined transactions"""
+    return {"backend": CHAIN_BACKEND, "preset": SIM_PRESET, **sim_chain.status()}
 
 @app.get("/health")
 def health_check():
-    """Enhanced health check endpoint"""
-    blockchain_connected = w3.is_connected()
-    blockchain_connection_status.set(1 if blockchain_connected else 0)
-    
+    """Enhanced health check endpoint (served from the chain monitor's last snapshot)"""
     return {
         "status": "healthy",
-        "blockchain_connected": blockchain_connected,
+        "blockchain_connected": chain_connected(),
+        "chain": chain_monitor.status() if CHAIN_BACKEND != "sim" else None,
         "contract_configured": bool(CONTRACT_ADDRESS),
         "chain_id": CHAIN_ID,
         "rpc_url": RPC_URL,
@@ -208,15 +230,28 @@ def health_check():
         "timestamp": time.time()
     }
 
+@app.get("/live")
+def live():
+    """Liveness: the server is answering requests"""
+    return {"status": "alive"}
+
+@app.get("/ready")
+def ready(response: Response):
+    """Readiness: the simulated chain is producing blocks and the deployment file is loaded"""
+    is_ready = sim_chain.running and contract_loader.loaded
+    if not is_ready:
+        response.status_code = 503
+    return {
+        "ready": is_ready,
+        "contract": contract_loader.status(),
+        "startup": startup_timer.status()
+    }
+
 @app.get("/contract-info")
 def contract_info():
     """Get contract information"""
     if not CONTRACT_ADDRESS:
-        # Try to reload contract info
-        load_contract_info()
-        
-        if not CONTRACT_ADDRESS:
-            raise HTTPException(status_code=404, detail="Contract not deployed")
+        raise HTTPException(status_code=404, detail="Contract not deployed")
     
     # Determine explorer URL based on chain
     if CHAIN_ID == 80002:  # Polygon Amoy
@@ -251,7 +286,10 @@ def root():
         "endpoints": {
             "health": "/health",
             "anchor": "/anchor (POST, requires Bearer token)",
+            "live": "/live",
+            "ready": "/ready",
             "contract-info": "/contract-info",
+            "sim-status": "/sim/status",
             "metrics": "/metrics"
         }
     }
@@ -263,4 +301,16 @@ async def startup_event():
     print(f"   RPC URL: {RPC_URL}")
     print(f"   Chain ID: {CHAIN_ID}")
     print(f"   Mode: {'testnet' if CHAIN_ID != 31337 else 'local'}")
-    print(f"   Contract: {CONTRACT_ADDRESS or 'Not loaded'}")
+    print(f"   Contract: {DEPLOYMENT_PATH} (loaded in the background)")
+    print(f"   Chain backend: {CHAIN_BACKEND} (simulated {SIM_PRESET} chain, {sim_chain.block_time}s blocks)")
+    sim_chain.start()
+    loops = [contract_loader.run()] + ([chain_monitor.run()] if CHAIN_BACKEND != "sim" else [])
+    for loop in loops:
+        task = asyncio.create_task(loop)
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+    startup_timer.mark("serving")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await sim_chain.stop()
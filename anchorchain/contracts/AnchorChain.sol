@@ -9,11 +9,19 @@ contract AnchorChain {
         bool verified;
     }
     
+    struct MerkleBatch {
+        uint256 timestamp;
+        address notarizer;
+        uint256 leafCount;
+    }
+    
     mapping(bytes32 => ResurrectionRecord) public records;
+    mapping(bytes32 => MerkleBatch) public merkleBatches;
     mapping(address => uint256) public gasSpent;
     
     event ResurrectionNotarized(bytes32 indexed soulHash, address indexed notarizer, uint256 timestamp);
     event ResurrectionVerified(bytes32 indexed soulHash, bool success);
+    event MerkleRootNotarized(bytes32 indexed merkleRoot, address indexed notarizer, uint256 leafCount, uint256 timestamp);
     
     function notarizeResurrection(bytes32 _soulHash) external {
         uint256 gasStart = gasleft();
@@ -29,6 +37,22 @@ contract AnchorChain {
         emit ResurrectionNotarized(_soulHash, msg.sender, block.timestamp);
     }
     
+    function notarizeResurrectionBatch(bytes32[] calldata _soulHashes) external {
+        uint256 gasStart = gasleft();
+        
+        for (uint256 i = 0; i < _soulHashes.length; i++) {
+            records[_soulHashes[i]] = ResurrectionRecord({
+                soulHash: _soulHashes[i],
+                timestamp: block.timestamp,
+                notarizer: msg.sender,
+                verified: false
+            });
+            emit ResurrectionNotarized(_soulHashes[i], msg.sender, block.timestamp);
+        }
+        
+        gasSpent[msg.sender] += gasStart - gasleft();
+    }
+    
     function verifyResurrection(bytes32 _soulHash) external returns (bool) {
         ResurrectionRecord storage record = records[_soulHash];
         require(record.timestamp > 0, "Record not found");
@@ -41,4 +65,36 @@ contract AnchorChain {
     function getRecord(bytes32 _soulHash) external view returns (ResurrectionRecord memory) {
         return records[_soulHash];
     }
+    
+    // Anchors the root of an off-chain Merkle tree of soul hashes.
+    // Leaves are keccak256(0x00 || soulHash), nodes keccak256(0x01 || left || right).
+    function notarizeMerkleRoot(bytes32 _root, uint256 _leafCount) external {
+        require(_leafCount > 0, "Empty batch");
+        require(merkleBatches[_root].timestamp == 0, "Root already notarized");
+        
+        merkleBatches[_root] = MerkleBatch({
+            timestamp: block.timestamp,
+            notarizer: msg.sender,
+            leafCount: _leafCount
+        });
+        
+        emit MerkleRootNotarized(_root, msg.sender, _leafCount, block.timestamp);
+    }
+    
+    function verifyInclusion(bytes32 _soulHash, bytes32[] calldata _proof, uint256 _index, bytes32 _root) external view returns (bool) {
+        if (merkleBatches[_root].timestamp == 0 || _index >= merkleBatches[_root].leafCount) {
+            return false;
+        }
+        
+        bytes32 node = keccak256(abi.encodePacked(bytes1(0x00), _soulHash));
+        for (uint256 i = 0; i < _proof.length; i++) {
+            if (_index & 1 == 1) {
+                node = keccak256(abi.encodePacked(bytes1(0x01), _proof[i], node));
+            } else {
+                node = keccak256(abi.encodePacked(bytes1(0x01), node, _proof[i]));
+            }
+            _index >>= 1;
+        }
+        return node == _root;
+    }
 }
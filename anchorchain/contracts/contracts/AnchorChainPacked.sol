@@ -0,0 +1,109 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.19;
+
+// Same external interface and events as AnchorChain, with each record packed
+// into a single storage slot (uint64 timestamp + address + bool) and no
+// per-call gasSpent bookkeeping. The soul hash is the mapping key, so it is
+// not stored again. gasSpent is kept in the ABI so clients built against
+// AnchorChain still link, but it reverts: the counter is what this layout drops.
+contract AnchorChainPacked {
+    struct ResurrectionRecord {
+        bytes32 soulHash;
+        uint256 timestamp;
+        address notarizer;
+        bool verified;
+    }
+
+    struct PackedRecord {
+        uint64 timestamp;
+        address notarizer;
+        bool verified;
+    }
+
+    struct PackedBatch {
+        uint64 timestamp;
+        address notarizer;
+        uint32 leafCount;
+    }
+
+    mapping(bytes32 => PackedRecord) private packedRecords;
+    mapping(bytes32 => PackedBatch) private packedBatches;
+
+    event ResurrectionNotarized(bytes32 indexed soulHash, address indexed notarizer, uint256 timestamp);
+    event ResurrectionVerified(bytes32 indexed soulHash, bool success);
+    event MerkleRootNotarized(bytes32 indexed merkleRoot, address indexed notarizer, uint256 leafCount, uint256 timestamp);
+
+    function notarizeResurrection(bytes32 _soulHash) external {
+        packedRecords[_soulHash] = PackedRecord(uint64(block.timestamp), msg.sender, false);
+        emit ResurrectionNotarized(_soulHash, msg.sender, block.timestamp);
+    }
+
+    function notarizeResurrectionBatch(bytes32[] calldata _soulHashes) external {
+        PackedRecord memory record = PackedRecord(uint64(block.timestamp), msg.sender, false);
+        for (uint256 i = 0; i < _soulHashes.length; i++) {
+            packedRecords[_soulHashes[i]] = record;
+            emit ResurrectionNotarized(_soulHashes[i], msg.sender, block.timestamp);
+        }
+    }
+
+    function verifyResurrection(bytes32 _soulHash) external returns (bool) {
+        PackedRecord storage record = packedRecords[_soulHash];
+        require(record.timestamp > 0, "Record not found");
+
+        record.verified = true;
+        emit ResurrectionVerified(_soulHash, true);
+        return true;
+    }
+
+    function records(bytes32 _soulHash) external view returns (bytes32 soulHash, uint256 timestamp, address notarizer, bool verified) {
+        PackedRecord memory record = packedRecords[_soulHash];
+        if (record.timestamp == 0) {
+            return (bytes32(0), 0, address(0), false);
+        }
+        return (_soulHash, record.timestamp, record.notarizer, record.verified);
+    }
+
+    function gasSpent(address) external pure returns (uint256) {
+        revert("gasSpent is not tracked by AnchorChainPacked");
+    }
+
+    function getRecord(bytes32 _soulHash) external view returns (ResurrectionRecord memory) {
+        PackedRecord memory record = packedRecords[_soulHash];
+        if (record.timestamp == 0) {
+            return ResurrectionRecord(bytes32(0), 0, address(0), false);
+        }
+        return ResurrectionRecord(_soulHash, record.timestamp, record.notarizer, record.verified);
+    }
+
+    // Leaves are keccak256(0x00 || soulHash), nodes keccak256(0x01 || left || right).
+    function notarizeMerkleRoot(bytes32 _root, uint256 _leafCount) external {
+        require(_leafCount > 0 && _leafCount <= type(uint32).max, "Invalid batch size");
+        require(packedBatches[_root].timestamp == 0, "Root already notarized");
+
+        packedBatches[_root] = PackedBatch(uint64(block.timestamp), msg.sender, uint32(_leafCount));
+        emit MerkleRootNotarized(_root, msg.sender, _leafCount, block.timestamp);
+    }
+
+    function merkleBatches(bytes32 _root) external view returns (uint256 timestamp, address notarizer, uint256 leafCount) {
+        PackedBatch memory batch = packedBatches[_root];
+        return (batch.timestamp, batch.notarizer, batch.leafCount);
+    }
+
+    function verifyInclusion(bytes32 _soulHash, bytes32[] calldata _proof, uint256 _index, bytes32 _root) external view returns (bool) {
+        PackedBatch memory batch = packedBatches[_root];
+        if (batch.timestamp == 0 || _index >= batch.leafCount) {
+            return false;
+        }
+
+        bytes32 node = keccak256(abi.encodePacked(bytes1(0x00), _soulHash));
+        for (uint256 i = 0; i < _proof.length; i++) {
+            if (_index & 1 == 1) {
+                node = keccak256(abi.encodePacked(bytes1(0x01), _proof[i], node));
+            } else {
+                node = keccak256(abi.encodePacked(bytes1(0x01), node, _proof[i]));
+            }
+            _index >>= 1;
+        }
+        return node == _root;
+    }
+}
@@ -18,6 +18,11 @@ module.exports = {
       url: "http://ganache:8545",
       chainId: 1337,
       accounts: ["0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"]
+    },
+    anvil: {
+      url: process.env.ANVIL_URL || "http://localhost:8545",
+      chainId: 31337,
+      accounts: ["0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"]
     }
   }
 };
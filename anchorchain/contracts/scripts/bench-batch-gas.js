@@ -0,0 +1,40 @@
+const { ethers } = require("hardhat");
+
+// Gas per record for notarizeResurrection vs notarizeResurrectionBatch.
+// Run against a local Anvil node started with a high block gas limit so the
+// largest batches fit in one block:
+//   anvil --gas-limit 100000000
+//   npx hardhat run scripts/bench-batch-gas.js --network anvil
+const BATCH_SIZES = (process.env.BATCH_SIZES || "1,10,50,100,250,500").split(",").map(Number);
+
+function randomHashes(count) {
+  return Array.from({ length: count }, () => ethers.utils.hexlify(ethers.utils.randomBytes(32)));
+}
+
+async function main() {
+  const AnchorChain = await ethers.getContractFactory("AnchorChain");
+  const anchorChain = await AnchorChain.deploy();
+  await anchorChain.deployed();
+
+  const single = await (await anchorChain.notarizeResurrection(randomHashes(1)[0])).wait();
+  const results = [{ mode: "single", size: 1, gasUsed: single.gasUsed.toNumber(), gasPerRecord: single.gasUsed.toNumber() }];
+
+  for (const size of BATCH_SIZES) {
+    try {
+      const tx = await anchorChain.notarizeResurrectionBatch(randomHashes(size), { gasLimit: 90000000 });
+      const receipt = await tx.wait();
+      const gasUsed = receipt.gasUsed.toNumber();
+      results.push({ mode: "batch", size, gasUsed, gasPerRecord: Math.round(gasUsed / size) });
+    } catch (error) {
+      results.push({ mode: "batch", size, error: error.reason || error.message });
+    }
+  }
+
+  console.table(results);
+  console.log(JSON.stringify(results));
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exitCode = 1;
+});
@@ -0,0 +1,67 @@
+const { ethers } = require("hardhat");
+
+// Compares gas per operation between the original AnchorChain storage layout
+// and AnchorChainPacked. Soul hashes are derived from a fixed seed so runs are
+// repeatable; run against a fresh local Anvil node:
+//   anvil
+//   npx hardhat run scripts/bench-layout-gas.js --network anvil
+const RUNS = Number(process.env.BENCH_RUNS || 20);
+const BATCH_SIZE = Number(process.env.BENCH_BATCH_SIZE || 100);
+const LAYOUTS = ["AnchorChain", "AnchorChainPacked"];
+
+function soulHash(layout, op, i) {
+  return ethers.utils.id(`bench:${layout}:${op}:${i}`);
+}
+
+function average(values) {
+  return Math.round(values.reduce((a, b) => a + b, 0) / values.length);
+}
+
+async function measure(layout) {
+  const Factory = await ethers.getContractFactory(layout);
+  const contract = await Factory.deploy();
+  const deployReceipt = await contract.deployTransaction.wait();
+
+  const notarize = [];
+  const verify = [];
+  const getRecord = [];
+  for (let i = 0; i < RUNS; i++) {
+    const hash = soulHash(layout, "single", i);
+    notarize.push((await (await contract.notarizeResurrection(hash)).wait()).gasUsed.toNumber());
+    verify.push((await (await contract.verifyResurrection(hash)).wait()).gasUsed.toNumber());
+    getRecord.push((await contract.estimateGas.getRecord(hash)).toNumber());
+  }
+
+  const batchHashes = Array.from({ length: BATCH_SIZE }, (_, i) => soulHash(layout, "batch", i));
+  const batchReceipt = await (await contract.notarizeResurrectionBatch(batchHashes, { gasLimit: 30000000 })).wait();
+
+  return {
+    layout,
+    deploy: deployReceipt.gasUsed.toNumber(),
+    notarize: average(notarize),
+    verify: average(verify),
+    getRecord: average(getRecord),
+    batchPerRecord: Math.round(batchReceipt.gasUsed.toNumber() / BATCH_SIZE),
+  };
+}
+
+async function main() {
+  const results = [];
+  for (const layout of LAYOUTS) {
+    results.push(await measure(layout));
+  }
+
+  const [base, packed] = results;
+  const savings = { layout: "savings %" };
+  for (const key of ["deploy", "notarize", "verify", "getRecord", "batchPerRecord"]) {
+    savings[key] = Number((100 * (base[key] - packed[key]) / base[key]).toFixed(1));
+  }
+
+  console.table([...results, savings]);
+  console.log(JSON.stringify({ runs: RUNS, batchSize: BATCH_SIZE, results, savings }));
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exitCode = 1;
+});
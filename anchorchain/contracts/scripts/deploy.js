@@ -2,7 +2,8 @@ const { ethers } = require("hardhat");
 const fs = require("fs");
 
 async function main() {
-  const AnchorChain = await ethers.getContractFactory("AnchorChain");
+  // CONTRACT_NAME=AnchorChainPacked deploys the single-slot storage layout
+  const AnchorChain = await ethers.getContractFactory(process.env.CONTRACT_NAME || "AnchorChain");
   const anchorChain = await AnchorChain.deploy();
   
   await anchorChain.deployed();
@@ -0,0 +1,131 @@
+import asyncio
+import hashlib
+import math
+from collections import OrderedDict
+
+from starlette.concurrency import run_in_threadpool
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over byte strings (no false negatives)"""
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: bytes):
+        # Double hashing; soul hashes may be zero-padded, so digest them first
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: bytes):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: bytes):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+
+class AnchorDeduper:
+    """Makes anchoring idempotent per soul hash and per ``Idempotency-Key``.
+
+    Concurrent requests for the same soul hash share one in-flight
+    submission. Finished submissions are kept in a bounded LRU table of
+    ``max_results`` records; every anchored hash also goes into a Bloom
+    filter, and a filter hit that has fallen out of the table is resolved by
+    ``lookup(soul_hash)`` (blocking, local state only) instead of the chain.
+    ``known(soul_hash)`` can stand in for the filter on hashes anchored before
+    this process started (e.g. the on-disk anchor snapshot).
+    Records ``stale(record)`` (blocking; it may read the outbox) reports as
+    failed are dropped so the hash can be anchored again.
+    """
+
+    def __init__(self, lookup=None, stale=None, known=None, max_results=100000, max_keys=100000,
+                 filter_capacity=1000000, filter_error_rate=0.001):
+        self.lookup = lookup
+        self.known = known
+        self.stale = stale
+        self.max_results = max_results
+        self.max_keys = max_keys
+        self.results = OrderedDict()
+        self.keys = OrderedDict()
+        self.filter = BloomFilter(filter_capacity, filter_error_rate)
+        self._inflight = {}
+
+    def add(self, soul_hash: bytes):
+        """Mark a hash as anchored elsewhere (e.g. seen in the event index)"""
+        self.filter.add(soul_hash)
+
+    def remember(self, soul_hash: bytes, record: dict):
+        self.results[soul_hash] = record
+        self.results.move_to_end(soul_hash)
+        while len(self.results) > self.max_results:
+            self.results.popitem(last=False)
+        self.filter.add(soul_hash)
+
+    def bind_key(self, key: str, soul_hash: bytes):
+        """Tie an Idempotency-Key to one soul hash; reusing it for another raises ValueError"""
+        bound = self.keys.get(key)
+        if bound is not None and bound != soul_hash:
+            raise ValueError("Idempotency-Key was already used for a different soul hash")
+        self.keys[key] = soul_hash
+        self.keys.move_to_end(key)
+        while len(self.keys) > self.max_keys:
+            self.keys.popitem(last=False)
+
+    async def resolve(self, soul_hash: bytes):
+        """Record of an earlier anchoring of ``soul_hash``, or None"""
+        record = self.results.get(soul_hash)
+        if record is not None:
+            if self.stale and await run_in_threadpool(self.stale, record):
+                self.results.pop(soul_hash, None)
+                return None
+            if soul_hash in self.results:
+                self.results.move_to_end(soul_hash)
+            return record
+        if self.lookup and (soul_hash in self.filter or (self.known and self.known(soul_hash))):
+            record = await run_in_threadpool(self.lookup, soul_hash)
+            if record is not None:
+                self.remember(soul_hash, record)
+            return record
+        return None
+
+    async def run(self, soul_hash: bytes, submit):
+        """Anchor once: returns ``(record, deduplicated)``.
+
+        ``submit`` is an async callable returning the new record; it is only
+        called when no earlier or in-flight anchoring of the hash exists.
+        """
+        future = self._inflight.get(soul_hash)
+        if future is not None:
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[soul_hash] = future
+        try:
+            record = await self.resolve(soul_hash)
+            deduplicated = record is not None
+            if record is None:
+                record = await submit()
+                self.remember(soul_hash, record)
+            future.set_result(record)
+            return record, deduplicated
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved: requests that joined the future re-raise it themselves
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(soul_hash, None)
+
+    def status(self):
+        return {
+            "results": len(self.results),
+            "in_flight": len(self._inflight),
+            "filter_entries": self.filter.count,
+            "filter_bytes": len(self.filter.bits),
+        }
@@ -0,0 +1,221 @@
+import heapq
+import math
+import mmap
+import os
+import struct
+import threading
+
+from anchor_dedup import BloomFilter
+
+HASH_SIZE = 32
+# Log records: soul hash + big-endian block number it was indexed at
+LOG_RECORD = struct.Struct('>32sQ')
+# Bloom file header: magic, bit count, hash count, entries, snapshot entries it covers, last block
+BLOOM_HEADER = struct.Struct('<4sQQQQq')
+BLOOM_MAGIC = b'ABF1'
+
+
+class AnchorSnapshot:
+    """On-disk set of every anchored soul hash, answering membership without the chain.
+
+    ``path`` holds the hashes as a sorted array of 32-byte records that is
+    memory-mapped, never read into memory, and binary-searched in place.
+    Hashes added since the last compaction are appended to ``path.log`` and
+    kept in a small in-memory set. A Bloom filter in front turns most misses
+    into a few bit tests; it is saved to ``path.bloom`` on compaction so a
+    restart only replays the log. ``compact()`` merges the log into a new
+    sorted file (streamed, so memory stays flat) and swaps it in while
+    lookups continue against the old mapping.
+    """
+
+    def __init__(self, path, capacity=1000000, error_rate=0.001, compact_at=100000):
+        self.path = path
+        self.log_path = path + '.log'
+        self.bloom_path = path + '.bloom'
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.compact_at = compact_at
+        self.last_block = -1
+        self.compactions = 0
+        self.pending = set()
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._sorted = (None, 0)
+        self._map()
+        self.filter = self._load_filter()
+        self._replay_log()
+        self._log = open(self.log_path, 'ab')
+
+    def _map(self):
+        """Map the sorted file; (mapping, entry count) is swapped as one tuple so readers see a matching pair"""
+        if not os.path.exists(self.path):
+            open(self.path, 'wb').close()
+        with open(self.path, 'rb') as f:
+            entries = os.fstat(f.fileno()).st_size // HASH_SIZE
+            self._sorted = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if entries else None, entries)
+
+    @staticmethod
+    def _sorted_hashes(mm, entries, batch=4096):
+        for start in range(0, entries, batch):
+            block = mm[start * HASH_SIZE:min(entries, start + batch) * HASH_SIZE]
+            for offset in range(0, len(block), HASH_SIZE):
+                yield block[offset:offset + HASH_SIZE]
+
+    def _build_filter(self, path):
+        """Bloom filter over a sorted file, sized for twice its entries (at least ``capacity``)"""
+        with open(path, 'rb') as f:
+            entries = os.fstat(f.fileno()).st_size // HASH_SIZE
+            bloom = BloomFilter(max(self.capacity, entries * 2), self.error_rate)
+            if entries:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for soul_hash in self._sorted_hashes(mm, entries):
+                        bloom.add(soul_hash)
+        return bloom
+
+    def _filter_full(self, entries):
+        capacity = self.filter.size * math.log(2) ** 2 / -math.log(self.error_rate)
+        return entries > capacity
+
+    def _load_filter(self):
+        """Saved filter if it covers the current sorted file, else one rebuilt from it"""
+        try:
+            with open(self.bloom_path, 'rb') as f:
+                magic, size, hashes, count, covered, last_block = BLOOM_HEADER.unpack(f.read(BLOOM_HEADER.size))
+                bits = f.read()
+            if magic == BLOOM_MAGIC:
+                self.last_block = last_block
+            if magic == BLOOM_MAGIC and covered == self._sorted[1] and len(bits) == (size + 7) // 8:
+                bloom = BloomFilter.__new__(BloomFilter)
+                bloom.size, bloom.hashes, bloom.bits, bloom.count = size, hashes, bytearray(bits), count
+                return bloom
+        except (FileNotFoundError, struct.error):
+            pass
+        return self._build_filter(self.path)
+
+    def _save_filter(self):
+        tmp = self.bloom_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, self.filter.size, self.filter.hashes, self.filter.count,
+                                      self._sorted[1], self.last_block))
+            f.write(self.filter.bits)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.bloom_path)
+
+    def _replay_log(self):
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'rb') as f:
+            data = f.read()
+        # A torn final record from a crash mid-append is dropped
+        whole = len(data) - len(data) % LOG_RECORD.size
+        if whole != len(data):
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(whole)
+        for soul_hash, block_number in LOG_RECORD.iter_unpack(data[:whole]):
+            self._remember(soul_hash, block_number)
+
+    def _remember(self, soul_hash, block_number):
+        if soul_hash not in self:
+            self.pending.add(soul_hash)
+            self.filter.add(soul_hash)
+        self.last_block = max(self.last_block, block_number)
+
+    def add_many(self, items):
+        """Record ``(soul_hash, block_number)`` pairs, appending new hashes to the log"""
+        with self._lock:
+            for soul_hash, block_number in items:
+                if soul_hash not in self:
+                    self._log.write(LOG_RECORD.pack(soul_hash, block_number))
+                self._remember(soul_hash, block_number)
+            self._log.flush()
+
+    def add(self, soul_hash: bytes, block_number=0):
+        self.add_many([(soul_hash, block_number)])
+
+    def __contains__(self, soul_hash: bytes):
+        if soul_hash not in self.filter:
+            return False
+        if soul_hash in self.pending:
+            return True
+        mm, entries = self._sorted
+        lo, hi = 0, entries
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = mm[mid * HASH_SIZE:(mid + 1) * HASH_SIZE]
+            if probe == soul_hash:
+                return True
+            if probe < soul_hash:
+                lo = mid + 1
+            else:
+                hi = mid
+        return False
+
+    def __len__(self):
+        return self._sorted[1] + len(self.pending)
+
+    def needs_compaction(self):
+        return len(self.pending) >= self.compact_at
+
+    def rebuild(self, sorted_hashes, last_block):
+        """Rewrite the sorted file from ``sorted_hashes`` (ascending), e.g. the event index, plus logged hashes"""
+        with self._compact_lock:
+            merged = set(self.pending)
+            self._swap(heapq.merge(sorted_hashes, sorted(merged)), merged, last_block, rebuild_filter=True)
+
+    def compact(self):
+        """Merge logged hashes into the sorted file; hashes added meanwhile stay in the log"""
+        with self._compact_lock:
+            merged = set(self.pending)
+            if not merged:
+                return False
+            mm, entries = self._sorted
+            stream = heapq.merge(self._sorted_hashes(mm, entries), sorted(merged))
+            self._swap(stream, merged, self.last_block, rebuild_filter=self._filter_full(entries + len(merged)))
+            return True
+
+    def _swap(self, stream, merged, last_block, rebuild_filter):
+        tmp = self.path + '.tmp'
+        previous = None
+        with open(tmp, 'wb', buffering=1 << 20) as f:
+            for soul_hash in stream:
+                if soul_hash == previous:
+                    continue
+                f.write(soul_hash)
+                previous = soul_hash
+            f.flush()
+            os.fsync(f.fileno())
+        bloom = self._build_filter(tmp) if rebuild_filter else None
+        os.replace(tmp, self.path)
+        with self._lock:
+            # Readers holding the old mapping finish on it; it is closed once unreferenced
+            self._map()
+            self.pending -= merged
+            if bloom is not None:
+                for soul_hash in self.pending:
+                    bloom.add(soul_hash)
+                self.filter = bloom
+            self.last_block = max(self.last_block, last_block)
+            self._save_filter()
+            self._rewrite_log()
+            self.compactions += 1
+
+    def _rewrite_log(self):
+        tmp = self.log_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            for soul_hash in self.pending:
+                f.write(LOG_RECORD.pack(soul_hash, self.last_block))
+        self._log.close()
+        os.replace(tmp, self.log_path)
+        self._log = open(self.log_path, 'ab')
+
+    def status(self):
+        return {
+            "path": self.path,
+            "entries": len(self),
+            "sorted_entries": self._sorted[1],
+            "pending": len(self.pending),
+            "last_block": self.last_block,
+            "compactions": self.compactions,
+            "filter_bytes": len(self.filter.bits),
+        }
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: throughput of StreamHasher, the hasher behind /anchor/upload,
+per algorithm with and without the chunk-level Merkle tree. Runs offline.
+
+    python bench_hashing.py --size-mb 256 --block-kb 1024
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+from eth_hash.auto import keccak
+
+from stream_hasher import ALGORITHMS, StreamHasher
+
+
+def measure(size, block, algorithm, chunk_size):
+    data = os.urandom(block)
+    hasher = StreamHasher(algorithm, chunk_size=chunk_size)
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(size // block):
+        hasher.update(data)
+    hasher.finish()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    mb = hasher.size / 2**20
+    return {"mb_s": round(mb / wall, 1), "cpu_mb_s": round(mb / cpu, 1) if cpu else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming upload hashing microbenchmark")
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--block-kb", type=int, default=1024, help="bytes handed to update() at a time (UPLOAD_HASH_BLOCK)")
+    parser.add_argument("--chunk-kb", type=int, default=1024, help="Merkle chunk size (UPLOAD_CHUNK_SIZE)")
+    args = parser.parse_args()
+
+    block = args.block_kb * 1024
+    size = max(block, args.size_mb * 2**20 // block * block)
+
+    # Streaming digests must match one-shot hashing of the same bytes
+    sample = os.urandom(3 * block + 17)
+    for algorithm, one_shot in (("sha256", hashlib.sha256(sample).digest()), ("keccak", keccak(sample))):
+        hasher = StreamHasher(algorithm, chunk_size=block)
+        for start in range(0, len(sample), 4096):
+            hasher.update(sample[start:start + 4096])
+        assert hasher.finish() == one_shot and len(hasher.chunk_hashes) == 4
+
+    results = {}
+    for algorithm in ALGORITHMS:
+        results[algorithm] = measure(size, block, algorithm, None)
+        results[f"{algorithm}+merkle"] = measure(size, block, algorithm, args.chunk_kb * 1024)
+    print(json.dumps({"size_mb": size // 2**20, "block_kb": args.block_kb, "chunk_kb": args.chunk_kb, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from web3 import Web3
+
+# event name -> signature of every AnchorChain event the index stores
+EVENTS = {
+    "ResurrectionNotarized": "ResurrectionNotarized(bytes32,address,uint256)",
+    "ResurrectionVerified": "ResurrectionVerified(bytes32,bool)",
+    "SoulStateAnchored": "SoulStateAnchored(address,bytes32,uint256)",
+    "MerkleRootNotarized": "MerkleRootNotarized(bytes32,address,uint256,uint256)",
+}
+TOPIC_TO_EVENT = {'0x' + bytes(Web3.keccak(text=sig)).hex(): name for name, sig in EVENTS.items()}
+
+# Substrings providers use when an eth_getLogs range is too large
+RANGE_LIMIT_ERRORS = ("block range", "range limit", "more than", "too many", "limit exceeded", "response size", "query timeout")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    tx_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    soul_hash TEXT,
+    account TEXT,
+    timestamp INTEGER,
+    block_number INTEGER NOT NULL,
+    extra TEXT,
+    PRIMARY KEY (tx_hash, log_index)
+);
+CREATE INDEX IF NOT EXISTS idx_events_soul_hash ON events (soul_hash);
+CREATE INDEX IF NOT EXISTS idx_events_account ON events (account, event);
+CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_block ON events (block_number);
+CREATE TABLE IF NOT EXISTS indexer_state (key TEXT PRIMARY KEY, value INTEGER);
+"""
+
+
+def _hex(value):
+    return '0x' + bytes(value).hex()
+
+
+def _topic_address(topic):
+    return '0x' + bytes(topic)[-20:].hex()
+
+
+class EventIndexer:
+    """Backfills and follows AnchorChain events into a local SQLite index.
+
+    Logs are fetched with ``eth_getLogs`` over ``chunk_size``-block ranges,
+    ``workers`` ranges at a time. A range the provider rejects as too large
+    is split in half and the chunk size is lowered for later ranges.
+    ``soul_hash`` holds the soul hash (or Merkle root, or anchored state hash)
+    and ``account`` the notarizer or entity address. ``on_store(rows)`` is
+    called with each committed batch of rows.
+    """
+
+    def __init__(self, w3, address, db_path, start_block=0, chunk_size=2000, workers=4, confirmations=0,
+                 on_store=None):
+        self.w3 = w3
+        self.address = address
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.min_chunk_size = 1
+        self.workers = workers
+        self.confirmations = confirmations
+        self.on_store = on_store
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    @property
+    def last_block(self):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM indexer_state WHERE key = 'last_block'").fetchone()
+        return row[0] if row else self.start_block - 1
+
+    def sync(self):
+        """Index every block from the last indexed one up to the (confirmed) head"""
+        head = self.w3.eth.block_number - self.confirmations
+        start = self.last_block + 1
+        while start <= head:
+            # One round = ``workers`` chunks fetched in parallel, committed together
+            ranges = []
+            for _ in range(self.workers):
+                if start > head:
+                    break
+                end = min(start + self.chunk_size - 1, head)
+                ranges.append((start, end))
+                start = end + 1
+            results = list(self._executor.map(lambda r: self._fetch(*r), ranges))
+            self._store([log for logs in results for log in logs], ranges[-1][1])
+        return head
+
+    def _fetch(self, from_block, to_block):
+        try:
+            return self.w3.eth.get_logs({
+                "address": self.address,
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "topics": [list(TOPIC_TO_EVENT)],
+            })
+        except Exception as e:
+            if from_block == to_block or not any(s in str(e).lower() for s in RANGE_LIMIT_ERRORS):
+                raise
+            middle = (from_block + to_block) // 2
+            self.chunk_size = max(self.min_chunk_size, min(self.chunk_size, middle - from_block + 1))
+            return self._fetch(from_block, middle) + self._fetch(middle + 1, to_block)
+
+    def _decode(self, log):
+        event = TOPIC_TO_EVENT.get(_hex(log['topics'][0]))
+        if event is None:
+            return None
+        topics, data = log['topics'], bytes(log['data'])
+        soul_hash = account = timestamp = extra = None
+        if event == "ResurrectionNotarized":
+            soul_hash, account = _hex(topics[1]), _topic_address(topics[2])
+            (timestamp,) = self.w3.codec.decode(['uint256'], data)
+        elif event == "ResurrectionVerified":
+            soul_hash = _hex(topics[1])
+            (success,) = self.w3.codec.decode(['bool'], data)
+            extra = str(success).lower()
+        elif event == "SoulStateAnchored":
+            account = _topic_address(topics[1])
+            state_hash, timestamp = self.w3.codec.decode(['bytes32', 'uint256'], data)
+            soul_hash = _hex(state_hash)
+        elif event == "MerkleRootNotarized":
+            soul_hash, account = _hex(topics[1]), _topic_address(topics[2])
+            leaf_count, timestamp = self.w3.codec.decode(['uint256', 'uint256'], data)
+            extra = str(leaf_count)
+        return (_hex(log['transactionHash']), log['logIndex'], event, soul_hash, account,
+                timestamp, log['blockNumber'], extra)
+
+    def _store(self, logs, last_block):
+        rows = [row for row in (self._decode(log) for log in logs) if row is not None]
+        with self._lock:
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO indexer_state (key, value) VALUES ('last_block', ?)", (last_block,)
+                )
+        if self.on_store and rows:
+            self.on_store(rows)
+
+    def query(self, event=None, soul_hash=None, account=None, since=None, until=None, limit=100, offset=0):
+        """Indexed events matching every given filter, oldest first"""
+        clauses, params = [], []
+        for column, value in (("event", event), ("soul_hash", soul_hash), ("account", account)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value.lower() if column != "event" else value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (f"SELECT event, soul_hash, account, timestamp, block_number, tx_hash, log_index, extra "
+               f"FROM events {where} ORDER BY block_number, log_index LIMIT ? OFFSET ?")
+        with self._lock:
+            rows = self._db.execute(sql, params + [limit, offset]).fetchall()
+        keys = ("event", "soul_hash", "account", "timestamp", "block_number", "tx_hash", "log_index", "extra")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def soul_hashes(self, event, batch_size=10000, from_block=0):
+        """Yield every indexed soul hash of ``event`` (from ``from_block`` on) in ascending order, in batches"""
+        last = ''
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT DISTINCT soul_hash FROM events WHERE event = ? AND soul_hash > ? AND block_number >= ? "
+                    "ORDER BY soul_hash LIMIT ?",
+                    (event, last, from_block, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield from (row[0] for row in rows)
+            last = rows[-1][0]
+
+    def status(self):
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        return {"last_block": self.last_block, "events": count, "chunk_size": self.chunk_size}
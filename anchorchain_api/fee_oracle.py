@@ -0,0 +1,78 @@
+import threading
+import time
+
+
+class FeeOracle:
+    """Caches EIP-1559 fee suggestions, refreshed at most once per block.
+
+    ``refresh`` reads ``eth_feeHistory`` for the last ``history_blocks``
+    blocks: the next block's base fee, and the median of the
+    ``percentile``-th priority fee paid in those blocks. Chains without a base
+    fee fall back to a cached legacy ``gasPrice``. ``fees`` only reads the
+    cache, so signing a transaction never waits on a fee RPC call.
+    """
+
+    def __init__(self, w3, percentile=50, history_blocks=5, base_fee_multiplier=2, min_priority_fee=0):
+        self.w3 = w3
+        self.percentile = percentile
+        self.history_blocks = history_blocks
+        self.base_fee_multiplier = base_fee_multiplier
+        self.min_priority_fee = min_priority_fee
+        self.block_number = None
+        self.updated_at = None
+        self.base_fee = None
+        self.priority_fee = None
+        self.gas_price = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """Refresh the cached fees if a new block arrived; returns True when refreshed"""
+        head = self.w3.eth.block_number
+        if not force and head == self.block_number:
+            return False
+
+        base_fee = priority_fee = gas_price = None
+        try:
+            history = self.w3.eth.fee_history(self.history_blocks, head, [self.percentile])
+            base_fee = history['baseFeePerGas'][-1] or None
+            rewards = sorted(r[0] for r in history.get('reward') or [] if r)
+            priority_fee = rewards[len(rewards) // 2] if rewards else 0
+        except Exception as e:
+            if self.updated_at is None:
+                print(f"Fee history unavailable, using legacy gas price: {e}")
+        if base_fee is None:
+            gas_price = self.w3.eth.gas_price
+
+        with self._lock:
+            self.block_number = head
+            self.updated_at = time.time()
+            self.base_fee = base_fee
+            self.priority_fee = max(priority_fee or 0, self.min_priority_fee)
+            self.gas_price = gas_price
+        return True
+
+    def fees(self):
+        """Fee fields to merge into a transaction dict"""
+        if self.updated_at is None:
+            self.refresh(force=True)
+        with self._lock:
+            if self.base_fee is None:
+                return {'gasPrice': self.gas_price}
+            return {
+                'maxFeePerGas': self.base_fee * self.base_fee_multiplier + self.priority_fee,
+                'maxPriorityFeePerGas': self.priority_fee,
+            }
+
+    def staleness(self):
+        """Seconds since the last refresh (-1 before the first one)"""
+        return time.time() - self.updated_at if self.updated_at else -1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "block_number": self.block_number,
+                "base_fee": self.base_fee,
+                "priority_fee": self.priority_fee,
+                "gas_price": self.gas_price,
+                "staleness": self.staleness(),
+            }
@@ -1,10 +1,32 @@
-from fastapi import FastAPI, HTTPException
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from fastapi import FastAPI, HTTPException, Header, Request
+from pydantic import BaseModel
+from typing import List, Optional
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from web3 import Web3
+from web3.exceptions import TransactionNotFound
+from eth_account import Account
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import json
 import os
 import time
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
+from signer_pool import SignerPool
+from tx_tracker import TxTracker, normalize_tx_hash
+from merkle_batcher import MerkleBatcher
+from receipt_watcher import ReceiptWatcher
+from milestones import OVERFLOW, UNMINED, MilestoneTracker, WatchLimitError
+from view_cache import ViewCache
+from event_indexer import EventIndexer
+from fee_oracle import FeeOracle
+from tx_builder import TxBuilder
+from rpc_pool import PooledHTTPProvider
+from sim_chain import RESURRECTION_ABI, SimulatedNode, SimulatedProvider, sim_config
+from batch_reader import BatchReader
+from anchor_dedup import AnchorDeduper
+from anchor_snapshot import AnchorSnapshot
+from outbox import Outbox
+from stream_hasher import ALGORITHMS, MultipartFileFeed, StreamHasher
 
 app = FastAPI()
 
@@ -15,26 +37,297 @@ resurrection_verify_pass = Counter('resurrection_verify_pass_total', 'Successful
 resurrection_verify_fail = Counter('resurrection_verify_fail_total', 'Failed resurrection verifications')
 gas_cost_histogram = Histogram('anchorchain_gas_cost', 'Gas cost of transactions')
 anchorchain_tx_confirm_time_seconds = Histogram('anchorchain_tx_confirm_time_seconds', 'Transaction confirmation time')
+outbox_entries = Gauge('anchorchain_outbox_entries', 'Outbox entries by status', ['status'])
+api_requests_total = Counter('api_requests_total', 'Total API requests', ['endpoint', 'method'])
+api_request_duration = Histogram(
+    'api_request_duration_seconds', 'API request latency by route template', ['endpoint', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float('inf'))
+)
+# hash (uploads only) → validate → nonce → fee → encode_sign → broadcast → first_seen (block inclusion) → mined (receipt seen)
+write_stage_seconds = Histogram(
+    'anchorchain_write_stage_seconds', 'Time spent in each stage of the write path', ['stage'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, float('inf'))
+)
+anchorchain_receipts_pending = Gauge('anchorchain_receipts_pending', 'Transactions waiting on the receipt watcher')
+view_cache_hits = Counter('anchorchain_view_cache_hits_total', 'Contract view calls served from cache', ['function'])
+view_cache_misses = Counter('anchorchain_view_cache_misses_total', 'Contract view calls sent to the RPC', ['function'])
+view_cache_evictions = Counter('anchorchain_view_cache_evictions_total', 'Contract view cache LRU evictions', ['function'])
+fee_base_fee_gwei = Gauge('anchorchain_fee_base_fee_gwei', 'Cached next-block base fee')
+fee_max_fee_gwei = Gauge('anchorchain_fee_max_fee_gwei', 'Cached maxFeePerGas (or legacy gasPrice) served to signers')
+fee_priority_fee_gwei = Gauge('anchorchain_fee_priority_fee_gwei', 'Cached maxPriorityFeePerGas served to signers')
+fee_oracle_staleness_seconds = Gauge('anchorchain_fee_oracle_staleness_seconds', 'Seconds since the fee oracle last refreshed')
+anchor_snapshot_entries = Gauge('anchorchain_anchor_snapshot_entries', 'Soul hashes in the on-disk anchor snapshot')
+anchor_deduplicated = Counter('anchorchain_anchor_deduplicated_total', 'Anchor requests answered from an earlier or in-flight submission')
+rpc_requests = Counter('anchorchain_rpc_requests_total', 'RPC requests per endpoint', ['endpoint', 'method', 'outcome'])
+rpc_latency_seconds = Histogram('anchorchain_rpc_latency_seconds', 'RPC request latency per endpoint', ['endpoint'])
+rpc_endpoint_healthy = Gauge('anchorchain_rpc_endpoint_healthy', 'Whether an RPC endpoint is in rotation', ['endpoint'])
+signer_tx_sent = Counter('anchorchain_signer_tx_sent_total', 'Transactions broadcast per signing account', ['address'])
+signer_pending = Gauge('anchorchain_signer_pending', 'Unmined transactions per signing account', ['address'])
+signer_balance_eth = Gauge('anchorchain_signer_balance_eth', 'Balance per signing account', ['address'])
+upload_bytes = Counter('anchorchain_upload_bytes_total', 'Payload bytes hashed by /anchor/upload', ['algorithm'])
+signer_active = Gauge('anchorchain_signer_active', 'Whether a signing account is in rotation', ['address'])
 
 # Web3 setup
 rpc_url = os.getenv('RPC_URL', 'http://ganache:8545')
+rpc_urls = [u.strip() for u in os.getenv('RPC_URLS', rpc_url).split(',') if u.strip()]
+rpc_broadcast_fanout = int(os.getenv('RPC_BROADCAST_FANOUT', '3'))
+rpc_timeout = float(os.getenv('RPC_TIMEOUT', '10'))
 private_key = os.getenv('PRIVATE_KEY')
+private_keys = [k.strip() for k in (os.getenv('PRIVATE_KEYS') or private_key or '').split(',') if k.strip()]
+signer_min_balance_eth = float(os.getenv('SIGNER_MIN_BALANCE_ETH', '0.01'))
 chain_id = int(os.getenv('CHAIN_ID', '1337'))
-w3 = Web3(Web3.HTTPProvider(rpc_url))
+# "sim" answers every RPC call from an in-process chain (see sim_chain.py) instead of RPC_URLS
+chain_backend = os.getenv('CHAIN_BACKEND', 'node')
+merkle_batch_enabled = os.getenv('MERKLE_BATCH_ENABLED', 'false').lower() == 'true'
+merkle_batch_window = float(os.getenv('MERKLE_BATCH_WINDOW', '2'))
+merkle_batch_size = int(os.getenv('MERKLE_BATCH_SIZE', '1000'))
+receipt_poll_interval = float(os.getenv('RECEIPT_POLL_INTERVAL', '1'))
+batch_gas_base = int(os.getenv('BATCH_GAS_BASE', '50000'))
+batch_gas_per_item = int(os.getenv('BATCH_GAS_PER_ITEM', '75000'))
+batch_max_gas = int(os.getenv('BATCH_MAX_GAS', '0'))
+view_cache_size = int(os.getenv('VIEW_CACHE_SIZE', '10000'))
+verify_batch_max = int(os.getenv('VERIFY_BATCH_MAX', '1000'))
+verify_batch_chunk = int(os.getenv('VERIFY_BATCH_CHUNK', '250'))
+fee_percentile = int(os.getenv('FEE_PRIORITY_PERCENTILE', '50'))
+fee_min_priority_gwei = float(os.getenv('FEE_MIN_PRIORITY_GWEI', '0'))
+index_db_path = os.getenv('INDEX_DB_PATH', 'anchorchain_events.db')
+index_start_block = int(os.getenv('INDEX_START_BLOCK', '0'))
+index_chunk_size = int(os.getenv('INDEX_CHUNK_SIZE', '2000'))
+index_confirmations = int(os.getenv('INDEX_CONFIRMATIONS', '0'))
+anchor_dedup_results = int(os.getenv('ANCHOR_DEDUP_RESULTS', '100000'))
+anchor_dedup_capacity = int(os.getenv('ANCHOR_DEDUP_CAPACITY', '1000000'))
+anchor_snapshot_path = os.getenv('ANCHOR_SNAPSHOT_PATH', 'anchorchain_anchors.bin')
+anchor_snapshot_compact_at = int(os.getenv('ANCHOR_SNAPSHOT_COMPACT_AT', '100000'))
+outbox_enabled = os.getenv('OUTBOX_ENABLED', 'false').lower() == 'true'
+outbox_db_path = os.getenv('OUTBOX_DB_PATH', 'anchorchain_outbox.db')
+outbox_batch_size = int(os.getenv('OUTBOX_BATCH_SIZE', '100'))
+outbox_max_attempts = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '5'))
+upload_max_bytes = int(os.getenv('UPLOAD_MAX_BYTES', str(1024**3)))
+upload_hash_block = int(os.getenv('UPLOAD_HASH_BLOCK', str(1024**2)))
+upload_chunk_size = int(os.getenv('UPLOAD_CHUNK_SIZE', str(1024**2)))
+tx_max_confirmations = int(os.getenv('TX_MAX_CONFIRMATIONS', '12'))
+tx_events_keepalive = float(os.getenv('TX_EVENTS_KEEPALIVE', '15'))
+tx_events_queue_size = int(os.getenv('TX_EVENTS_QUEUE_SIZE', '256'))
+tx_events_max_unknown = int(os.getenv('TX_EVENTS_MAX_UNKNOWN', '1000'))
+
+def record_rpc(endpoint, method, seconds, ok):
+    rpc_requests.labels(endpoint=endpoint, method=method, outcome="ok" if ok else "error").inc()
+    if ok:
+        rpc_latency_seconds.labels(endpoint=endpoint).observe(seconds)
+
+if chain_backend == 'sim':
+    sim_node = SimulatedNode(chain_id=chain_id, **sim_config(chain_id))
+    w3 = Web3(SimulatedProvider(sim_node))
+    # Simulated accounts are always funded, so a throwaway key will do
+    private_keys = private_keys or [Account.create().key.hex()]
+else:
+    sim_node = None
+    w3 = Web3(PooledHTTPProvider(rpc_urls, timeout=rpc_timeout, broadcast_fanout=rpc_broadcast_fanout, on_request=record_rpc))
+for _endpoint in w3.provider.endpoints:
+    rpc_endpoint_healthy.labels(endpoint=_endpoint.name).set_function(lambda e=_endpoint: float(e.healthy))
+signer_pool = SignerPool(
+    w3, private_keys, min_balance=Web3.to_wei(signer_min_balance_eth, 'ether'),
+    on_send=lambda address: signer_tx_sent.labels(address=address).inc()
+) if private_keys else None
+for _signer in signer_pool.signers if signer_pool else []:
+    signer_pending.labels(address=_signer.address).set_function(_signer.pending)
+    signer_balance_eth.labels(address=_signer.address).set_function(lambda s=_signer: float(Web3.from_wei(s.balance or 0, 'ether')))
+    signer_active.labels(address=_signer.address).set_function(lambda s=_signer: float(s.active))
+def record_first_seen(tx_hash, block_timestamp):
+    tx = tx_tracker.get(tx_hash)
+    if tx:
+        write_stage_seconds.labels(stage="first_seen").observe(max(0.0, block_timestamp - tx['submitted_at']))
+
+tx_tracker = TxTracker(
+    on_submit=lambda tx: milestones.watch(tx['tx_hash'], sender=tx.get('sender'), nonce=tx.get('nonce')),
+    on_mined=lambda tx: write_stage_seconds.labels(stage="mined").observe(tx['confirmation_time'])
+)
+receipt_watcher = ReceiptWatcher(
+    w3, poll_interval=receipt_poll_interval, on_pending=anchorchain_receipts_pending.set, on_seen=record_first_seen
+)
+milestones = MilestoneTracker(
+    w3, receipt_watcher, max_confirmations=tx_max_confirmations, poll_interval=receipt_poll_interval,
+    queue_size=tx_events_queue_size, max_unknown=tx_events_max_unknown
+)
+view_cache = ViewCache(view_cache_size, hits=view_cache_hits, misses=view_cache_misses, evictions=view_cache_evictions)
+batch_reader = BatchReader(w3, rpc_url, chunk_size=verify_batch_chunk)
+fee_oracle = FeeOracle(w3, percentile=fee_percentile, min_priority_fee=Web3.to_wei(fee_min_priority_gwei, 'gwei'))
+fee_oracle_staleness_seconds.set_function(fee_oracle.staleness)
+background_tasks = set()
+# Accepted anchors are acknowledged once written here and submitted by follow_outbox()
+outbox = Outbox(outbox_db_path, max_attempts=outbox_max_attempts) if outbox_enabled else None
 
 # Load contract
 contract_address = None
 contract_abi = None
 
 try:
-    with open('/shared/anchor/deployment.json', 'r') as f:
-        deployment = json.load(f)
-        contract_address = deployment['address']
-        contract_abi = deployment['abi']
-        contract = w3.eth.contract(address=contract_address, abi=contract_abi)
+    if sim_node:
+        deployment = sim_node.deployment(RESURRECTION_ABI)
+    else:
+        with open('/shared/anchor/deployment.json', 'r') as f:
+            deployment = json.load(f)
+    contract_address = deployment['address']
+    contract_abi = deployment['abi']
+    contract = w3.eth.contract(address=contract_address, abi=contract_abi)
 except:
     contract = None
 
+# Account, selectors and input types are resolved once, not per request
+tx_builder = TxBuilder(private_keys[0], contract_address, contract_abi, chain_id, w3.codec) if contract and private_keys else None
+
+def lookup_anchor(hash_bytes: bytes):
+    """Earlier anchoring of a soul hash from local state: Merkle proofs, then the event index"""
+    record = merkle_batcher.get_proof(hash_bytes)
+    if record is not None:
+        return record
+    if event_indexer:
+        events = event_indexer.query(event="ResurrectionNotarized", soul_hash='0x' + hash_bytes.hex(), limit=1)
+        if events:
+            return {"tx_hash": events[0]['tx_hash'], "status": "mined", "block_number": events[0]['block_number']}
+    return None
+
+def anchor_failed(record: dict):
+    if not record.get('tx_hash') and 'ack_id' in record:
+        return (outbox.get(record['ack_id']) or {}).get('status') == 'failed'
+    return (tx_tracker.get(record['tx_hash']) or record).get('status') == 'failed'
+
+anchor_deduper = AnchorDeduper(
+    lookup=lookup_anchor, stale=anchor_failed,
+    known=lambda soul_hash: anchor_snapshot is not None and soul_hash in anchor_snapshot,
+    max_results=anchor_dedup_results, filter_capacity=anchor_dedup_capacity
+)
+
+def index_anchored(rows):
+    anchored = [(bytes.fromhex(row[3][2:]), row[6]) for row in rows if row[2] == "ResurrectionNotarized"]
+    if anchor_snapshot is not None:
+        anchor_snapshot.add_many(anchored)
+    else:
+        for soul_hash, _ in anchored:
+            anchor_deduper.add(soul_hash)
+
+event_indexer = None
+if contract:
+    try:
+        event_indexer = EventIndexer(
+            w3, contract.address, index_db_path, start_block=index_start_block,
+            chunk_size=index_chunk_size, confirmations=index_confirmations, on_store=index_anchored
+        )
+    except Exception as e:
+        print(f"Event indexer disabled: {e}")
+
+# Every notarized soul hash on disk, so existence checks survive restarts without the chain
+anchor_snapshot = None
+if event_indexer and anchor_snapshot_path:
+    try:
+        anchor_snapshot = AnchorSnapshot(
+            anchor_snapshot_path, capacity=anchor_dedup_capacity, compact_at=anchor_snapshot_compact_at
+        )
+        anchor_snapshot_entries.set_function(lambda: len(anchor_snapshot))
+    except Exception as e:
+        print(f"Anchor snapshot disabled: {e}")
+
+def refresh_fees():
+    if fee_oracle.refresh():
+        fees = fee_oracle.fees()
+        fee_base_fee_gwei.set(Web3.from_wei(fee_oracle.base_fee or 0, 'gwei'))
+        fee_max_fee_gwei.set(Web3.from_wei(fees.get('maxFeePerGas', fees.get('gasPrice')) or 0, 'gwei'))
+        fee_priority_fee_gwei.set(Web3.from_wei(fees.get('maxPriorityFeePerGas', 0), 'gwei'))
+
+async def follow_fees():
+    """Refresh cached EIP-1559 fees once per new block"""
+    while True:
+        try:
+            await run_in_threadpool(refresh_fees)
+        except Exception as e:
+            print(f"Fee oracle error: {e}")
+        await asyncio.sleep(receipt_poll_interval)
+
+async def follow_view_cache():
+    """Drop cached view results touched by contract events in each new block"""
+    while True:
+        if contract:
+            try:
+                await run_in_threadpool(view_cache.sync, w3, contract.address)
+            except Exception as e:
+                print(f"View cache sync error: {e}")
+        await asyncio.sleep(receipt_poll_interval)
+
+def indexed_anchors(from_block=0):
+    return (bytes.fromhex(h[2:]) for h in event_indexer.soul_hashes("ResurrectionNotarized", from_block=from_block))
+
+def seed_anchor_filter():
+    """Catch the anchor snapshot up with the event index (or, without one, fill the dedup filter from it)"""
+    if anchor_snapshot is None:
+        for soul_hash in indexed_anchors():
+            anchor_deduper.add(soul_hash)
+    elif not len(anchor_snapshot):
+        anchor_snapshot.rebuild(indexed_anchors(), event_indexer.last_block)
+    else:
+        last_block = anchor_snapshot.last_block
+        anchor_snapshot.add_many((soul_hash, last_block) for soul_hash in indexed_anchors(max(0, last_block)))
+
+async def follow_event_index():
+    """Backfill the local event index, then keep it at the chain head"""
+    try:
+        await run_in_threadpool(seed_anchor_filter)
+    except Exception as e:
+        print(f"Anchor filter seeding error: {e}")
+    while True:
+        try:
+            await run_in_threadpool(event_indexer.sync)
+        except Exception as e:
+            print(f"Event indexer error: {e}")
+        await asyncio.sleep(receipt_poll_interval)
+
+async def follow_anchor_snapshot():
+    """Merge logged anchors into the sorted snapshot file once enough have accumulated"""
+    while True:
+        if anchor_snapshot.needs_compaction():
+            try:
+                await run_in_threadpool(anchor_snapshot.compact)
+            except Exception as e:
+                print(f"Anchor snapshot compaction error: {e}")
+        await asyncio.sleep(receipt_poll_interval)
+
+async def follow_signers():
+    """Track each signing account's mined nonce and balance once per block"""
+    while True:
+        try:
+            await run_in_threadpool(signer_pool.refresh)
+        except Exception as e:
+            print(f"Signer pool refresh error: {e}")
+        await asyncio.sleep(receipt_poll_interval)
+
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    """Request count and latency per route template (not per raw path, which embeds soul hashes)"""
+    start_time = time.time()
+    response = await call_next(request)
+    endpoint = getattr(request.scope.get("route"), "path", "unmatched")
+    api_requests_total.labels(endpoint=endpoint, method=request.method).inc()
+    api_request_duration.labels(endpoint=endpoint, method=request.method).observe(time.time() - start_time)
+    return response
+
+@app.on_event("startup")
+async def startup():
+    receipt_watcher.start()
+    spawn(follow_view_cache())
+    spawn(follow_fees())
+    if signer_pool:
+        spawn(follow_signers())
+    if event_indexer:
+        spawn(follow_event_index())
+    if anchor_snapshot is not None:
+        spawn(follow_anchor_snapshot())
+    if outbox and contract:
+        spawn(follow_outbox())
+
+@app.on_event("shutdown")
+async def shutdown():
+    await receipt_watcher.stop()
+    await milestones.stop()
+
 @app.get("/")
 async def root():
     return {"status": "AnchorChain API running", "contract": contract_address, "chain_id": chain_id, "rpc_url": rpc_url}
@@ -56,116 +349,798 @@ async def contract_info():
         "rpc_url": rpc_url
     }
 
-@app.post("/anchor/{soul_hash}")
-async def anchor_resurrection(soul_hash: str):
-    """Main anchor endpoint for resurrection notarization"""
+def to_bytes32(soul_hash: str) -> bytes:
+    """Convert a hex soul hash to bytes32, padding or truncating to 32 bytes"""
+    hash_bytes = bytes.fromhex(soul_hash.replace('0x', ''))
+    if len(hash_bytes) != 32:
+        hash_bytes = hash_bytes.ljust(32, b'\x00')[:32]
+    return hash_bytes
+
+def parse_soul_hash(soul_hash: str) -> bytes:
+    """``to_bytes32`` for a soul hash taken from the request; 400 if it is not hex"""
+    try:
+        return to_bytes32(soul_hash)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid soul hash: {soul_hash}")
+
+def explorer_tx_url(tx_hash: str):
+    if chain_id == 80002:
+        return f"https://amoy.polygonscan.com/tx/{tx_hash}"
+    elif chain_id == 11155111:
+        return f"https://sepolia.etherscan.io/tx/{tx_hash}"
+    return None
+
+def send_call(data: bytes, gas: int, on_signed=None):
+    """Sign a contract call locally and broadcast it (blocking; run off the event loop).
+
+    Returns ``(tx_hash, sender, nonce)``; the tracker hands sender and nonce
+    to the milestone stream so it can tell a replaced transaction from a dropped one.
+    """
+    started = time.perf_counter()
+    with signer_pool.allocate() as (signer, nonce):
+        write_stage_seconds.labels(stage="nonce").observe(time.perf_counter() - started)
+        with write_stage_seconds.labels(stage="fee").time():
+            fees = fee_oracle.fees()
+        with write_stage_seconds.labels(stage="encode_sign").time():
+            signed_tx = tx_builder.sign(data, gas, nonce, fees, account=signer.account)
+        if on_signed:
+            on_signed(signed_tx.hash.hex(), signer, nonce)
+        with write_stage_seconds.labels(stage="broadcast").time():
+            return w3.eth.send_raw_transaction(signed_tx.rawTransaction), signer.address, nonce
+
+def record_receipt(kind: str, receipt, confirmation_time: float):
+    if kind == "verify":
+        if receipt['status'] == 1:
+            resurrection_verify_pass.inc()
+        else:
+            resurrection_verify_fail.inc()
+    elif receipt['status'] == 1:
+        anchorchain_tx_ok.inc()
+        gas_cost_histogram.observe(receipt['gasUsed'])
+        anchorchain_tx_confirm_time_seconds.observe(confirmation_time)
+    else:
+        anchorchain_tx_err.inc()
+
+async def track_receipt(tx_hash, kind: str, start_time: float):
+    """Wait for a submitted transaction in the background and update the tracker"""
+    try:
+        receipt = await receipt_watcher.wait(tx_hash)
+    except Exception as e:
+        tx_tracker.failed(tx_hash, e)
+        if kind == "verify":
+            resurrection_verify_fail.inc()
+        else:
+            anchorchain_tx_err.inc()
+        return
+    tx_tracker.mined(tx_hash, receipt)
+    record_receipt(kind, receipt, time.time() - start_time)
+
+def spawn(coro):
+    """Run a coroutine in the background, keeping a reference until it finishes"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+async def anchor_merkle_root(root: bytes, leaf_count: int):
+    """Anchor a sealed batch root; the batcher hands each caller its proof"""
+    start_time = time.time()
+    tx_hash, sender, nonce = await run_in_threadpool(
+        send_call, tx_builder.encode('notarizeMerkleRoot', root, leaf_count), 150000
+    )
+    tx_tracker.submit(tx_hash, kind="merkle_root", merkle_root='0x' + root.hex(), leaf_count=leaf_count,
+                      sender=sender, nonce=nonce)
+    spawn(track_receipt(tx_hash, "merkle_root", start_time))
+    return tx_hash.hex()
+
+merkle_batcher = MerkleBatcher(anchor_merkle_root, window=merkle_batch_window, max_size=merkle_batch_size)
+
+def accepted(tx_hash: str, response: Response, **extra):
+    response.status_code = 202
+    return {
+        "tx_hash": tx_hash,
+        "status": "pending",
+        "status_url": f"/tx/{tx_hash}",
+        "explorer_url": explorer_tx_url(tx_hash),
+        "chain_id": chain_id,
+        **extra
+    }
+
+class NotarizeBatchRequest(BaseModel):
+    soul_hashes: List[str]
+
+block_gas_limit = None
+
+def batch_chunk_size(gas_per_item: int) -> int:
+    """Items per batch transaction; defaults to half the block gas limit per tx"""
+    global block_gas_limit
+    cap = batch_max_gas
+    if not cap:
+        if block_gas_limit is None:
+            block_gas_limit = w3.eth.get_block('latest')['gasLimit']
+        cap = block_gas_limit // 2
+    return max(1, (cap - batch_gas_base) // gas_per_item)
+
+@app.post("/notarize/batch")
+async def notarize_batch(request: NotarizeBatchRequest, response: Response, wait: bool = False):
+    """Notarize many soul hashes individually on chain, chunked under the block gas limit.
+
+    Hashes that were already anchored are not sent again; they are listed
+    under ``deduplicated`` with their original transaction. A chunk that
+    fails to send is reported with its ``error`` while the others go ahead;
+    retrying the same request only resends the hashes of failed chunks.
+    """
     if not contract:
         anchorchain_tx_err.inc()
         raise HTTPException(status_code=500, detail="Contract not loaded")
+    if not request.soul_hashes:
+        raise HTTPException(status_code=400, detail="No soul hashes given")
     
     try:
         start_time = time.time()
-        account = w3.eth.account.from_key(private_key)
+        hashes = list(dict.fromkeys(to_bytes32(h) for h in request.soul_hashes))
+        known = await asyncio.gather(*(anchor_deduper.resolve(h) for h in hashes))
+        deduplicated = [{"soul_hash": '0x' + h.hex(), "tx_hash": r['tx_hash']} for h, r in zip(hashes, known) if r]
+        hashes = [h for h, r in zip(hashes, known) if r is None]
+        anchor_deduplicated.inc(len(deduplicated))
+        if not hashes:
+            return {"count": 0, "batches": [], "deduplicated": deduplicated, "chain_id": chain_id}
+        size = await run_in_threadpool(batch_chunk_size, batch_gas_per_item)
+        chunks = [hashes[i:i + size] for i in range(0, len(hashes), size)]
         
-        # Build transaction - Convert to bytes32
-        hash_bytes = bytes.fromhex(soul_hash.replace('0x', ''))
-        if len(hash_bytes) != 32:
-            # Pad or truncate to 32 bytes
-            hash_bytes = hash_bytes.ljust(32, b'\x00')[:32]
-        tx = contract.functions.notarizeResurrection(hash_bytes).build_transaction({
-            'from': account.address,
-            'nonce': w3.eth.get_transaction_count(account.address),
-            'gas': 200000,
-            'gasPrice': w3.eth.gas_price,
-            'chainId': chain_id
-        })
+        # Sent one at a time, in nonce order, and recorded as soon as each is
+        # broadcast: if a later chunk fails, the earlier ones are still tracked
+        # and deduplicated, so a client retry does not anchor them twice.
+        batches, sent = [], []
+        for chunk in chunks:
+            batch = {"tx_hash": None, "soul_hashes": ['0x' + h.hex() for h in chunk]}
+            batches.append(batch)
+            try:
+                tx_hash, sender, nonce = await run_in_threadpool(
+                    send_call,
+                    tx_builder.encode('notarizeResurrectionBatch', chunk),
+                    batch_gas_base + batch_gas_per_item * len(chunk)
+                )
+            except Exception as e:
+                anchorchain_tx_err.inc()
+                batch.update({"status": "error", "error": str(e)})
+                continue
+            tx_tracker.submit(tx_hash, kind="notarize_batch", count=len(chunk), sender=sender, nonce=nonce)
+            for h in chunk:
+                anchor_deduper.remember(h, {"tx_hash": tx_hash.hex()})
+            batch["tx_hash"] = tx_hash.hex()
+            sent.append((tx_hash, batch))
+        if not sent:
+            raise HTTPException(status_code=500, detail=batches[0]["error"])
+        failed = len(batches) - len(sent)
         
-        # Sign and send
-        signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        if not wait:
+            for tx_hash, batch in sent:
+                batch["status"] = "pending"
+                spawn(track_receipt(tx_hash, "notarize_batch", start_time))
+            response.status_code = 202
+            return {
+                "status": "pending", "count": len(hashes), "failed_batches": failed, "batches": batches,
+                "deduplicated": deduplicated, "chain_id": chain_id
+            }
         
-        # Record metrics
+        receipts = await asyncio.gather(*(receipt_watcher.wait(tx_hash) for tx_hash, _ in sent), return_exceptions=True)
         confirmation_time = time.time() - start_time
-        gas_used = receipt['gasUsed']
+        for (tx_hash, batch), receipt in zip(sent, receipts):
+            if isinstance(receipt, Exception):
+                tx_tracker.failed(tx_hash, receipt)
+                anchorchain_tx_err.inc()
+                batch.update({"status": "error", "error": str(receipt)})
+                continue
+            tx_tracker.mined(tx_hash, receipt)
+            record_receipt("notarize_batch", receipt, confirmation_time)
+            batch.update({
+                "status": "mined" if receipt['status'] == 1 else "failed",
+                "block_number": receipt['blockNumber'],
+                "gas_used": receipt['gasUsed']
+            })
         
-        anchorchain_tx_ok.inc()
-        gas_cost_histogram.observe(gas_used)
-        anchorchain_tx_confirm_time_seconds.observe(confirmation_time)
+        return {
+            "count": len(hashes), "failed_batches": failed, "batches": batches, "deduplicated": deduplicated,
+            "confirmation_time": confirmation_time, "chain_id": chain_id
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        anchorchain_tx_err.inc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+def anchored_on_chain(entries):
+    """Ids of outbox entries whose soul hash already has an on-chain record"""
+    return [
+        e['id'] for e in entries
+        if contract.functions.getRecord(to_bytes32(e['payload']['soul_hash'])).call()[1] > 0
+    ]
+
+def settle_unsent(entries, error, tx_hash=None, signer=None, nonce=None):
+    """Entries whose transaction is gone: mined if their hash made it on chain anyway, else requeued.
+
+    Returns False, settling nothing, while the node still has ``tx_hash``: it
+    may yet be mined, and resending its hashes under a new nonce could anchor
+    them twice. A transaction that is gone with its nonce still unused leaves
+    a gap, which is handed back to the signer before the entries are requeued.
+    """
+    if tx_hash is not None:
+        try:
+            w3.eth.get_transaction(tx_hash)
+            return False
+        except TransactionNotFound:
+            pass
+        if signer is not None and w3.eth.get_transaction_count(signer.address, 'latest') <= nonce:
+            signer.nonces.resync()
+    anchored = anchored_on_chain(entries)
+    if anchored:
+        outbox.mark_mined(anchored, None, None)
+    rest = [e['id'] for e in entries if e['id'] not in anchored]
+    if rest:
+        outbox.retry(rest, error)
+    return True
+
+def send_outbox(entries, signed):
+    """Sign and broadcast one transaction for claimed entries, recording its hash first.
+
+    ``signed`` receives the tx hash, signer and nonce before the broadcast, so
+    a failed send can be checked against the node.
+    """
+    ids = [e['id'] for e in entries]
+    hashes = [to_bytes32(e['payload']['soul_hash']) for e in entries]
+    if len(hashes) == 1:
+        data, gas = tx_builder.encode_bytes32('notarizeResurrection', hashes[0]), 200000
+    else:
+        data, gas = tx_builder.encode('notarizeResurrectionBatch', hashes), batch_gas_base + batch_gas_per_item * len(hashes)
+
+    def on_signed(signed_hash, signer, nonce):
+        outbox.mark_signed(ids, signed_hash)
+        signed.update({"tx_hash": signed_hash, "signer": signer, "nonce": nonce})
+
+    tx_hash, _, _ = send_call(data, gas, on_signed=on_signed)
+    outbox.mark_submitted(ids)
+    return tx_hash.hex()
+
+async def track_outbox(entries, tx_hash: str, start_time: float, signer=None, nonce=None):
+    """Record the outcome of an outbox transaction and wake requests waiting on its entries"""
+    ids = [e['id'] for e in entries]
+    while True:
+        try:
+            receipt = await receipt_watcher.wait(tx_hash)
+        except Exception as e:
+            try:
+                settled = await run_in_threadpool(settle_unsent, entries, e, tx_hash, signer, nonce)
+            except Exception as check_error:
+                print(f"Outbox settle error: {check_error}")
+                settled = False
+            if not settled:
+                # Still in the mempool (or the node could not tell): keep waiting for it
+                continue
+            tx_tracker.failed(tx_hash, e)
+            anchorchain_tx_err.inc()
+        else:
+            tx_tracker.mined(tx_hash, receipt)
+            record_receipt("outbox", receipt, time.time() - start_time)
+            await run_in_threadpool(outbox.mark_mined, ids, tx_hash, receipt['blockNumber'], receipt['status'] == 1)
+        break
+    outbox.notify(ids)
+
+def replay_outbox():
+    """Settle entries a previous run left unfinished without sending any soul hash twice.
+
+    Signed/submitted entries are resolved by their receipt; transactions still
+    in the mempool are returned for tracking, dropped ones are requeued unless
+    the hash is on chain. Queued entries already on chain are marked mined.
+    """
+    in_flight = []
+    groups = {}
+    for entry in outbox.unfinished():
+        groups.setdefault(entry['tx_hash'], []).append(entry)
+    for tx_hash, entries in groups.items():
+        if tx_hash is None:
+            anchored = anchored_on_chain(entries)
+            if anchored:
+                outbox.mark_mined(anchored, None, None)
+            continue
+        try:
+            receipt = w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            receipt = None
+        if receipt:
+            outbox.mark_mined([e['id'] for e in entries], tx_hash, receipt['blockNumber'], receipt['status'] == 1)
+            continue
+        try:
+            w3.eth.get_transaction(tx_hash)
+            in_flight.append((entries, tx_hash))
+        except TransactionNotFound:
+            settle_unsent(entries, "Transaction dropped before restart")
+    return in_flight
+
+def update_outbox_gauges():
+    counts = outbox.status()
+    for status in ("queued", "signed", "submitted", "mined", "failed"):
+        outbox_entries.labels(status).set(counts.get(status, 0))
+
+async def follow_outbox():
+    """Replay unfinished outbox entries, then drain new ones onto the chain in batches"""
+    try:
+        for entries, tx_hash in await run_in_threadpool(replay_outbox):
+            tx_tracker.submit(tx_hash, kind="outbox", count=len(entries))
+            spawn(track_outbox(entries, tx_hash, time.time()))
+    except Exception as e:
+        print(f"Outbox replay error: {e}")
+    while True:
+        try:
+            limit = min(outbox_batch_size, await run_in_threadpool(batch_chunk_size, batch_gas_per_item))
+            entries = await run_in_threadpool(outbox.claim, "notarize", limit)
+            if entries:
+                start_time = time.time()
+                signed = {}
+                try:
+                    tx_hash = await run_in_threadpool(send_outbox, entries, signed)
+                except Exception as e:
+                    print(f"Outbox submit error: {e}")
+                    tx_hash = signed.get("tx_hash")
+                    if await run_in_threadpool(settle_unsent, entries, e, tx_hash, signed.get("signer"), signed.get("nonce")):
+                        anchorchain_tx_err.inc()
+                        outbox.notify([entry['id'] for entry in entries])
+                        await asyncio.sleep(receipt_poll_interval)
+                        continue
+                    # The broadcast errored but reached the node: follow it like any sent transaction
+                    await run_in_threadpool(outbox.mark_submitted, [entry['id'] for entry in entries])
+                signer = signed.get("signer")
+                tx_tracker.submit(tx_hash, kind="outbox", count=len(entries),
+                                  sender=signer.address if signer else None, nonce=signed.get("nonce"))
+                spawn(track_outbox(entries, tx_hash, start_time, signer, signed.get("nonce")))
+                continue
+        except Exception as e:
+            print(f"Outbox error: {e}")
+        await run_in_threadpool(update_outbox_gauges)
+        await outbox.wait_for_work(receipt_poll_interval)
+
+async def submit_anchor(hash_bytes: bytes, soul_hash: str, start_time: float):
+    """Anchor one soul hash directly, through a Merkle batch or via the outbox, and return its record"""
+    write_stage_seconds.labels(stage="validate").observe(time.time() - start_time)
+    if merkle_batch_enabled:
+        return await merkle_batcher.add(hash_bytes)
+    if outbox:
+        ack_id = await run_in_threadpool(outbox.append, "notarize", {"soul_hash": '0x' + hash_bytes.hex()})
+        return {"ack_id": ack_id, "status_url": f"/outbox/{ack_id}"}
+    tx_hash, sender, nonce = await run_in_threadpool(
+        send_call, tx_builder.encode_bytes32('notarizeResurrection', hash_bytes), 200000
+    )
+    tx_tracker.submit(tx_hash, kind="notarize", soul_hash=soul_hash, sender=sender, nonce=nonce)
+    spawn(track_receipt(tx_hash, "notarize", start_time))
+    return {"tx_hash": tx_hash.hex()}
+
+def outbox_entry(entry: dict):
+    tx_hash = entry['tx_hash']
+    tx = tx_tracker.get(tx_hash) if tx_hash else None
+    return {
+        "ack_id": entry['id'],
+        "soul_hash": entry['payload']['soul_hash'],
+        "status": entry['status'],
+        "tx_hash": tx_hash,
+        "block_number": entry['block_number'],
+        "gas_used": tx.get('gas_used') if tx else None,
+        "attempts": entry['attempts'],
+        "error": entry['error'],
+        "explorer_url": explorer_tx_url(tx_hash) if tx_hash else None,
+        "chain_id": chain_id
+    }
+
+async def outbox_response(ack_id: int, response: Response, wait: bool, start_time: float, extra: dict):
+    """202 with the ack id while the entry is unfinished; the final outcome once it is (or with ``wait``)"""
+    entry = await run_in_threadpool(outbox.get, ack_id)
+    if entry['status'] not in ("mined", "failed"):
+        if not wait:
+            response.status_code = 202
+            return {**outbox_entry(entry), "status_url": f"/outbox/{ack_id}", "event": "ResurrectionRecorded", **extra}
+        entry = await outbox.wait(ack_id)
+    return {
+        **outbox_entry(entry),
+        "confirmation_time": time.time() - start_time,
+        "event": "ResurrectionRecorded",
+        **extra
+    }
+
+async def hash_upload(request: Request, hasher: StreamHasher):
+    """Feed the request body to ``hasher`` as it streams in, hashing each block off the event loop.
+
+    Returns the digest and the seconds spent hashing, which exclude the
+    time spent waiting for the client to send the body.
+    """
+    content_type = request.headers.get('content-type', '')
+    feed = MultipartFileFeed(content_type, hasher) if content_type.startswith('multipart/form-data') else None
+    write = feed.write if feed else hasher.update
+    received = 0
+    seconds = 0.0
+    block = bytearray()
+
+    async def timed(fn, *args):
+        nonlocal seconds
+        started = time.perf_counter()
+        result = await run_in_threadpool(fn, *args)
+        seconds += time.perf_counter() - started
+        return result
+
+    async for data in request.stream():
+        received += len(data)
+        if received > upload_max_bytes:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds {upload_max_bytes} bytes")
+        block += data
+        if len(block) >= upload_hash_block:
+            await timed(write, bytes(block))
+            block.clear()
+    if block:
+        await timed(write, bytes(block))
+    if feed:
+        await timed(feed.finish)
+    return await timed(hasher.finish), seconds
+
+@app.post("/anchor/upload")
+async def anchor_upload(
+    request: Request,
+    response: Response,
+    algorithm: str = "sha256",
+    merkle: bool = False,
+    chunk_size: int = None,
+    chunks: bool = False,
+    wait: bool = False,
+    idempotency_key: Optional[str] = Header(None)
+):
+    """Hash a raw or multipart soul-state upload as it streams in and anchor the digest.
+
+    The anchored soul hash is the payload's sha256/keccak digest; with
+    ``merkle=true`` it is instead the root of a Merkle tree over per-chunk
+    digests (``chunk_size`` bytes each, default ``UPLOAD_CHUNK_SIZE``), so
+    single chunks can later be proven against it with ``merkle.py``. The
+    response carries the root and chunk count; ``chunks=true`` adds every
+    chunk digest.
+    """
+    if algorithm not in ALGORITHMS:
+        raise HTTPException(status_code=400, detail=f"algorithm must be one of {', '.join(ALGORITHMS)}")
+    if merkle and chunk_size is not None and chunk_size <= 0:
+        raise HTTPException(status_code=400, detail="chunk_size must be positive")
+    
+    hasher = StreamHasher(algorithm, chunk_size=(chunk_size or upload_chunk_size) if merkle else None)
+    try:
+        digest, seconds = await hash_upload(request, hasher)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    write_stage_seconds.labels(stage="hash").observe(seconds)
+    upload_bytes.labels(algorithm=algorithm).inc(hasher.size)
+    
+    soul_hash = '0x' + (hasher.merkle_root if merkle else digest).hex()
+    result = await anchor_resurrection(soul_hash, response, wait, idempotency_key)
+    upload = {**hasher.status(chunk_hashes=chunks), "hash_seconds": round(seconds, 4), "throughput_mb_s": round(hasher.size / 2**20 / seconds, 2) if seconds else None}
+    return {**result, "soul_hash": soul_hash, "upload": upload}
+
+@app.post("/anchor/{soul_hash}")
+async def anchor_resurrection(
+    soul_hash: str,
+    response: Response,
+    wait: bool = False,
+    idempotency_key: Optional[str] = Header(None)
+):
+    """Main anchor endpoint for resurrection notarization.
+
+    Returns 202 with the tx hash once broadcast (or, with the outbox enabled,
+    an ack id once durably queued); pass ``wait=true`` to block until the
+    receipt is available. A soul hash is only anchored once: repeat
+    and concurrent requests get the original transaction back, flagged
+    ``deduplicated``.
+    """
+    if not contract:
+        anchorchain_tx_err.inc()
+        raise HTTPException(status_code=500, detail="Contract not loaded")
+    
+    start_time = time.time()
+    hash_bytes = parse_soul_hash(soul_hash)
+    if idempotency_key:
+        try:
+            anchor_deduper.bind_key(idempotency_key, hash_bytes)
+        except ValueError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+    
+    try:
+        record, deduplicated = await anchor_deduper.run(
+            hash_bytes, lambda: submit_anchor(hash_bytes, soul_hash, start_time)
+        )
+        extra = {"deduplicated": True} if deduplicated else {}
+        if deduplicated:
+            anchor_deduplicated.inc()
+        
+        if 'ack_id' in record:
+            return await outbox_response(record['ack_id'], response, wait, start_time, extra)
         
-        # Generate explorer URL
-        explorer_tx_url = None
-        if chain_id == 80002:
-            explorer_tx_url = f"https://amoy.polygonscan.com/tx/{tx_hash.hex()}"
-        elif chain_id == 11155111:
-            explorer_tx_url = f"https://sepolia.etherscan.io/tx/{tx_hash.hex()}"
+        tx_hash = record['tx_hash']
+        tx = tx_tracker.get(tx_hash) or {"status": record.get("status", "pending"), "block_number": record.get("block_number")}
+        if tx['status'] == "pending":
+            if not wait:
+                return {**accepted(tx_hash, response, event="ResurrectionRecorded"), **record, **extra}
+            receipt = await receipt_watcher.wait(tx_hash)
+            tx = {
+                "status": "mined" if receipt['status'] == 1 else "failed",
+                "block_number": receipt['blockNumber'],
+                "gas_used": receipt['gasUsed']
+            }
         
         return {
-            "tx_hash": tx_hash.hex(),
-            "gas_used": gas_used,
-            "confirmation_time": confirmation_time,
-            "block_number": receipt['blockNumber'],
-            "explorer_url": explorer_tx_url,
+            **record,
+            "tx_hash": tx_hash,
+            "status": tx['status'],
+            "gas_used": tx.get('gas_used'),
+            "confirmation_time": time.time() - start_time,
+            "block_number": tx.get('block_number'),
+            "explorer_url": explorer_tx_url(tx_hash),
             "chain_id": chain_id,
-            "event": "ResurrectionRecorded"
+            "event": "ResurrectionRecorded",
+            **extra
         }
     except Exception as e:
         anchorchain_tx_err.inc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/notarize/{soul_hash}")
-async def notarize_resurrection(soul_hash: str):
+async def notarize_resurrection(
+    soul_hash: str,
+    response: Response,
+    wait: bool = False,
+    idempotency_key: Optional[str] = Header(None)
+):
     # Redirect to anchor endpoint
-    return await anchor_resurrection(soul_hash)
+    return await anchor_resurrection(soul_hash, response, wait, idempotency_key)
+
+def read_records(hashes: List[bytes]):
+    """getRecord for many soul hashes: view-cache hits first, the rest in JSON-RPC batches"""
+    epoch = view_cache.epoch()
+    records, misses = {}, []
+    for h in hashes:
+        found, record = view_cache.get('getRecord', (h,))
+        if found:
+            records[h] = record
+        else:
+            misses.append(h)
+    if misses:
+        for h, record in zip(misses, batch_reader.call_many(contract, 'getRecord', [(h,) for h in misses])):
+            view_cache.put('getRecord', (h,), record, epoch=epoch)
+            records[h] = record
+    return [records[h] for h in hashes]
+
+def verification(hash_bytes: bytes, record):
+    """Read-only verification result from a getRecord tuple, falling back to Merkle proofs"""
+    result = {"soul_hash": '0x' + hash_bytes.hex(), "verified": record[1] > 0}
+    if result["verified"]:
+        result.update({"source": "record", "timestamp": record[1], "notarizer": record[2], "verified_on_chain": record[3]})
+    else:
+        proof = merkle_batcher.get_proof(hash_bytes)
+        if proof is not None and (tx_tracker.get(proof['tx_hash']) or {}).get('status') == 'mined':
+            result.update({"verified": True, "source": "merkle_proof", "merkle_root": proof['merkle_root']})
+    if result["verified"]:
+        resurrection_verify_pass.inc()
+    else:
+        resurrection_verify_fail.inc()
+    return result
+
+class VerifyBatchRequest(BaseModel):
+    soul_hashes: List[str]
+
+@app.post("/verify/batch")
+async def verify_batch(request: VerifyBatchRequest):
+    """Read-only verification of many soul hashes in one round of batched eth_calls"""
+    if not contract:
+        raise HTTPException(status_code=500, detail="Contract not loaded")
+    if not request.soul_hashes:
+        raise HTTPException(status_code=400, detail="No soul hashes given")
+    if len(request.soul_hashes) > verify_batch_max:
+        raise HTTPException(status_code=400, detail=f"At most {verify_batch_max} soul hashes per request")
+    
+    try:
+        hashes = [to_bytes32(h) for h in request.soul_hashes]
+        unique = list(dict.fromkeys(hashes))
+        records = await run_in_threadpool(read_records, unique)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    by_hash = dict(zip(unique, records))
+    results = [verification(h, by_hash[h]) for h in hashes]
+    return {
+        "count": len(results),
+        "verified": sum(r["verified"] for r in results),
+        "results": results,
+        "chain_id": chain_id
+    }
 
 @app.post("/verify/{soul_hash}")
-async def verify_resurrection(soul_hash: str):
+async def verify_resurrection(soul_hash: str, response: Response, wait: bool = False, write: bool = False):
+    """Verify that a soul hash was anchored.
+
+    Answered read-only from the cached ``getRecord`` (or a Merkle proof) by
+    default. ``write=true`` sends a ``verifyResurrection`` transaction to set
+    the on-chain ``verified`` flag; add ``wait=true`` to block for its receipt.
+    """
     if not contract:
         resurrection_verify_fail.inc()
         raise HTTPException(status_code=500, detail="Contract not loaded")
     
+    hash_bytes = parse_soul_hash(soul_hash)
+    if not write:
+        try:
+            record = await run_in_threadpool(view_cache.call, contract.functions.getRecord(hash_bytes))
+        except Exception as e:
+            resurrection_verify_fail.inc()
+            raise HTTPException(status_code=500, detail=str(e))
+        return {**verification(hash_bytes, record), "chain_id": chain_id}
+    
     try:
-        account = w3.eth.account.from_key(private_key)
-        
-        # Build transaction - Convert to bytes32
-        hash_bytes = bytes.fromhex(soul_hash.replace('0x', ''))
-        if len(hash_bytes) != 32:
-            hash_bytes = hash_bytes.ljust(32, b'\x00')[:32]
-        tx = contract.functions.verifyResurrection(hash_bytes).build_transaction({
-            'from': account.address,
-            'nonce': w3.eth.get_transaction_count(account.address),
-            'gas': 100000,
-            'gasPrice': w3.eth.gas_price,
-            'chainId': chain_id
-        })
+        start_time = time.time()
+        tx_hash, sender, nonce = await run_in_threadpool(
+            send_call, tx_builder.encode_bytes32('verifyResurrection', hash_bytes), 100000
+        )
+        tx_tracker.submit(tx_hash, kind="verify", soul_hash=soul_hash, sender=sender, nonce=nonce)
         
-        signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        if not wait:
+            spawn(track_receipt(tx_hash, "verify", start_time))
+            return accepted(tx_hash.hex(), response)
         
-        # Generate explorer URL
-        explorer_tx_url = None
-        if chain_id == 80002:
-            explorer_tx_url = f"https://amoy.polygonscan.com/tx/{tx_hash.hex()}"
-        elif chain_id == 11155111:
-            explorer_tx_url = f"https://sepolia.etherscan.io/tx/{tx_hash.hex()}"
+        receipt = await receipt_watcher.wait(tx_hash)
+        tx_tracker.mined(tx_hash, receipt)
+        record_receipt("verify", receipt, time.time() - start_time)
         
-        resurrection_verify_pass.inc()
         return {
             "tx_hash": tx_hash.hex(), 
-            "verified": True,
+            "verified": receipt['status'] == 1,
             "block_number": receipt['blockNumber'],
-            "explorer_url": explorer_tx_url,
+            "explorer_url": explorer_tx_url(tx_hash.hex()),
             "chain_id": chain_id
         }
     except Exception as e:
         resurrection_verify_fail.inc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/proof/{soul_hash}")
+async def merkle_proof(soul_hash: str):
+    """Inclusion proof for a soul hash anchored through a Merkle batch"""
+    record = merkle_batcher.get_proof(parse_soul_hash(soul_hash))
+    if record is None:
+        raise HTTPException(status_code=404, detail="No Merkle proof for this soul hash")
+    tx = tx_tracker.get(record['tx_hash']) or {}
+    return {**record, "status": tx.get("status"), "block_number": tx.get("block_number")}
+
+@app.get("/record/{soul_hash}")
+async def get_record(soul_hash: str):
+    """Read a resurrection record through the view cache"""
+    if not contract:
+        raise HTTPException(status_code=500, detail="Contract not loaded")
+    
+    try:
+        record = await run_in_threadpool(view_cache.call, contract.functions.getRecord(to_bytes32(soul_hash)))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "soul_hash": soul_hash,
+        "exists": record[1] > 0,
+        "timestamp": record[1],
+        "notarizer": record[2],
+        "verified": record[3]
+    }
+
+def require_index():
+    if not event_indexer:
+        raise HTTPException(status_code=503, detail="Event index not available")
+    return event_indexer
+
+@app.get("/index/status")
+async def index_status():
+    status = require_index().status()
+    return {**status, "anchor_snapshot": anchor_snapshot.status() if anchor_snapshot is not None else None}
+
+@app.get("/index/anchored/{soul_hash}")
+async def index_anchored_hash(soul_hash: str):
+    """Whether a soul hash was ever notarized, from the on-disk anchor snapshot (no RPC)"""
+    if anchor_snapshot is None:
+        raise HTTPException(status_code=503, detail="Anchor snapshot not available")
+    hash_bytes = parse_soul_hash(soul_hash)
+    return {"soul_hash": '0x' + hash_bytes.hex(), "anchored": hash_bytes in anchor_snapshot, "as_of_block": anchor_snapshot.last_block}
+
+@app.get("/index/soul/{soul_hash}")
+async def index_by_soul_hash(soul_hash: str, limit: int = 100, offset: int = 0):
+    events = require_index().query(soul_hash='0x' + parse_soul_hash(soul_hash).hex(), limit=limit, offset=offset)
+    return {"soul_hash": soul_hash, "events": events}
+
+@app.get("/index/notarizer/{address}")
+async def index_by_notarizer(address: str, limit: int = 100, offset: int = 0):
+    events = require_index().query(event="ResurrectionNotarized", account=address, limit=limit, offset=offset)
+    return {"notarizer": address, "events": events}
+
+@app.get("/index/events")
+async def index_by_time(since: int = None, until: int = None, event: str = None, limit: int = 100, offset: int = 0):
+    events = require_index().query(event=event, since=since, until=until, limit=limit, offset=offset)
+    return {"since": since, "until": until, "events": events}
+
+@app.get("/anchor/dedup/status")
+async def anchor_dedup_status():
+    return anchor_deduper.status()
+
+@app.get("/outbox/status")
+async def outbox_status():
+    if not outbox:
+        raise HTTPException(status_code=404, detail="Outbox disabled")
+    return await run_in_threadpool(outbox.status)
+
+@app.get("/outbox/{ack_id}")
+async def outbox_entry_status(ack_id: int):
+    if not outbox:
+        raise HTTPException(status_code=404, detail="Outbox disabled")
+    entry = await run_in_threadpool(outbox.get, ack_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Unknown ack id")
+    return outbox_entry(entry)
+
+async def milestone_events(queue, tx_hashes: Optional[List[str]], confirmations: int):
+    """SSE frames for each milestone, ending once every given transaction reaches ``confirmations`` or is unmined"""
+    remaining = {normalize_tx_hash(h) for h in tx_hashes} if tx_hashes is not None else None
+    try:
+        while remaining is None or remaining:
+            try:
+                event = await asyncio.wait_for(queue.get(), tx_events_keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['milestone']}\ndata: {json.dumps(event)}\n\n"
+            if event['milestone'] == OVERFLOW:
+                return
+            if remaining is not None and (event['milestone'] in UNMINED or event.get('confirmations', 0) >= confirmations):
+                remaining.discard(event['tx_hash'])
+    finally:
+        milestones.unsubscribe(queue)
+
+def milestone_stream(tx_hashes: Optional[List[str]], confirmations: Optional[int]):
+    confirmations = min(confirmations or tx_max_confirmations, tx_max_confirmations)
+    try:
+        queue = milestones.subscribe(tx_hashes)
+    except WatchLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return StreamingResponse(
+        milestone_events(queue, tx_hashes, confirmations), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/tx/events")
+async def transaction_events(tx_hashes: Optional[str] = None, confirmations: Optional[int] = None):
+    """Server-Sent Events for several transactions (comma-separated ``tx_hashes``) or, without it, every one sent"""
+    hashes = [h.strip() for h in tx_hashes.split(',') if h.strip()] if tx_hashes else None
+    return milestone_stream(hashes, confirmations)
+
+@app.get("/tx/{tx_hash}/events")
+async def transaction_milestones(tx_hash: str, confirmations: Optional[int] = None):
+    """Server-Sent Events: broadcast, seen, included, confirmation (up to ``confirmations``), reorged, dropped/replaced"""
+    return milestone_stream([tx_hash], confirmations)
+
+@app.get("/tx/{tx_hash}")
+async def transaction_status(tx_hash: str):
+    record = tx_tracker.get(tx_hash)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Transaction not tracked")
+    return record
+
 @app.get("/health")
 async def health():
     return {"status": "healthy", "contract_loaded": contract is not None}
 
+@app.get("/rpc/status")
+async def rpc_status():
+    return {"endpoints": w3.provider.status()}
+
+@app.get("/signers/status")
+async def signers_status():
+    if not signer_pool:
+        raise HTTPException(status_code=404, detail="No signing keys configured")
+    return {"signers": signer_pool.status()}
+
 @app.get("/metrics")
 async def metrics():
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
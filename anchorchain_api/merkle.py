@@ -0,0 +1,90 @@
+"""
+Merkle tree helpers for batched anchoring.
+
+Leaves are ``keccak256(0x00 || soul_hash)`` and inner nodes are
+``keccak256(0x01 || left || right)``; an odd node at any level is paired
+with itself. This matches ``AnchorChain.verifyInclusion`` on chain.
+
+Run as a script to check a proof offline:
+
+    python merkle.py proof.json
+
+where ``proof.json`` is the body returned by ``GET /proof/{soul_hash}``.
+"""
+import json
+import sys
+
+from web3 import Web3
+
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+
+def _to_bytes(value):
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return bytes.fromhex(value.replace('0x', ''))
+
+
+def leaf_hash(soul_hash):
+    return bytes(Web3.keccak(LEAF_PREFIX + _to_bytes(soul_hash)))
+
+
+def node_hash(left, right):
+    return bytes(Web3.keccak(NODE_PREFIX + left + right))
+
+
+def build_tree(soul_hashes):
+    """Return every level of the tree, leaves first and the root level last"""
+    if not soul_hashes:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+    level = [leaf_hash(h) for h in soul_hashes]
+    levels = [level]
+    while len(level) > 1:
+        if len(level) % 2:
+            level = level + [level[-1]]
+        level = [node_hash(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+        levels.append(level)
+    return levels
+
+
+def get_proof(levels, index):
+    """Sibling hashes from leaf to root for the leaf at ``index``"""
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        proof.append(level[sibling] if sibling < len(level) else level[index])
+        index >>= 1
+    return proof
+
+
+def compute_root(soul_hash, proof, index):
+    node = leaf_hash(soul_hash)
+    for sibling in proof:
+        sibling = _to_bytes(sibling)
+        if index & 1:
+            node = node_hash(sibling, node)
+        else:
+            node = node_hash(node, sibling)
+        index >>= 1
+    return node
+
+
+def verify_proof(soul_hash, proof, index, root):
+    """Check that ``soul_hash`` sits at ``index`` under ``root``"""
+    return compute_root(soul_hash, proof, index) == _to_bytes(root)
+
+
+def main(argv):
+    if len(argv) != 2:
+        print("Usage: python merkle.py <proof.json>")
+        return 2
+    with open(argv[1], 'r') as f:
+        record = json.load(f)
+    valid = verify_proof(record['soul_hash'], record['proof'], record['leaf_index'], record['merkle_root'])
+    print(f"{'✅ valid' if valid else '❌ invalid'}: {record['soul_hash']} under root {record['merkle_root']}")
+    return 0 if valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
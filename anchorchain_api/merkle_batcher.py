@@ -0,0 +1,77 @@
+import asyncio
+from collections import OrderedDict
+
+import merkle
+
+
+class MerkleBatcher:
+    """Collects soul hashes into windows and anchors one Merkle root per window.
+
+    A window is sealed after ``window`` seconds or once it holds ``max_size``
+    distinct hashes, whichever comes first. ``anchor_root`` is an async
+    callable taking ``(root, leaf_count)`` and returning the tx hash.
+    """
+
+    def __init__(self, anchor_root, window=2.0, max_size=1000, max_proofs=100000):
+        self.anchor_root = anchor_root
+        self.window = window
+        self.max_size = max_size
+        self.max_proofs = max_proofs
+        self.proofs = OrderedDict()
+        self._pending = {}
+        self._timer = None
+        self._tasks = set()
+
+    async def add(self, soul_hash: bytes):
+        """Queue a bytes32 soul hash and wait for its inclusion proof"""
+        future = self._pending.get(soul_hash)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[soul_hash] = future
+            if len(self._pending) >= self.max_size:
+                self._seal()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.window, self._seal)
+        return await asyncio.shield(future)
+
+    def get_proof(self, soul_hash: bytes):
+        return self.proofs.get(soul_hash)
+
+    def _seal(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._flush(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, batch):
+        leaves = list(batch)
+        levels = merkle.build_tree(leaves)
+        root = levels[-1][0]
+        try:
+            tx_hash = await self.anchor_root(root, len(leaves))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for index, leaf in enumerate(leaves):
+            record = {
+                "soul_hash": '0x' + leaf.hex(),
+                "leaf_index": index,
+                "proof": ['0x' + p.hex() for p in merkle.get_proof(levels, index)],
+                "merkle_root": '0x' + root.hex(),
+                "leaf_count": len(leaves),
+                "tx_hash": tx_hash,
+            }
+            self.proofs[leaf] = record
+            self.proofs.move_to_end(leaf)
+            if not batch[leaf].done():
+                batch[leaf].set_result(record)
+        while len(self.proofs) > self.max_proofs:
+            self.proofs.popitem(last=False)
@@ -0,0 +1,268 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from starlette.concurrency import run_in_threadpool
+from web3.exceptions import TransactionNotFound
+
+from tx_tracker import normalize_tx_hash
+
+# Milestones after which a transaction is no longer followed
+UNMINED = ("dropped", "replaced")
+# Last event on a subscriber queue that fell too far behind; it is unsubscribed
+OVERFLOW = "overflow"
+
+
+class WatchLimitError(RuntimeError):
+    """Too many transactions this process did not send are already being followed"""
+
+
+class MilestoneTracker:
+    """Follows transactions to finality and pushes each milestone to subscribers.
+
+    A transaction goes ``broadcast`` → ``seen`` (returned by the node, i.e. in
+    its mempool) → ``included`` (block N, resolved by the shared
+    ``ReceiptWatcher``) → ``confirmation`` once per new head, until
+    ``max_confirmations`` is reached. If the including block leaves the
+    canonical chain the transaction is ``reorged`` and waits for inclusion
+    again. A receipt wait that times out is re-armed while the node still
+    has the transaction; once it no longer does, the transaction ends
+    ``replaced`` (its sender's nonce was used by another transaction) or
+    ``dropped``. A single head-following loop
+    serves every subscriber, so RPC load scales with blocks and watched
+    transactions, not with open connections. Finished transactions keep their
+    history (up to ``max_entries``) for late subscribers.
+
+    Subscriber queues hold at most ``queue_size`` events; one that fills up is
+    unsubscribed and ends with an ``overflow`` event. Subscribing to hashes
+    this process did not send follows them too, up to ``max_unknown`` at once.
+    """
+
+    def __init__(self, w3, receipt_watcher, max_confirmations=12, poll_interval=1.0, max_entries=10000,
+                 queue_size=256, max_unknown=1000):
+        self.w3 = w3
+        self.receipt_watcher = receipt_watcher
+        self.max_confirmations = max_confirmations
+        self.poll_interval = poll_interval
+        self.max_entries = max_entries
+        self.queue_size = queue_size
+        self.max_unknown = max_unknown
+        self.overflows = 0
+        self._txs = OrderedDict()
+        self._subscribers = {}
+        self._firehose = set()
+        self._last_head = None
+        self._task = None
+        self._receipt_tasks = set()
+
+    def watch(self, tx_hash, broadcast=True, sender=None, nonce=None):
+        """Start following ``tx_hash``; ``broadcast`` records that this process just sent it.
+
+        ``sender`` and ``nonce`` (known to whoever signed it) let a transaction
+        that is never mined be told ``replaced`` from ``dropped`` even if the
+        node never returned it.
+        """
+        tx_hash = normalize_tx_hash(tx_hash)
+        if tx_hash in self._txs:
+            return
+        self._txs[tx_hash] = {"state": "pending", "events": [], "seen": False, "sender": sender, "nonce": nonce,
+                              "unknown": not broadcast, "block_number": None, "block_hash": None,
+                              "confirmations": 0}
+        while len(self._txs) > self.max_entries:
+            self._txs.popitem(last=False)
+        if broadcast:
+            self._emit(tx_hash, "broadcast")
+        self._spawn(self._await_receipt(tx_hash))
+        self.start()
+
+    def history(self, tx_hash):
+        entry = self._txs.get(normalize_tx_hash(tx_hash))
+        return list(entry["events"]) if entry else None
+
+    def subscribe(self, tx_hashes=None):
+        """Queue of milestones for ``tx_hashes`` (their history first), or for every transaction if None.
+
+        Raises ``WatchLimitError`` if following the hashes not yet tracked
+        would exceed ``max_unknown``.
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        if tx_hashes is None:
+            self._firehose.add(queue)
+            return queue
+        tx_hashes = list(dict.fromkeys(map(normalize_tx_hash, tx_hashes)))
+        unknown = [h for h in tx_hashes if h not in self._txs]
+        if unknown and self._unknown_active() + len(unknown) > self.max_unknown:
+            raise WatchLimitError(f"already following {self.max_unknown} transactions not sent by this API")
+        for tx_hash in tx_hashes:
+            self._subscribers.setdefault(tx_hash, set()).add(queue)
+            if tx_hash in self._txs:
+                for event in self._txs[tx_hash]["events"]:
+                    self._deliver(queue, event)
+            else:
+                self.watch(tx_hash, broadcast=False)
+        return queue
+
+    def unsubscribe(self, queue):
+        self._firehose.discard(queue)
+        for tx_hash, queues in list(self._subscribers.items()):
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[tx_hash]
+
+    def _emit(self, tx_hash, milestone, **info):
+        entry = self._txs.get(tx_hash)
+        if entry is None:
+            return
+        event = {"tx_hash": tx_hash, "milestone": milestone, "at": time.time(), **info}
+        entry["events"].append(event)
+        for queue in self._subscribers.get(tx_hash, set()) | self._firehose:
+            self._deliver(queue, event)
+
+    def _deliver(self, queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client that stopped reading is cut off instead of buffered without bound
+            self.unsubscribe(queue)
+            self.overflows += 1
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"tx_hash": None, "milestone": OVERFLOW, "at": time.time()})
+
+    def _unknown_active(self):
+        return sum(1 for e in self._txs.values() if e["unknown"] and e["state"] != "final")
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._receipt_tasks.add(task)
+        task.add_done_callback(self._receipt_tasks.discard)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in list(self._receipt_tasks):
+            task.cancel()
+
+    def status(self):
+        states = {}
+        for entry in self._txs.values():
+            states[entry["state"]] = states.get(entry["state"], 0) + 1
+        return {"tracked": states, "unknown": self._unknown_active(), "overflows": self.overflows,
+                "subscribers": len(self._firehose) + sum(map(len, self._subscribers.values()))}
+
+    async def _await_receipt(self, tx_hash):
+        while True:
+            try:
+                receipt = await self.receipt_watcher.wait(tx_hash)
+                break
+            except Exception as e:
+                entry = self._txs.get(tx_hash)
+                if entry is None or entry["state"] != "pending":
+                    return
+                # A wait that timed out says nothing final while the node still holds the transaction
+                if await self._still_known(tx_hash, entry):
+                    continue
+                await self._unmined(tx_hash, str(e))
+                return
+        self._included(tx_hash, receipt)
+
+    async def _still_known(self, tx_hash, entry):
+        try:
+            return await self._look_for(tx_hash, entry)
+        except Exception as e:
+            print(f"Milestone lookup error for {tx_hash}: {e}")
+            return True
+
+    def _included(self, tx_hash, receipt):
+        entry = self._txs.get(tx_hash)
+        if entry is None or entry["state"] != "pending":
+            return
+        entry.update({"state": "included", "block_number": receipt['blockNumber'],
+                      "block_hash": bytes(receipt['blockHash']), "confirmations": 1})
+        self._emit(tx_hash, "included", block_number=receipt['blockNumber'],
+                   block_hash='0x' + bytes(receipt['blockHash']).hex(),
+                   status="mined" if receipt['status'] == 1 else "failed", confirmations=1)
+        self._check_final(entry)
+
+    async def _unmined(self, tx_hash, error):
+        entry = self._txs.get(tx_hash)
+        if entry is None or entry["state"] != "pending":
+            return
+        milestone = "dropped"
+        if entry["sender"] is not None and entry["nonce"] is not None:
+            mined_nonce = await run_in_threadpool(self.w3.eth.get_transaction_count, entry["sender"], 'latest')
+            if mined_nonce > entry["nonce"]:
+                milestone = "replaced"
+        entry["state"] = "final"
+        self._emit(tx_hash, milestone, error=error, nonce=entry["nonce"])
+
+    def _check_final(self, entry):
+        if entry["confirmations"] >= self.max_confirmations:
+            entry["state"] = "final"
+
+    async def _run(self):
+        while True:
+            try:
+                if not await self._tick():
+                    self._last_head = None
+                    return
+            except Exception as e:
+                print(f"Milestone tracker error: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _tick(self):
+        """One poll; False once nothing is left to follow"""
+        active = [(h, e) for h, e in self._txs.items() if e["state"] != "final"]
+        if not active:
+            return False
+        for tx_hash, entry in active:
+            # Mempool lookups cost one call per transaction, so only for ones someone is listening to
+            if entry["state"] == "pending" and not entry["seen"] and (self._firehose or tx_hash in self._subscribers):
+                await self._look_for(tx_hash, entry)
+
+        head = await run_in_threadpool(lambda: self.w3.eth.block_number)
+        if head == self._last_head:
+            return True
+        self._last_head = head
+        blocks = {}
+        for tx_hash, entry in active:
+            if entry["state"] == "pending" and entry.get("reorged"):
+                # The receipt watcher has already scanned the heights it may land at again
+                try:
+                    self._included(tx_hash, await run_in_threadpool(self.w3.eth.get_transaction_receipt, tx_hash))
+                except TransactionNotFound:
+                    pass
+            if entry["state"] != "included":
+                continue
+            number = entry["block_number"]
+            if number not in blocks:
+                blocks[number] = await run_in_threadpool(self.w3.eth.get_block, number)
+            if bytes(blocks[number]['hash']) != entry["block_hash"]:
+                entry.update({"state": "pending", "block_number": None, "block_hash": None, "confirmations": 0,
+                              "reorged": True})
+                self._emit(tx_hash, "reorged", block_number=number)
+                self._spawn(self._await_receipt(tx_hash))
+                continue
+            confirmations = min(head - number + 1, self.max_confirmations)
+            if confirmations > entry["confirmations"]:
+                entry["confirmations"] = confirmations
+                self._emit(tx_hash, "confirmation", block_number=number, confirmations=confirmations)
+                self._check_final(entry)
+        return True
+
+    async def _look_for(self, tx_hash, entry):
+        """Whether the node knows ``tx_hash``; the first sighting emits ``seen``"""
+        try:
+            tx = await run_in_threadpool(self.w3.eth.get_transaction, tx_hash)
+        except TransactionNotFound:
+            return False
+        if not entry["seen"]:
+            entry.update({"seen": True, "sender": tx['from'], "nonce": tx['nonce']})
+            if tx.get('blockNumber') is None:
+                self._emit(tx_hash, "seen", sender=tx['from'], nonce=tx['nonce'])
+        return True
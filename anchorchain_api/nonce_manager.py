@@ -0,0 +1,110 @@
+import heapq
+import threading
+from contextlib import contextmanager
+
+
+class NonceManager:
+    """In-process nonce allocator for a single sending account.
+
+    Nonces are reserved under a lock so concurrent requests never share one.
+    A nonce whose send fails is handed back and reused before any new nonce,
+    so later transactions are not left stuck behind a gap.
+    """
+
+    def __init__(self, w3, address):
+        self.w3 = w3
+        self.address = address
+        self._lock = threading.Lock()
+        self._next = None
+        self._in_flight = set()
+        self._released = []
+        # Nonces confirmed while a resync waits on the node; its count may predate them
+        self._resyncs = 0
+        self._confirmed_meanwhile = set()
+
+    def _chain_nonce(self):
+        return self.w3.eth.get_transaction_count(self.address, 'pending')
+
+    def reserve(self):
+        """Reserve the lowest free nonce for this account"""
+        with self._lock:
+            if self._released:
+                nonce = heapq.heappop(self._released)
+            else:
+                if self._next is None:
+                    self._next = self._chain_nonce()
+                nonce = self._next
+                self._next += 1
+            self._in_flight.add(nonce)
+            return nonce
+
+    def confirm(self, nonce):
+        """Mark a nonce as used once its transaction was accepted by the node"""
+        with self._lock:
+            self._in_flight.discard(nonce)
+            if self._resyncs:
+                self._confirmed_meanwhile.add(nonce)
+
+    def release(self, nonce):
+        """Return a nonce whose transaction was never broadcast"""
+        with self._lock:
+            self._in_flight.discard(nonce)
+            if nonce not in self._released:
+                heapq.heappush(self._released, nonce)
+
+    def resync(self):
+        """Realign with the node's pending count after a send error.
+
+        The count is read without holding the lock, so other senders keep
+        reserving while the node answers; nonces confirmed in the meantime are
+        not mistaken for gaps.
+        """
+        with self._lock:
+            self._resyncs += 1
+        try:
+            chain = self._chain_nonce()
+        except Exception:
+            with self._lock:
+                self._end_resync()
+            raise
+        with self._lock:
+            used = self._end_resync()
+            highest = max(self._in_flight, default=chain - 1)
+            local_next = self._next if self._next is not None else chain
+            self._next = max(chain, highest + 1, local_next)
+            # Anything below the node's pending count is spent; anything between
+            # it and our counter that is not in flight is a gap to refill.
+            gaps = {n for n in self._released if n >= chain}
+            gaps.update(n for n in range(chain, self._next) if n not in self._in_flight and n not in used)
+            self._released = sorted(gaps)
+
+    def _end_resync(self):
+        self._resyncs -= 1
+        used = set(self._confirmed_meanwhile)
+        if not self._resyncs:
+            self._confirmed_meanwhile.clear()
+        return used
+
+    @contextmanager
+    def allocate(self):
+        """Reserve a nonce for the duration of a sign-and-send block"""
+        nonce = self.reserve()
+        try:
+            yield nonce
+        except Exception:
+            self.release(nonce)
+            try:
+                self.resync()
+            except Exception as e:
+                print(f"Nonce resync error: {e}")
+            raise
+        self.confirm(nonce)
+
+    def status(self):
+        with self._lock:
+            return {
+                "address": self.address,
+                "next_nonce": self._next,
+                "in_flight": len(self._in_flight),
+                "gaps": list(self._released),
+            }
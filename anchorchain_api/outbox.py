@@ -0,0 +1,156 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    tx_hash TEXT,
+    block_number INTEGER,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, id);
+"""
+
+# queued -> signed (tx hash known, maybe broadcast) -> submitted -> mined | failed
+UNFINISHED = ("queued", "signed", "submitted")
+
+
+class Outbox:
+    """Durable write-ahead log of accepted requests awaiting chain submission.
+
+    Each ``append`` is committed to SQLite in WAL mode with
+    ``synchronous=FULL``, so an acknowledged entry survives a crash. The
+    submitter claims queued entries, records the signed tx hash *before*
+    broadcasting, then the outcome; entries left ``signed`` or ``submitted``
+    by a restart can therefore be checked on chain instead of sent twice.
+    ``wait(id)`` lets a request block until its entry is finished.
+    """
+
+    def __init__(self, db_path, max_attempts=5):
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(SCHEMA)
+        self._waiters = {}
+        self._work = None
+        self._loop = None
+
+    def _row(self, row):
+        keys = ("id", "kind", "payload", "status", "tx_hash", "block_number", "error", "attempts", "created_at", "updated_at")
+        entry = dict(zip(keys, row))
+        entry["payload"] = json.loads(entry["payload"])
+        return entry
+
+    def append(self, kind, payload):
+        """Durably record a request; returns its ack id"""
+        now = time.time()
+        with self._lock:
+            with self._db:
+                cursor = self._db.execute(
+                    "INSERT INTO outbox (kind, payload, status, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?)",
+                    (kind, json.dumps(payload), now, now)
+                )
+        if self._work is not None:
+            # append runs in a worker thread; the event belongs to the loop
+            self._loop.call_soon_threadsafe(self._work.set)
+        return cursor.lastrowid
+
+    def get(self, entry_id):
+        with self._lock:
+            row = self._db.execute("SELECT * FROM outbox WHERE id = ?", (entry_id,)).fetchone()
+        return self._row(row) if row else None
+
+    def claim(self, kind, limit):
+        """Oldest queued entries of ``kind``, up to ``limit``"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM outbox WHERE status = 'queued' AND kind = ? ORDER BY id LIMIT ?", (kind, limit)
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def unfinished(self, statuses=UNFINISHED):
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT * FROM outbox WHERE status IN ({','.join('?' * len(statuses))}) ORDER BY id", statuses
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def _update(self, ids, status, **fields):
+        columns = ["status = ?", "updated_at = ?"] + [f"{name} = ?" for name in fields]
+        values = [status, time.time()] + list(fields.values())
+        with self._lock:
+            with self._db:
+                self._db.executemany(
+                    f"UPDATE outbox SET {', '.join(columns)} WHERE id = ?", [values + [i] for i in ids]
+                )
+
+    def mark_signed(self, ids, tx_hash):
+        self._update(ids, "signed", tx_hash=tx_hash)
+
+    def mark_submitted(self, ids):
+        self._update(ids, "submitted")
+
+    def mark_mined(self, ids, tx_hash, block_number, success=True):
+        self._update(ids, "mined" if success else "failed", tx_hash=tx_hash, block_number=block_number,
+                     error=None if success else "Transaction reverted")
+
+    def retry(self, ids, error):
+        """Send entries back to the queue, or fail them after ``max_attempts``"""
+        with self._lock:
+            with self._db:
+                self._db.executemany(
+                    "UPDATE outbox SET attempts = attempts + 1, error = ?, tx_hash = NULL, updated_at = ?, "
+                    "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'queued' END WHERE id = ?",
+                    [(str(error), time.time(), self.max_attempts, i) for i in ids]
+                )
+
+    async def wait(self, entry_id):
+        """Wait until an entry is mined or failed and return it"""
+        while True:
+            # Registered before the (off-loop) read, so a notify() during it is not missed
+            future = self._waiters.get(entry_id)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._waiters[entry_id] = future
+            entry = await run_in_threadpool(self.get, entry_id)
+            if entry is None or entry["status"] in ("mined", "failed"):
+                # Wakes any other waiter on the entry too; each re-reads and returns
+                self.notify([entry_id])
+                return entry
+            await asyncio.shield(future)
+
+    def notify(self, ids):
+        """Wake requests waiting on ``ids`` to re-check them (call from the event loop)"""
+        for entry_id in ids:
+            future = self._waiters.pop(entry_id, None)
+            if future is not None and not future.done():
+                future.set_result(None)
+
+    async def wait_for_work(self, timeout):
+        """Sleep until something is appended or ``timeout`` passes"""
+        if self._work is None:
+            self._loop = asyncio.get_running_loop()
+            self._work = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._work.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._work.clear()
+
+    def status(self):
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return dict(rows)
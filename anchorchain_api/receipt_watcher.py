@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+from starlette.concurrency import run_in_threadpool
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+from tx_tracker import normalize_tx_hash
+
+
+class ReceiptWatcher:
+    """Resolves receipts for every pending transaction from one head-following loop.
+
+    The loop polls ``eth_blockNumber`` once per ``poll_interval`` and, for each
+    new block, fetches the block's transaction hashes and the receipts of the
+    ones being waited on. RPC load therefore scales with blocks, not with the
+    number of waiting requests. Nothing is polled while no one is waiting.
+    ``on_seen(tx_hash, block_timestamp)`` is called when a waited-on
+    transaction is first found in a block.
+    """
+
+    def __init__(self, w3, poll_interval=1.0, timeout=120, on_pending=None, on_seen=None):
+        self.w3 = w3
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.on_pending = on_pending
+        self.on_seen = on_seen
+        self._waiters = {}
+        self._last_block = None
+        self._task = None
+
+    async def wait(self, tx_hash):
+        """Wait until ``tx_hash`` is mined and return its receipt"""
+        tx_hash = normalize_tx_hash(tx_hash)
+        entry = self._waiters.get(tx_hash)
+        if entry is None:
+            future = asyncio.get_running_loop().create_future()
+            # Every new waiter gets one direct receipt lookup: its transaction
+            # may sit in a block the loop has already walked past.
+            entry = {"future": future, "deadline": time.time() + self.timeout, "checked": False}
+            self._waiters[tx_hash] = entry
+        self.start()
+        return await asyncio.shield(entry["future"])
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def pending_count(self):
+        return len(self._waiters)
+
+    async def _run(self):
+        while True:
+            try:
+                await self._tick()
+            except Exception as e:
+                print(f"Receipt watcher error: {e}")
+            if self.on_pending:
+                self.on_pending(len(self._waiters))
+            await asyncio.sleep(self.poll_interval)
+
+    async def _tick(self):
+        self._drop_cancelled()
+        if not self._waiters:
+            self._last_block = None
+            return
+
+        head = await run_in_threadpool(lambda: self.w3.eth.block_number)
+        if self._last_block is None:
+            self._last_block = head - 1
+
+        # Looked up after reading the head: anything mined later is in a block still to be walked
+        for tx_hash, entry in list(self._waiters.items()):
+            if not entry["checked"]:
+                entry["checked"] = True
+                await self._lookup(tx_hash)
+
+        while self._last_block < head and self._waiters:
+            number = self._last_block + 1
+            block = await run_in_threadpool(self.w3.eth.get_block, number)
+            for tx in block['transactions']:
+                tx_hash = normalize_tx_hash(bytes(tx))
+                if tx_hash in self._waiters:
+                    if self.on_seen:
+                        self.on_seen(tx_hash, block['timestamp'])
+                    await self._lookup(tx_hash)
+            self._last_block = number
+
+        now = time.time()
+        for tx_hash, entry in list(self._waiters.items()):
+            if entry["deadline"] < now and not await self._lookup(tx_hash):
+                self._resolve(tx_hash, exception=TimeExhausted(
+                    f"Transaction {tx_hash} is not in the chain after {self.timeout} seconds"
+                ))
+
+    async def _lookup(self, tx_hash):
+        try:
+            receipt = await run_in_threadpool(self.w3.eth.get_transaction_receipt, tx_hash)
+        except TransactionNotFound:
+            return False
+        self._resolve(tx_hash, receipt=receipt)
+        return True
+
+    def _resolve(self, tx_hash, receipt=None, exception=None):
+        entry = self._waiters.pop(tx_hash, None)
+        if entry is None or entry["future"].done():
+            return
+        if exception is not None:
+            entry["future"].set_exception(exception)
+        else:
+            entry["future"].set_result(receipt)
+
+    def _drop_cancelled(self):
+        for tx_hash, entry in list(self._waiters.items()):
+            if entry["future"].cancelled():
+                del self._waiters[tx_hash]
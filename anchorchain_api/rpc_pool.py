@@ -0,0 +1,184 @@
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+from web3.providers.base import JSONBaseProvider
+
+# JSON-RPC error messages that mean "this node is throttling us", not "the call failed"
+RATE_LIMIT_ERRORS = ("rate limit", "too many requests", "request limit", "daily limit")
+
+# Errors from a broadcast that only mean another node already has the transaction
+KNOWN_TX_ERRORS = ("already known", "known transaction", "already imported", "alreadyknown")
+
+
+def endpoint_name(uri):
+    """Host[:port] of an RPC URL, without the path (which often carries an API key)"""
+    parsed = urlparse(uri)
+    return f"{parsed.hostname}:{parsed.port}" if parsed.port else parsed.hostname or uri
+
+
+class Endpoint:
+    """One RPC node: a keep-alive session plus rolling latency and error stats"""
+
+    def __init__(self, uri, pool_size, window):
+        self.uri = uri
+        self.name = endpoint_name(uri)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.latency = None
+        self.outcomes = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.down_until = 0
+
+    @property
+    def healthy(self):
+        return time.time() >= self.down_until
+
+    @property
+    def error_rate(self):
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def score(self):
+        """Lower is better: healthy nodes first, then by latency weighted by recent errors"""
+        latency = self.latency if self.latency is not None else 0.0
+        return (not self.healthy, latency * (1 + 4 * self.error_rate))
+
+
+class PooledHTTPProvider(JSONBaseProvider):
+    """Web3 provider spread over several RPC endpoints.
+
+    Reads go to the healthy endpoint with the lowest rolling latency; a
+    connection error, timeout, HTTP error or rate-limit response fails over
+    to the next one and takes the failing node out of rotation for
+    ``cooldown`` seconds once ``max_failures`` happen in a row. Signed
+    transactions are broadcast to the ``broadcast_fanout`` best endpoints in
+    parallel and the first accepted result is returned. Latency is an EWMA
+    (``alpha``) and the error rate covers the last ``window`` requests.
+    ``on_request(endpoint, method, seconds, ok)`` is called after every
+    attempt, for metrics.
+    """
+
+    def __init__(self, endpoint_uris, pool_size=20, timeout=10, broadcast_fanout=3,
+                 window=100, alpha=0.2, max_failures=3, cooldown=30, on_request=None):
+        super().__init__()
+        if isinstance(endpoint_uris, str):
+            endpoint_uris = [endpoint_uris]
+        if not endpoint_uris:
+            raise ValueError("At least one RPC endpoint is required")
+        self.endpoints = [Endpoint(uri, pool_size, window) for uri in endpoint_uris]
+        self.timeout = timeout
+        self.broadcast_fanout = broadcast_fanout
+        self.alpha = alpha
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.on_request = on_request
+        self._lock = threading.Lock()
+        self._broadcaster = ThreadPoolExecutor(max_workers=max(1, min(broadcast_fanout, len(self.endpoints))))
+
+    @property
+    def endpoint_uri(self):
+        return self.ranked()[0].uri
+
+    def ranked(self):
+        with self._lock:
+            return sorted(self.endpoints, key=Endpoint.score)
+
+    def _record(self, endpoint, method, seconds, ok):
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.outcomes.append(ok)
+            if ok:
+                endpoint.latency = seconds if endpoint.latency is None else (
+                    self.alpha * seconds + (1 - self.alpha) * endpoint.latency
+                )
+                endpoint.down_until = 0
+            else:
+                endpoint.errors += 1
+                recent = list(endpoint.outcomes)[-self.max_failures:]
+                if len(recent) == self.max_failures and not any(recent):
+                    endpoint.down_until = time.time() + self.cooldown
+        if self.on_request:
+            self.on_request(endpoint.name, method, seconds, ok)
+
+    def _post(self, endpoint, method, body):
+        """POST ``body`` to one endpoint; raises on transport, HTTP or rate-limit errors"""
+        started = time.perf_counter()
+        try:
+            response = endpoint.session.post(
+                endpoint.uri, data=body, timeout=self.timeout,
+                headers={'Content-Type': 'application/json'}
+            )
+            response.raise_for_status()
+            result = self.decode_rpc_response(response.content)
+            errors = [r.get('error') for r in (result if isinstance(result, list) else [result])]
+            for error in errors:
+                if error and any(s in str(error).lower() for s in RATE_LIMIT_ERRORS):
+                    raise requests.HTTPError(f"{endpoint.name} rate limited: {error}")
+        except Exception:
+            self._record(endpoint, method, time.perf_counter() - started, False)
+            raise
+        self._record(endpoint, method, time.perf_counter() - started, True)
+        return result
+
+    def _failover(self, method, body):
+        last_error = None
+        for endpoint in self.ranked():
+            try:
+                return self._post(endpoint, method, body)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def make_request(self, method, params):
+        body = self.encode_rpc_request(method, params)
+        if method == 'eth_sendRawTransaction' and self.broadcast_fanout > 1 and len(self.endpoints) > 1:
+            return self._broadcast(method, params, body)
+        return self._failover(method, body)
+
+    def make_batch_request(self, payload):
+        """Send a raw JSON-RPC batch (list of request dicts) to the best endpoint"""
+        return self._failover('batch', json.dumps(payload).encode('utf-8'))
+
+    def _broadcast(self, method, params, body):
+        targets = [e for e in self.ranked() if e.healthy][:self.broadcast_fanout] or self.ranked()[:1]
+        futures = [self._broadcaster.submit(self._post, endpoint, method, body) for endpoint in targets]
+        error_response = last_error = None
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                last_error = e
+                continue
+            error = response.get('error')
+            if not error:
+                return response
+            if any(s in str(error).lower() for s in KNOWN_TX_ERRORS):
+                # The node already had it from a peer: the transaction is in the mempool
+                return {'jsonrpc': '2.0', 'id': response.get('id'), 'result': Web3.keccak(hexstr=params[0]).hex()}
+            error_response = error_response or response
+        if error_response is not None:
+            return error_response
+        raise last_error
+
+    def status(self):
+        with self._lock:
+            return [
+                {
+                    "endpoint": e.name,
+                    "healthy": e.healthy,
+                    "latency_ms": round(e.latency * 1000, 1) if e.latency is not None else None,
+                    "error_rate": round(e.error_rate, 3),
+                    "requests": e.requests,
+                    "errors": e.errors,
+                }
+                for e in self.endpoints
+            ]
@@ -0,0 +1,114 @@
+import threading
+from contextlib import contextmanager
+
+from eth_account import Account
+
+from nonce_manager import NonceManager
+
+
+class Signer:
+    """One sending account with its own nonce allocator and load counters"""
+
+    def __init__(self, w3, private_key):
+        self.account = Account.from_key(private_key)
+        self.address = self.account.address
+        self.nonces = NonceManager(w3, self.address)
+        self.in_flight = 0
+        self.mined_nonce = None
+        self.balance = None
+        self.active = True
+
+    def pending(self):
+        """Transactions being signed, or sent and not yet mined as of the last refresh"""
+        next_nonce = self.nonces.status()["next_nonce"]
+        if next_nonce is None or self.mined_nonce is None:
+            return self.in_flight
+        return max(self.in_flight, next_nonce - self.mined_nonce)
+
+
+class SignerPool:
+    """Sending accounts that share the write load.
+
+    Nonces only serialize transactions from the same account, so each key is
+    an independent queue: a stuck transaction holds up its own account, not
+    every later write. ``allocate()`` picks the active signer with the fewest
+    pending transactions (ties rotate) and reserves its next nonce.
+    ``refresh()`` reads every account's mined nonce and balance; accounts
+    below ``min_balance`` wei leave the rotation until they are topped up.
+    ``allocate(address)`` pins a send to one account instead, for writes
+    whose on-chain state is keyed by the sender.
+    """
+
+    def __init__(self, w3, private_keys, min_balance=0, on_send=None):
+        self.w3 = w3
+        self.min_balance = min_balance
+        self.on_send = on_send
+        self.signers = [Signer(w3, key) for key in private_keys]
+        self._lock = threading.Lock()
+        self._turn = 0
+
+    def __len__(self):
+        return len(self.signers)
+
+    @property
+    def primary(self):
+        return self.signers[0]
+
+    def get(self, address):
+        """The signer for ``address``, or None if it is not in the pool"""
+        return next((s for s in self.signers if s.address.lower() == address.lower()), None)
+
+    def acquire(self, address=None):
+        """Least-loaded active signer (or the one for ``address``), counted as in flight until ``release``"""
+        with self._lock:
+            if address is not None:
+                signer = self.get(address)
+                if signer is None:
+                    raise ValueError(f"{address} is not a signing account of this pool")
+                if not signer.active:
+                    raise RuntimeError(f"Signer {signer.address} is below the minimum balance")
+                signer.in_flight += 1
+                return signer
+            candidates = [s for s in self.signers if s.active]
+            if not candidates:
+                raise RuntimeError("No signer has enough balance to send")
+            self._turn = (self._turn + 1) % len(candidates)
+            signer = min(candidates[self._turn:] + candidates[:self._turn], key=Signer.pending)
+            signer.in_flight += 1
+            return signer
+
+    def release(self, signer):
+        with self._lock:
+            signer.in_flight -= 1
+
+    @contextmanager
+    def allocate(self, address=None):
+        """Reserve a signer and nonce for the duration of a sign-and-send block"""
+        signer = self.acquire(address)
+        try:
+            with signer.nonces.allocate() as nonce:
+                yield signer, nonce
+            if self.on_send:
+                self.on_send(signer.address)
+        finally:
+            self.release(signer)
+
+    def refresh(self):
+        """Read mined nonces and balances; take underfunded accounts out of rotation"""
+        for signer in self.signers:
+            signer.mined_nonce = self.w3.eth.get_transaction_count(signer.address, 'latest')
+            signer.balance = self.w3.eth.get_balance(signer.address)
+            signer.active = signer.balance >= self.min_balance
+
+    def status(self):
+        return [
+            {
+                "address": s.address,
+                "active": s.active,
+                "pending": s.pending(),
+                "in_flight": s.in_flight,
+                "balance_wei": s.balance,
+                "nonce": s.nonces.status(),
+            }
+            for s in self.signers
+        ]
@@ -0,0 +1,149 @@
+"""
+Incremental hashing of uploaded soul-state payloads.
+
+``StreamHasher`` digests a byte stream as it arrives, so memory use is bounded
+by the block handed to ``update`` rather than the payload size. With
+``chunk_size`` set it also hashes every ``chunk_size`` bytes on its own and
+builds a Merkle tree over those chunk digests (see ``merkle.py``), so a single
+chunk can later be proven part of the anchored payload without the rest.
+"""
+import hashlib
+
+from eth_hash.auto import keccak
+from multipart.multipart import MultipartParser, parse_options_header
+
+from merkle import build_tree
+
+ALGORITHMS = ("sha256", "keccak")
+
+
+def new_hash(algorithm):
+    if algorithm == "sha256":
+        return hashlib.sha256()
+    if algorithm == "keccak":
+        return keccak.new(b'')
+    raise ValueError(f"Unknown hash algorithm '{algorithm}' (expected one of {', '.join(ALGORITHMS)})")
+
+
+class StreamHasher:
+    """Payload digest plus, with ``chunk_size``, per-chunk digests and their Merkle root"""
+
+    def __init__(self, algorithm="sha256", chunk_size=None):
+        self.algorithm = algorithm
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.chunk_hashes = []
+        self._hash = new_hash(algorithm)
+        self._chunk = new_hash(algorithm) if chunk_size else None
+        self._chunk_fill = 0
+        self._levels = None
+
+    def update(self, data: bytes):
+        self._hash.update(data)
+        self.size += len(data)
+        if not self.chunk_size:
+            return
+        offset = 0
+        while offset < len(data):
+            take = min(len(data) - offset, self.chunk_size - self._chunk_fill)
+            self._chunk.update(data[offset:offset + take])
+            self._chunk_fill += take
+            offset += take
+            if self._chunk_fill == self.chunk_size:
+                self._end_chunk()
+
+    def _end_chunk(self):
+        self.chunk_hashes.append(self._chunk.digest())
+        self._chunk = new_hash(self.algorithm)
+        self._chunk_fill = 0
+
+    def finish(self):
+        """Close the last partial chunk and build the chunk tree; returns the payload digest"""
+        if self.chunk_size and (self._chunk_fill or not self.chunk_hashes):
+            self._end_chunk()
+        if self.chunk_size:
+            self._levels = build_tree(self.chunk_hashes)
+        return self._hash.digest()
+
+    @property
+    def merkle_root(self):
+        return self._levels[-1][0] if self._levels else None
+
+    def status(self, chunk_hashes=False):
+        """Summary of the hashed payload; the chunk digests themselves only with ``chunk_hashes``"""
+        result = {
+            "algorithm": self.algorithm,
+            "size_bytes": self.size,
+            "content_hash": '0x' + self._hash.digest().hex(),
+        }
+        if self._levels:
+            result.update({
+                "chunk_size": self.chunk_size,
+                "chunk_count": len(self.chunk_hashes),
+                "merkle_root": '0x' + self.merkle_root.hex(),
+            })
+            if chunk_hashes:
+                result["chunk_hashes"] = ['0x' + h.hex() for h in self.chunk_hashes]
+        return result
+
+
+class MultipartFileFeed:
+    """Streams the first file part of a ``multipart/form-data`` body into a hasher.
+
+    ``write`` takes raw body bytes in any split; only the bytes of the first
+    part carrying a ``filename`` reach the hasher, the other fields are skipped.
+    """
+
+    def __init__(self, content_type, hasher):
+        _, params = parse_options_header(content_type)
+        boundary = params.get(b'boundary')
+        if not boundary:
+            raise ValueError("multipart body without a boundary")
+        self.hasher = hasher
+        self.found = False
+        self._in_file = False
+        self._field = b''
+        self._value = b''
+        self._headers = {}
+        self.parser = MultipartParser(boundary, {
+            'on_part_begin': self._part_begin,
+            'on_header_field': self._header_field,
+            'on_header_value': self._header_value,
+            'on_header_end': self._header_end,
+            'on_headers_finished': self._headers_finished,
+            'on_part_data': self._part_data,
+            'on_part_end': self._part_end,
+        })
+
+    def write(self, data: bytes):
+        self.parser.write(data)
+
+    def finish(self):
+        self.parser.finalize()
+        if not self.found:
+            raise ValueError("multipart body has no file part")
+
+    def _part_begin(self):
+        self._headers = {}
+
+    def _header_field(self, data, start, end):
+        self._field += data[start:end]
+
+    def _header_value(self, data, start, end):
+        self._value += data[start:end]
+
+    def _header_end(self):
+        self._headers[self._field.lower()] = self._value
+        self._field, self._value = b'', b''
+
+    def _headers_finished(self):
+        _, params = parse_options_header(self._headers.get(b'content-disposition', b''))
+        self._in_file = not self.found and b'filename' in params
+        self.found = self.found or self._in_file
+
+    def _part_data(self, data, start, end):
+        if self._in_file:
+            self.hasher.update(data[start:end])
+
+    def _part_end(self):
+        self._in_file = False
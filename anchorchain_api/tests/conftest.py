@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The service modules import each other as top-level modules (as when run from anchorchain_api/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,140 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from web3.exceptions import TransactionNotFound
+
+from milestones import OVERFLOW, MilestoneTracker, WatchLimitError
+
+SENDER = '0x' + '11' * 20
+
+
+def tx(n):
+    return '0x' + f'{n:064x}'
+
+
+class FakeEth:
+    """Node holding the unmined transactions in ``mempool``; ``count`` is the sender's mined nonce"""
+
+    def __init__(self, count=0):
+        self.count = count
+        self.block_number = 0
+        self.mempool = {}
+
+    def get_transaction(self, tx_hash):
+        if tx_hash not in self.mempool:
+            raise TransactionNotFound(tx_hash)
+        return self.mempool[tx_hash]
+
+    def get_transaction_count(self, address, block):
+        return self.count
+
+
+class FakeWatcher:
+    """Receipt waits that end when the test resolves or fails them"""
+
+    def __init__(self):
+        self.futures = {}
+
+    async def wait(self, tx_hash):
+        self.futures[tx_hash] = asyncio.get_running_loop().create_future()
+        return await self.futures[tx_hash]
+
+
+def tracker(eth=None, **kwargs):
+    watcher = FakeWatcher()
+    milestones = MilestoneTracker(SimpleNamespace(eth=eth or FakeEth()), watcher, poll_interval=0.01, **kwargs)
+    return milestones, watcher
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_receipt_tasks_are_held_until_done():
+    async def scenario():
+        milestones, watcher = tracker()
+        milestones.watch(tx(1))
+        await asyncio.sleep(0)
+        held = len(milestones._receipt_tasks)
+        watcher.futures[tx(1)].set_result({'blockNumber': 0, 'blockHash': b'\x01' * 32, 'status': 1})
+        await asyncio.sleep(0.01)
+        left = len(milestones._receipt_tasks)
+        await milestones.stop()
+        return held, left
+
+    assert run(scenario()) == (1, 0)
+
+
+def test_replaced_uses_sender_and_nonce_from_submit():
+    async def scenario():
+        milestones, watcher = tracker(FakeEth(count=8))
+        milestones.watch(tx(1), sender=SENDER, nonce=7)
+        await asyncio.sleep(0)
+        watcher.futures[tx(1)].set_exception(TimeoutError("not mined"))
+        await asyncio.sleep(0.01)
+        await milestones.stop()
+        return milestones.history(tx(1))[-1]
+
+    event = run(scenario())
+    assert event['milestone'] == "replaced"
+    assert event['nonce'] == 7
+
+
+def test_timed_out_wait_is_rearmed_while_the_node_has_the_tx():
+    async def scenario():
+        eth = FakeEth()
+        eth.mempool[tx(1)] = {'from': SENDER, 'nonce': 7, 'blockNumber': None}
+        milestones, watcher = tracker(eth)
+        milestones.watch(tx(1))
+        await asyncio.sleep(0)
+        first = watcher.futures[tx(1)]
+        first.set_exception(TimeoutError("not mined"))
+        await asyncio.sleep(0.01)
+        rearmed = watcher.futures[tx(1)] is not first
+        after_timeout = [e['milestone'] for e in milestones.history(tx(1))]
+
+        # Mined by another transaction with the same nonce, then evicted from the mempool
+        del eth.mempool[tx(1)]
+        eth.count = 8
+        watcher.futures[tx(1)].set_exception(TimeoutError("not mined"))
+        await asyncio.sleep(0.01)
+        await milestones.stop()
+        return rearmed, after_timeout, [e['milestone'] for e in milestones.history(tx(1))]
+
+    rearmed, after_timeout, events = run(scenario())
+    assert rearmed
+    assert after_timeout == ["broadcast", "seen"]
+    assert events == ["broadcast", "seen", "replaced"]
+
+
+def test_unknown_hashes_are_capped():
+    async def scenario():
+        milestones, _ = tracker(max_unknown=2)
+        milestones.watch(tx(1))
+        milestones.subscribe([tx(1), tx(2), tx(3)])
+        with pytest.raises(WatchLimitError):
+            milestones.subscribe([tx(4)])
+        tracked = set(milestones._txs)
+        await milestones.stop()
+        return tracked
+
+    assert run(scenario()) == {tx(1), tx(2), tx(3)}
+
+
+def test_slow_subscriber_is_cut_off():
+    async def scenario():
+        milestones, _ = tracker(queue_size=2)
+        firehose = milestones.subscribe()
+        for n in range(3):
+            milestones.watch(tx(n))
+        events = [firehose.get_nowait() for _ in range(firehose.qsize())]
+        milestones.watch(tx(9))
+        await milestones.stop()
+        return events, firehose.qsize(), milestones.status()
+
+    events, left, status = run(scenario())
+    assert [e['milestone'] for e in events] == [OVERFLOW]
+    assert left == 0
+    assert status['subscribers'] == 0
+    assert status['overflows'] == 1
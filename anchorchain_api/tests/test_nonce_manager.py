@@ -0,0 +1,131 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from nonce_manager import NonceManager
+
+
+class FakeEth:
+    def __init__(self, count=0, delay=0.0):
+        self.count = count
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+
+    def get_transaction_count(self, address, block_identifier):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("node unreachable")
+        return self.count
+
+
+def manager(count=0, delay=0.0):
+    eth = FakeEth(count, delay)
+    return NonceManager(SimpleNamespace(eth=eth), "0xsender"), eth
+
+
+def test_concurrent_reserve_hands_out_unique_contiguous_nonces():
+    nonces, eth = manager(count=7)
+    results = []
+    barrier = threading.Barrier(16)
+
+    def worker():
+        barrier.wait()
+        for _ in range(50):
+            results.append(nonces.reserve())
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == list(range(7, 7 + 800))
+    # The node is asked once; everything after comes from the local counter
+    assert eth.calls == 1
+
+
+def test_released_nonce_is_reused_before_new_ones():
+    nonces, _ = manager(count=3)
+    first, second, third = nonces.reserve(), nonces.reserve(), nonces.reserve()
+    nonces.confirm(first)
+    nonces.confirm(third)
+    nonces.release(second)
+
+    assert nonces.status()["gaps"] == [4]
+    assert nonces.reserve() == 4
+    assert nonces.reserve() == 6
+
+
+def test_allocate_releases_and_resyncs_when_the_send_fails():
+    nonces, eth = manager(count=0)
+    with nonces.allocate() as ok:
+        pass
+    eth.count = 1
+    with pytest.raises(ValueError):
+        with nonces.allocate() as failed:
+            raise ValueError("rejected")
+
+    assert (ok, failed) == (0, 1)
+    # Node saw nonce 0 only, so 1 is handed out again
+    with nonces.allocate() as retried:
+        pass
+    assert retried == 1
+
+
+def test_resync_fills_gaps_the_node_never_saw():
+    nonces, eth = manager(count=10)
+    for _ in range(5):
+        nonces.confirm(nonces.reserve())  # 10..14 accepted locally
+    eth.count = 12  # node lost 12..14, e.g. it restarted
+    nonces.resync()
+
+    assert nonces.status()["gaps"] == [12, 13, 14]
+    assert [nonces.reserve() for _ in range(4)] == [12, 13, 14, 15]
+
+
+def test_resync_skips_nonces_the_node_already_counts():
+    nonces, eth = manager(count=0)
+    held = nonces.reserve()
+    nonces.release(nonces.reserve())  # 1 released locally...
+    eth.count = 2  # ...but a send with it reached the node after all
+    nonces.resync()
+
+    assert nonces.status()["gaps"] == []
+    assert nonces.reserve() == 2
+    nonces.confirm(held)
+
+
+def test_resync_error_leaves_state_untouched():
+    nonces, eth = manager(count=4)
+    nonces.confirm(nonces.reserve())
+    eth.fail = True
+    with pytest.raises(ConnectionError):
+        nonces.resync()
+
+    assert nonces.status()["next_nonce"] == 5
+    eth.fail = False
+    assert nonces.reserve() == 5
+
+
+def test_resync_does_not_block_senders_on_a_slow_node():
+    nonces, eth = manager(count=0)
+    nonces.confirm(nonces.reserve())
+    eth.count, eth.delay = 1, 0.5
+    resync = threading.Thread(target=nonces.resync)
+    resync.start()
+    time.sleep(0.05)
+
+    started = time.perf_counter()
+    nonce = nonces.reserve()
+    nonces.confirm(nonce)
+    assert time.perf_counter() - started < 0.1
+    resync.join()
+
+    # Confirmed while the stale count (1) was in flight, so not a gap
+    assert nonce == 1
+    assert nonces.status()["gaps"] == []
+    assert nonces.reserve() == 2
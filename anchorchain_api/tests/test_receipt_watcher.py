@@ -0,0 +1,90 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from web3.exceptions import TransactionNotFound
+
+from receipt_watcher import ReceiptWatcher
+
+TX = '0x' + 'ab' * 32
+
+
+class FakeEth:
+    """Chain of ``blocks`` (lists of tx hashes); receipts exist for every included tx"""
+
+    def __init__(self):
+        self.blocks = [[]]
+        self.receipt_calls = 0
+
+    @property
+    def block_number(self):
+        return len(self.blocks) - 1
+
+    def mine(self, *tx_hashes):
+        self.blocks.append(list(tx_hashes))
+
+    def get_block(self, number):
+        return {'transactions': [bytes.fromhex(h[2:]) for h in self.blocks[number]], 'timestamp': number}
+
+    def get_transaction_receipt(self, tx_hash):
+        self.receipt_calls += 1
+        for number, txs in enumerate(self.blocks):
+            if tx_hash in txs:
+                return {'transactionHash': tx_hash, 'blockNumber': number, 'status': 1}
+        raise TransactionNotFound(tx_hash)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_resolves_tx_mined_in_a_block_already_walked():
+    async def scenario():
+        eth = FakeEth()
+        watcher = ReceiptWatcher(SimpleNamespace(eth=eth), poll_interval=0.01, timeout=2)
+        # Keep the loop busy on another waiter so it has a block baseline
+        other = asyncio.ensure_future(watcher.wait('0x' + 'cd' * 32))
+        await asyncio.sleep(0.05)
+        eth.mine(TX)  # automine: included before the caller starts waiting
+        await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        receipt = await asyncio.wait_for(watcher.wait(TX), 1)
+        other.cancel()
+        await watcher.stop()
+        return receipt, time.perf_counter() - started
+
+    receipt, elapsed = run(scenario())
+    assert receipt['blockNumber'] == 1
+    assert elapsed < 0.5
+
+
+def test_resolves_tx_mined_after_waiting_from_the_block_walk():
+    async def scenario():
+        eth = FakeEth()
+        watcher = ReceiptWatcher(SimpleNamespace(eth=eth), poll_interval=0.01, timeout=2)
+        waiter = asyncio.ensure_future(watcher.wait(TX))
+        await asyncio.sleep(0.05)
+        eth.mine()
+        eth.mine(TX)
+        receipt = await asyncio.wait_for(waiter, 1)
+        await watcher.stop()
+        return receipt, eth.receipt_calls
+
+    receipt, calls = run(scenario())
+    assert receipt['blockNumber'] == 2
+    # One direct lookup on registration, one when the walk finds it
+    assert calls == 2
+
+
+def test_times_out_when_never_mined():
+    async def scenario():
+        watcher = ReceiptWatcher(SimpleNamespace(eth=FakeEth()), poll_interval=0.01, timeout=0.1)
+        try:
+            await watcher.wait(TX)
+        except Exception as e:
+            return e
+        finally:
+            await watcher.stop()
+
+    assert 'not in the chain' in str(run(scenario()))
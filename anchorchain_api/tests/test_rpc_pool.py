@@ -0,0 +1,152 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from web3 import Web3
+
+from rpc_pool import PooledHTTPProvider
+
+RAW_TX = '0x' + 'f8' * 40
+
+
+class FakeNode:
+    """JSON-RPC endpoint on localhost: answers eth_blockNumber with ``block`` after ``delay``
+
+    ``send_error`` is returned as the JSON-RPC error of eth_sendRawTransaction.
+    """
+
+    def __init__(self, block=1, delay=0.0, send_error=None):
+        self.block = block
+        self.delay = delay
+        self.send_error = send_error
+        self.methods = []
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                node.methods.append(request['method'])
+                time.sleep(node.delay)
+                response = {'jsonrpc': '2.0', 'id': request['id']}
+                if request['method'] == 'eth_sendRawTransaction' and node.send_error:
+                    response['error'] = {'code': -32000, 'message': node.send_error}
+                elif request['method'] == 'eth_sendRawTransaction':
+                    response['result'] = Web3.keccak(hexstr=request['params'][0]).hex()
+                else:
+                    response['result'] = hex(node.block)
+                body = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.uri = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def dead_uri():
+    """A localhost port nothing listens on"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+@pytest.fixture
+def nodes():
+    started = []
+
+    def start(**kwargs):
+        node = FakeNode(**kwargs)
+        started.append(node)
+        return node
+
+    yield start
+    for node in started:
+        node.close()
+
+
+def test_dead_primary_fails_over_and_leaves_rotation(nodes):
+    backup = nodes(block=7)
+    calls = []
+    provider = PooledHTTPProvider([dead_uri(), backup.uri], timeout=2, max_failures=2, cooldown=60,
+                                  on_request=lambda name, method, seconds, ok: calls.append(ok))
+    w3 = Web3(provider)
+
+    assert w3.eth.block_number == 7
+    assert w3.eth.block_number == 7
+    dead, alive = provider.endpoints
+    assert not dead.healthy and alive.healthy
+    assert provider.ranked()[0] is alive
+    # Once out of rotation the dead node is no longer tried first
+    assert w3.eth.block_number == 7
+    assert calls == [False, True, False, True, True]
+    assert [s["healthy"] for s in provider.status()] == [False, True]
+
+
+def test_slow_endpoint_is_deprioritized(nodes):
+    slow, fast = nodes(block=1, delay=0.2), nodes(block=2)
+    provider = PooledHTTPProvider([slow.uri, fast.uri], timeout=5)
+    w3 = Web3(provider)
+
+    # Both start unmeasured; the first read lands on the slow node
+    assert w3.eth.block_number == 1
+    assert provider.ranked()[0].uri == fast.uri
+    for _ in range(5):
+        assert w3.eth.block_number == 2
+    assert len(slow.methods) == 1
+    assert provider.endpoint_uri == fast.uri
+
+
+def test_errors_weigh_against_a_fast_endpoint(nodes):
+    a, b = nodes(block=1), nodes(block=2)
+    provider = PooledHTTPProvider([a.uri, b.uri], max_failures=10)
+    first, second = provider.endpoints
+    first.latency, second.latency = 0.010, 0.015
+    for ok in (True, False, False, True):
+        first.outcomes.append(ok)
+    # 50% recent errors make 10ms rank behind a clean 15ms
+    assert provider.ranked()[0] is second
+
+
+def test_broadcast_treats_already_known_as_accepted(nodes):
+    known = nodes(send_error="already known")
+    rejecting = nodes(send_error="nonce too low", delay=0.2)
+    provider = PooledHTTPProvider([known.uri, rejecting.uri], broadcast_fanout=2)
+
+    response = provider.make_request('eth_sendRawTransaction', [RAW_TX])
+
+    assert 'error' not in response
+    assert response['result'] == Web3.keccak(hexstr=RAW_TX).hex()
+    # The first accepting node answers the call; join the broadcast still in flight to the other
+    provider._broadcaster.shutdown(wait=True)
+    assert known.methods == rejecting.methods == ['eth_sendRawTransaction']
+
+
+def test_broadcast_returns_the_node_error_when_every_node_rejects(nodes):
+    a, b = nodes(send_error="nonce too low"), nodes(send_error="nonce too low")
+    provider = PooledHTTPProvider([a.uri, b.uri], broadcast_fanout=2)
+
+    response = provider.make_request('eth_sendRawTransaction', [RAW_TX])
+
+    assert response['error']['message'] == "nonce too low"
+
+
+def test_broadcast_skips_a_dead_node(nodes):
+    alive = nodes()
+    provider = PooledHTTPProvider([dead_uri(), alive.uri], broadcast_fanout=2, timeout=2)
+
+    response = provider.make_request('eth_sendRawTransaction', [RAW_TX])
+
+    assert response['result'] == Web3.keccak(hexstr=RAW_TX).hex()
@@ -0,0 +1,115 @@
+import pytest
+from web3 import EthereumTesterProvider, Web3
+
+from signer_pool import SignerPool
+
+
+@pytest.fixture
+def w3():
+    return Web3(EthereumTesterProvider())
+
+
+def funded_keys(w3, count):
+    """Private keys of eth-tester's pre-funded accounts"""
+    return [key.to_hex() for key in w3.provider.ethereum_tester.backend.account_keys[:count]]
+
+
+def transfer(w3, pool, to, value, address=None):
+    """Send ``value`` wei from a pool account through ``allocate``; returns the sender"""
+    with pool.allocate(address) as (signer, nonce):
+        tx = {'to': to, 'value': value, 'gas': 21000, 'gasPrice': w3.eth.gas_price,
+              'nonce': nonce, 'chainId': w3.eth.chain_id}
+        w3.eth.send_raw_transaction(signer.account.sign_transaction(tx).rawTransaction)
+        return signer.address
+
+
+def test_picks_the_signer_with_the_fewest_pending(w3):
+    pool = SignerPool(w3, funded_keys(w3, 3))
+    pool.refresh()
+    busy, backlog, idle = pool.signers
+    busy.in_flight = 2
+    # Two sent but not yet mined, as seen by the last refresh
+    backlog.nonces.reserve()
+    backlog.nonces.confirm(backlog.nonces.reserve())
+
+    for _ in range(3):
+        signer = pool.acquire()
+        assert signer is idle
+        pool.release(signer)
+
+
+def test_ties_rotate_across_signers(w3):
+    pool = SignerPool(w3, funded_keys(w3, 3))
+    sink = w3.eth.accounts[9]
+    senders = [transfer(w3, pool, sink, 1) for _ in range(6)]
+
+    assert sorted(set(senders)) == sorted(s.address for s in pool.signers)
+    assert all(s.in_flight == 0 for s in pool.signers)
+
+
+def test_nonces_stay_contiguous_per_account_on_chain(w3):
+    pool = SignerPool(w3, funded_keys(w3, 3))
+    sink = w3.eth.accounts[9]
+    before = w3.eth.get_balance(sink)
+    for _ in range(12):
+        transfer(w3, pool, sink, 10)
+    pool.refresh()
+
+    assert w3.eth.get_balance(sink) - before == 120
+    for signer in pool.signers:
+        sent = signer.nonces.status()["next_nonce"] or 0
+        assert signer.mined_nonce == sent == w3.eth.get_transaction_count(signer.address)
+        assert signer.pending() == 0
+
+
+def test_refresh_takes_underfunded_accounts_out_of_rotation(w3):
+    pool = SignerPool(w3, funded_keys(w3, 3), min_balance=Web3.to_wei(1, 'ether'))
+    pool.refresh()
+    assert all(s.active for s in pool.signers)
+
+    drained = pool.signers[1]
+    gas_cost = 21000 * w3.eth.gas_price
+    transfer(w3, pool, w3.eth.accounts[9], w3.eth.get_balance(drained.address) - gas_cost - 10, drained.address)
+    pool.refresh()
+
+    assert not drained.active and drained.balance < pool.min_balance
+    assert {transfer(w3, pool, w3.eth.accounts[9], 1) for _ in range(6)} == {
+        s.address for s in pool.signers if s is not drained
+    }
+    with pytest.raises(RuntimeError):
+        pool.acquire(drained.address)
+
+    # Topped up: back in rotation after the next refresh
+    transfer(w3, pool, drained.address, Web3.to_wei(2, 'ether'), pool.signers[0].address)
+    pool.refresh()
+    assert drained.active
+
+
+def test_no_active_signer_is_an_error(w3):
+    pool = SignerPool(w3, funded_keys(w3, 2), min_balance=10 ** 30)
+    pool.refresh()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_allocate_pins_to_an_address(w3):
+    pool = SignerPool(w3, funded_keys(w3, 3))
+    pinned = pool.signers[2].address
+    senders = {transfer(w3, pool, w3.eth.accounts[9], 1, pinned.lower()) for _ in range(4)}
+
+    assert senders == {pinned}
+    assert w3.eth.get_transaction_count(pinned) == 4
+    with pytest.raises(ValueError):
+        pool.acquire('0x' + '00' * 20)
+
+
+def test_failed_send_hands_the_nonce_back(w3):
+    pool = SignerPool(w3, funded_keys(w3, 1))
+    signer = pool.primary
+    with pytest.raises(ValueError):
+        with pool.allocate() as (_, nonce):
+            raise ValueError("rejected")
+
+    assert nonce == 0 and signer.in_flight == 0
+    transfer(w3, pool, w3.eth.accounts[9], 1)
+    assert w3.eth.get_transaction_count(signer.address) == 1
@@ -0,0 +1,80 @@
+import pytest
+from eth_account import Account
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from sim_chain import RESURRECTION_ABI, SIM_CONTRACT_ADDRESS, SOUL_STATE_ABI, SimulatedNode, SimulatedProvider
+
+SOUL_HASH = b'\x01' * 32
+
+
+@pytest.fixture
+def chain():
+    node = SimulatedNode(chain_id=1337, block_time=0.05, seed=1)
+    return node, Web3(SimulatedProvider(node)), Account.create()
+
+
+def send(w3, account, function, gas=300000, nonce=None):
+    tx = function.build_transaction({
+        'from': account.address, 'gas': gas,
+        'nonce': w3.eth.get_transaction_count(account.address, 'pending') if nonce is None else nonce,
+    })
+    return w3.eth.send_raw_transaction(account.sign_transaction(tx).rawTransaction)
+
+
+def test_signed_transaction_is_mined_with_its_event(chain):
+    node, w3, account = chain
+    contract = w3.eth.contract(address=SIM_CONTRACT_ADDRESS, abi=RESURRECTION_ABI)
+
+    tx_hash = send(w3, account, contract.functions.notarizeResurrection(SOUL_HASH))
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=5, poll_latency=0.01)
+
+    assert receipt['status'] == 1
+    (event,) = contract.events.ResurrectionNotarized().process_receipt(receipt)
+    assert event['args']['notarizer'] == account.address
+    assert contract.functions.getRecord(SOUL_HASH).call()[2] == account.address
+    assert w3.eth.get_transaction_count(account.address) == 1
+    with pytest.raises(ContractLogicError, match="Record not found"):
+        contract.functions.verifyResurrection(b'\x02' * 32).call()
+
+
+def test_mempool_rejects_like_a_node(chain):
+    node, w3, account = chain
+    contract = w3.eth.contract(address=SIM_CONTRACT_ADDRESS, abi=RESURRECTION_ABI)
+    tx = contract.functions.notarizeResurrection(SOUL_HASH).build_transaction(
+        {'from': account.address, 'gas': 300000, 'nonce': 0}
+    )
+    raw = account.sign_transaction(tx).rawTransaction
+
+    w3.eth.send_raw_transaction(raw)
+    with pytest.raises(ValueError, match="already known"):
+        w3.eth.send_raw_transaction(raw)
+    w3.eth.wait_for_transaction_receipt(Web3.keccak(raw), timeout=5, poll_latency=0.01)
+    with pytest.raises(ValueError, match="nonce too low"):
+        send(w3, account, contract.functions.notarizeResurrection(b'\x02' * 32), nonce=0)
+
+
+def test_soul_state_reads_honour_the_block(chain):
+    node, w3, account = chain
+    contract = w3.eth.contract(address=SIM_CONTRACT_ADDRESS, abi=SOUL_STATE_ABI)
+
+    receipt = w3.eth.wait_for_transaction_receipt(
+        send(w3, account, contract.functions.anchorSoulStateBatch([SOUL_HASH, SOUL_HASH], ["a", "b"])),
+        timeout=5, poll_latency=0.01
+    )
+    block = receipt['blockNumber']
+
+    assert contract.functions.getSoulStateCount(account.address).call(block_identifier=block) == 2
+    assert contract.functions.getSoulStateCount(account.address).call(block_identifier=block - 1) == 0
+    assert contract.functions.getSoulState(account.address, 1).call()[2] == "b"
+    logs = w3.eth.get_logs({'address': SIM_CONTRACT_ADDRESS, 'fromBlock': block, 'toBlock': block})
+    assert [log['logIndex'] for log in logs] == [0, 1]
+
+
+def test_blocks_advance_with_the_clock(chain):
+    node, w3, _ = chain
+    first = w3.eth.block_number
+    # Two block times pass
+    node.genesis -= 2 * node.block_time
+    assert w3.eth.block_number >= first + 2
+    assert w3.eth.get_block('latest')['number'] == w3.eth.block_number
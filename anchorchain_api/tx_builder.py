@@ -0,0 +1,50 @@
+from eth_account import Account
+from web3 import Web3
+
+
+class TxBuilder:
+    """Builds and signs AnchorChain calls from local state only.
+
+    The signing account is derived once and every function selector and
+    input type list is computed when the contract is loaded. Calldata for
+    single-``bytes32`` calls is the selector concatenated with the hash; other
+    calls go through the ABI codec with the precomputed types. Nonce and fees
+    come from the caller, so nothing here touches the RPC. ``sign`` uses the
+    constructor's account unless another (e.g. from a signer pool) is given.
+    """
+
+    def __init__(self, private_key, contract_address, abi, chain_id, codec):
+        self.account = Account.from_key(private_key)
+        self.to = Web3.to_checksum_address(contract_address)
+        self.chain_id = chain_id
+        self.codec = codec
+        self.selectors = {}
+        self.input_types = {}
+        for item in abi:
+            if item.get('type') != 'function':
+                continue
+            types = [i['type'] for i in item.get('inputs', [])]
+            self.selectors[item['name']] = bytes(Web3.keccak(text=f"{item['name']}({','.join(types)})"))[:4]
+            self.input_types[item['name']] = types
+
+    @property
+    def address(self):
+        return self.account.address
+
+    def encode_bytes32(self, fn_name, value: bytes) -> bytes:
+        return self.selectors[fn_name] + value
+
+    def encode(self, fn_name, *args) -> bytes:
+        return self.selectors[fn_name] + self.codec.encode(self.input_types[fn_name], args)
+
+    def sign(self, data: bytes, gas: int, nonce: int, fees: dict, account=None):
+        tx = {
+            'to': self.to,
+            'data': data,
+            'value': 0,
+            'gas': gas,
+            'nonce': nonce,
+            'chainId': self.chain_id,
+            **fees
+        }
+        return (account or self.account).sign_transaction(tx)
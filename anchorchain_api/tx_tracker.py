@@ -0,0 +1,66 @@
+import time
+from collections import OrderedDict
+
+
+def normalize_tx_hash(tx_hash):
+    if isinstance(tx_hash, (bytes, bytearray)):
+        tx_hash = tx_hash.hex()
+    tx_hash = tx_hash.lower()
+    return tx_hash if tx_hash.startswith('0x') else '0x' + tx_hash
+
+
+class TxTracker:
+    """Bounded in-memory record of submitted transactions and their outcome.
+
+    Entries move from ``pending`` to ``mined`` or ``failed``; the oldest
+    entries are dropped once ``max_entries`` is exceeded. ``on_submit(record)``
+    and ``on_mined(record)`` are called when a transaction is recorded and
+    when its receipt is.
+    """
+
+    def __init__(self, max_entries=10000, on_submit=None, on_mined=None):
+        self.max_entries = max_entries
+        self.on_submit = on_submit
+        self.on_mined = on_mined
+        self._txs = OrderedDict()
+
+    def submit(self, tx_hash, **info):
+        tx_hash = normalize_tx_hash(tx_hash)
+        record = {"tx_hash": tx_hash, "status": "pending", "submitted_at": time.time()}
+        record.update(info)
+        self._txs[tx_hash] = record
+        self._txs.move_to_end(tx_hash)
+        while len(self._txs) > self.max_entries:
+            self._txs.popitem(last=False)
+        if self.on_submit:
+            self.on_submit(record)
+        return record
+
+    def mined(self, tx_hash, receipt):
+        record = self._txs.get(normalize_tx_hash(tx_hash))
+        if record is None:
+            return None
+        now = time.time()
+        record.update({
+            "status": "mined" if receipt['status'] == 1 else "failed",
+            "block_number": receipt['blockNumber'],
+            "gas_used": receipt['gasUsed'],
+            "mined_at": now,
+            "confirmation_time": now - record['submitted_at'],
+        })
+        if self.on_mined:
+            self.on_mined(record)
+        return record
+
+    def failed(self, tx_hash, error):
+        record = self._txs.get(normalize_tx_hash(tx_hash))
+        if record is None:
+            return None
+        record.update({"status": "failed", "error": str(error)})
+        return record
+
+    def get(self, tx_hash):
+        return self._txs.get(normalize_tx_hash(tx_hash))
+
+    def pending(self):
+        return [h for h, r in self._txs.items() if r['status'] == 'pending']
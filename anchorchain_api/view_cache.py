@@ -0,0 +1,145 @@
+import threading
+from collections import OrderedDict
+
+from web3 import Web3
+
+# Events whose first indexed argument is the key a cached view depends on
+INVALIDATING_EVENTS = [
+    "ResurrectionNotarized(bytes32,address,uint256)",
+    "ResurrectionVerified(bytes32,bool)",
+    "SoulStateAnchored(address,bytes32,uint256)",
+]
+EVENT_TOPICS = ['0x' + bytes(Web3.keccak(text=sig)).hex() for sig in INVALIDATING_EVENTS]
+
+
+def _normalize(arg):
+    if isinstance(arg, str):
+        return arg.lower()
+    if isinstance(arg, (bytes, bytearray)):
+        return bytes(arg)
+    return arg
+
+
+def _topic_key(arg):
+    """Map a call argument to the 32-byte form it takes as an indexed event topic"""
+    if isinstance(arg, (bytes, bytearray)) and len(arg) == 32:
+        return bytes(arg)
+    if isinstance(arg, str) and arg.startswith('0x') and len(arg) in (42, 66):
+        return bytes.fromhex(arg[2:]).rjust(32, b'\x00')
+    return None
+
+
+class ViewCache:
+    """Size-bounded LRU read-through cache for contract view calls.
+
+    Entries are keyed by function name, arguments and block tag. Entries read
+    at ``latest`` are dropped when ``sync`` sees an AnchorChain event in a new
+    block whose first indexed argument matches the call's first argument;
+    entries pinned to a block number never change and only age out of the LRU.
+    """
+
+    def __init__(self, max_entries=10000, hits=None, misses=None, evictions=None, max_log_range=1000):
+        self.max_entries = max_entries
+        self.max_log_range = max_log_range
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self._entries = OrderedDict()
+        self._by_topic = {}
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._last_block = None
+
+    def _key(self, fn_name, args, block):
+        return (fn_name, tuple(_normalize(a) for a in args), block)
+
+    def get(self, fn_name, args, block='latest'):
+        """Return ``(found, value)`` without touching the chain"""
+        key = self._key(fn_name, args, block)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                if self.hits:
+                    self.hits.labels(function=fn_name).inc()
+                return True, self._entries[key]
+        if self.misses:
+            self.misses.labels(function=fn_name).inc()
+        return False, None
+
+    def put(self, fn_name, args, value, block='latest', epoch=None, invalidate=True):
+        """Store a result; skipped if an invalidation happened since ``epoch``.
+
+        Pass ``invalidate=False`` for results that cannot change once they
+        exist (e.g. an entry of an append-only array).
+        """
+        key = self._key(fn_name, args, block)
+        with self._lock:
+            if epoch is not None and epoch != self._epoch:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            topic = _topic_key(args[0]) if args and block == 'latest' and invalidate else None
+            if topic is not None:
+                self._by_topic.setdefault(topic, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._forget(old_key)
+                if self.evictions:
+                    self.evictions.labels(function=old_key[0]).inc()
+
+    def epoch(self):
+        return self._epoch
+
+    def call(self, fn, block='latest'):
+        """Read-through wrapper around ``ContractFunction.call``"""
+        found, value = self.get(fn.fn_name, fn.args, block)
+        if found:
+            return value
+        epoch = self._epoch
+        value = fn.call(block_identifier=block)
+        self.put(fn.fn_name, fn.args, value, block, epoch=epoch)
+        return value
+
+    def invalidate(self, topic):
+        with self._lock:
+            self._epoch += 1
+            for key in self._by_topic.pop(bytes(topic), ()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._by_topic.clear()
+
+    def sync(self, w3, address):
+        """Invalidate entries touched by contract events in blocks since the last sync"""
+        head = w3.eth.block_number
+        if self._last_block is None or head - self._last_block > self.max_log_range:
+            if self._last_block is not None:
+                self.clear()
+            self._last_block = head
+            return
+        if head <= self._last_block:
+            return
+        logs = w3.eth.get_logs({
+            "address": address,
+            "fromBlock": self._last_block + 1,
+            "toBlock": head,
+            "topics": [EVENT_TOPICS],
+        })
+        for log in logs:
+            if len(log['topics']) > 1:
+                self.invalidate(log['topics'][1])
+        self._last_block = head
+
+    def _forget(self, key):
+        topic = _topic_key(key[1][0]) if key[1] else None
+        keys = self._by_topic.get(topic)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_topic[topic]
+
+    def __len__(self):
+        return len(self._entries)
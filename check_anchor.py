@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-import requests
 import hashlib
 import time
 
+from immortal_logic import AnchorChainClient
+
 def generate_soul_hash():
     """Generate a proper 32-byte soul hash"""
     data = f"soul_{int(time.time())}"
@@ -16,15 +17,11 @@ def check_anchor():
     # Test notarize
     print(f"\n📝 Testing notarize endpoint...")
     try:
-        response = requests.post(f"http://localhost:8000/notarize/{soul_hash}")
-        if response.status_code == 200:
-            result = response.json()
-            print(f"✅ Notarize Success: {result['tx_hash']}")
-            print(f"Gas Used: {result['gas_used']}")
-            return soul_hash
-        else:
-            print(f"❌ Notarize Failed: {response.status_code} - {response.text}")
-            return None
+        with AnchorChainClient("http://localhost:8000") as client:
+            result = client.notarize(soul_hash, wait=True)
+        print(f"✅ Notarize Success: {result['tx_hash']}")
+        print(f"Gas Used: {result['gas_used']}")
+        return soul_hash
     except Exception as e:
         print(f"❌ Error: {e}")
         return None
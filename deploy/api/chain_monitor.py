@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+
+class ChainMonitor:
+    """Polls the chain head at a fixed interval so handlers never call the RPC for status.
+
+    Each ``poll()`` is one ``eth_getBlockByNumber('latest')``, timed, giving
+    connectivity, head block, block age and RPC latency. ``status()`` returns
+    the last snapshot without touching the network; it reports disconnected
+    until the first poll succeeds.
+    """
+
+    def __init__(self, w3, interval=2.0):
+        self.w3 = w3
+        self.interval = interval
+        self.connected = False
+        self.head_block = None
+        self.block_timestamp = None
+        self.rpc_latency = None
+        self.checked_at = None
+        self.failures = 0
+        self.last_error = None
+
+    def poll(self):
+        started = time.perf_counter()
+        try:
+            block = self.w3.eth.get_block('latest')
+        except Exception as e:
+            self.connected = False
+            self.failures += 1
+            self.last_error = str(e)
+        else:
+            self.rpc_latency = time.perf_counter() - started
+            self.connected = True
+            self.head_block = block['number']
+            self.block_timestamp = block['timestamp']
+            self.failures = 0
+            self.last_error = None
+        self.checked_at = time.time()
+
+    async def run(self):
+        while True:
+            await run_in_threadpool(self.poll)
+            await asyncio.sleep(self.interval)
+
+    def block_age(self):
+        if self.block_timestamp is None:
+            return None
+        return max(0.0, time.time() - self.block_timestamp)
+
+    def status(self):
+        return {
+            "connected": self.connected,
+            "head_block": self.head_block,
+            "block_age_seconds": self.block_age(),
+            "rpc_latency_ms": round(self.rpc_latency * 1000, 1) if self.rpc_latency is not None else None,
+            "checked_at": self.checked_at,
+            "consecutive_failures": self.failures,
+            "last_error": self.last_error,
+        }
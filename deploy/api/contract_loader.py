@@ -0,0 +1,85 @@
+import asyncio
+import json
+import os
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+
+class StartupTimer:
+    """Seconds from process start at which each startup phase completed"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.phases = {}
+
+    def mark(self, phase):
+        self.phases.setdefault(phase, round(time.time() - self.started, 4))
+
+    def status(self):
+        return {"started_at": self.started, "phases": dict(self.phases)}
+
+
+class ContractLoader:
+    """Loads a deployment JSON file off the event loop and reloads it on change.
+
+    ``poll()`` stats the file and, when it appears or its mtime/size change,
+    parses it and calls ``on_load(deployment)`` so the caller can swap its
+    contract object and ABI in place. A file that fails to parse keeps the
+    previous deployment. ``run()`` polls every ``poll_interval`` seconds.
+    """
+
+    def __init__(self, path, on_load, poll_interval=2.0, timer=None):
+        self.path = path
+        self.on_load = on_load
+        self.poll_interval = poll_interval
+        self.timer = timer
+        self.deployment = None
+        self.loaded_at = None
+        self.loads = 0
+        self.last_error = None
+        self._version = None
+
+    @property
+    def loaded(self):
+        return self.deployment is not None
+
+    def poll(self):
+        """Load the file if it changed since the last successful load; True if it was (re)loaded"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._version:
+            return False
+        try:
+            with open(self.path) as f:
+                deployment = json.load(f)
+            self.on_load(deployment)
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Contract loading error: {e}")
+            return False
+        self._version = version
+        self.deployment = deployment
+        self.loaded_at = time.time()
+        self.loads += 1
+        self.last_error = None
+        if self.timer:
+            self.timer.mark("contract_loaded")
+        return True
+
+    async def run(self):
+        while True:
+            await run_in_threadpool(self.poll)
+            await asyncio.sleep(self.poll_interval)
+
+    def status(self):
+        return {
+            "path": self.path,
+            "loaded": self.loaded,
+            "loaded_at": self.loaded_at,
+            "reloads": max(0, self.loads - 1),
+            "last_error": self.last_error,
+        }
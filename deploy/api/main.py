@@ -1,51 +1,159 @@
 import json
 import os
 from fastapi import FastAPI, HTTPException, Depends, Header
-from prometheus_client import Counter, generate_latest, CONTENT_TYPE_LATEST
-from fastapi.responses import Response
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from web3 import Web3
-from typing import Optional
-import time
+from web3.exceptions import TimeExhausted, TransactionNotFound
+from typing import List, Optional
+import asyncio
+from signer_pool import SignerPool
+from tx_tracker import TxTracker
+from batch_reader import BatchReader
+from view_cache import ViewCache
+from event_indexer import EventIndexer
+from fee_oracle import FeeOracle
+from rpc_pool import PooledHTTPProvider
+from contract_loader import ContractLoader, StartupTimer
+from chain_monitor import ChainMonitor
+from receipt_watcher import ReceiptWatcher
+from sim_chain import SOUL_STATE_ABI, SimulatedNode, SimulatedProvider, sim_config
+from eth_account import Account
 
 app = FastAPI(title="AnchorChain API", description="Immortal Logic AnchorChain API")
 
 # Prometheus metrics
 tx_ok_counter = Counter('anchorchain_tx_ok', 'Successful AnchorChain transactions')
 tx_err_counter = Counter('anchorchain_tx_err', 'Failed AnchorChain transactions')
+view_cache_hits = Counter('anchorchain_view_cache_hits_total', 'Contract view calls served from cache', ['function'])
+view_cache_misses = Counter('anchorchain_view_cache_misses_total', 'Contract view calls sent to the RPC', ['function'])
+view_cache_evictions = Counter('anchorchain_view_cache_evictions_total', 'Contract view cache LRU evictions', ['function'])
+fee_base_fee_gwei = Gauge('anchorchain_fee_base_fee_gwei', 'Cached next-block base fee')
+fee_max_fee_gwei = Gauge('anchorchain_fee_max_fee_gwei', 'Cached maxFeePerGas (or legacy gasPrice) served to signers')
+fee_priority_fee_gwei = Gauge('anchorchain_fee_priority_fee_gwei', 'Cached maxPriorityFeePerGas served to signers')
+fee_oracle_staleness_seconds = Gauge('anchorchain_fee_oracle_staleness_seconds', 'Seconds since the fee oracle last refreshed')
+rpc_requests = Counter('anchorchain_rpc_requests_total', 'RPC requests per endpoint', ['endpoint', 'method', 'outcome'])
+rpc_latency_seconds = Histogram('anchorchain_rpc_latency_seconds', 'RPC request latency per endpoint', ['endpoint'])
+rpc_endpoint_healthy = Gauge('anchorchain_rpc_endpoint_healthy', 'Whether an RPC endpoint is in rotation', ['endpoint'])
+chain_connected = Gauge('anchorchain_chain_connected', 'Whether the last chain monitor poll succeeded')
+chain_head_block = Gauge('anchorchain_chain_head_block', 'Latest block number seen by the chain monitor')
+chain_block_age_seconds = Gauge('anchorchain_chain_block_age_seconds', "Seconds since the latest block's timestamp")
+chain_rpc_latency_seconds = Gauge('anchorchain_chain_rpc_latency_seconds', "Latency of the chain monitor's last head query")
+signer_tx_sent = Counter('anchorchain_signer_tx_sent_total', 'Transactions broadcast per signing account', ['address'])
+signer_pending = Gauge('anchorchain_signer_pending', 'Unmined transactions per signing account', ['address'])
+signer_balance_eth = Gauge('anchorchain_signer_balance_eth', 'Balance per signing account', ['address'])
+signer_active = Gauge('anchorchain_signer_active', 'Whether a signing account is in rotation', ['address'])
 
 # Configuration
 API_TOKEN = os.getenv('API_TOKEN', 'demo-token-123')
 RPC_URL = os.getenv('RPC_URL', 'http://anvil:8545')
+RPC_URLS = [u.strip() for u in os.getenv('RPC_URLS', RPC_URL).split(',') if u.strip()]
+RPC_BROADCAST_FANOUT = int(os.getenv('RPC_BROADCAST_FANOUT', '3'))
+RPC_TIMEOUT = float(os.getenv('RPC_TIMEOUT', '10'))
 PRIVATE_KEY = os.getenv('PRIVATE_KEY')
+PRIVATE_KEYS = [k.strip() for k in (os.getenv('PRIVATE_KEYS') or PRIVATE_KEY or '').split(',') if k.strip()]
+SIGNER_MIN_BALANCE_ETH = float(os.getenv('SIGNER_MIN_BALANCE_ETH', '0.01'))
+SOUL_STATE_BATCH_SIZE = int(os.getenv('SOUL_STATE_BATCH_SIZE', '100'))
+VIEW_CACHE_SIZE = int(os.getenv('VIEW_CACHE_SIZE', '10000'))
+CACHE_SYNC_INTERVAL = float(os.getenv('CACHE_SYNC_INTERVAL', '1'))
+FEE_PRIORITY_PERCENTILE = int(os.getenv('FEE_PRIORITY_PERCENTILE', '50'))
+FEE_MIN_PRIORITY_GWEI = float(os.getenv('FEE_MIN_PRIORITY_GWEI', '0'))
+BATCH_GAS_BASE = int(os.getenv('BATCH_GAS_BASE', '50000'))
+BATCH_GAS_PER_ITEM = int(os.getenv('BATCH_GAS_PER_ITEM', '75000'))
+BATCH_MAX_GAS = int(os.getenv('BATCH_MAX_GAS', '0'))
+INDEX_DB_PATH = os.getenv('INDEX_DB_PATH', 'anchorchain_events.db')
+CONTRACT_PATH = os.getenv('CONTRACT_PATH', '/shared/anchor/contract.json')
+CONTRACT_POLL_INTERVAL = float(os.getenv('CONTRACT_POLL_INTERVAL', '2'))
+CHAIN_MONITOR_INTERVAL = float(os.getenv('CHAIN_MONITOR_INTERVAL', '2'))
+RECEIPT_POLL_INTERVAL = float(os.getenv('RECEIPT_POLL_INTERVAL', '1'))
+INDEX_START_BLOCK = int(os.getenv('INDEX_START_BLOCK', '0'))
+INDEX_CHUNK_SIZE = int(os.getenv('INDEX_CHUNK_SIZE', '2000'))
+INDEX_CONFIRMATIONS = int(os.getenv('INDEX_CONFIRMATIONS', '0'))
+# "sim" answers every RPC call from an in-process chain (see sim_chain.py) instead of RPC_URLS
+CHAIN_BACKEND = os.getenv('CHAIN_BACKEND', 'node')
+CHAIN_ID = int(os.getenv('CHAIN_ID', '31337'))
 
 # Web3 setup
 w3 = None
 contract = None
-account = None
+signer_pool = None
+batch_reader = None
+event_indexer = None
+fee_oracle = None
+chain_monitor = None
+receipt_watcher = None
+sim_node = None
+tx_tracker = TxTracker()
+view_cache = ViewCache(VIEW_CACHE_SIZE, hits=view_cache_hits, misses=view_cache_misses, evictions=view_cache_evictions)
+background_tasks = set()
 
-def load_contract():
-    global w3, contract, account
-    try:
-        w3 = Web3(Web3.HTTPProvider(RPC_URL))
-        
-        # Load contract from shared volume
-        contract_path = '/shared/anchor/contract.json'
-        if os.path.exists(contract_path):
-            with open(contract_path, 'r') as f:
-                contract_data = json.load(f)
-            
-            contract = w3.eth.contract(
-                address=contract_data['address'],
-                abi=contract_data['abi']
+def record_rpc(endpoint, method, seconds, ok):
+    rpc_requests.labels(endpoint=endpoint, method=method, outcome="ok" if ok else "error").inc()
+    if ok:
+        rpc_latency_seconds.labels(endpoint=endpoint).observe(seconds)
+
+def setup_clients():
+    """Create the RPC pool and the clients built on it (no network I/O)"""
+    global w3, signer_pool, batch_reader, fee_oracle, chain_monitor, receipt_watcher, sim_node, PRIVATE_KEYS
+    if CHAIN_BACKEND == 'sim':
+        sim_node = SimulatedNode(chain_id=CHAIN_ID, **sim_config(CHAIN_ID))
+        w3 = Web3(SimulatedProvider(sim_node))
+        # Simulated accounts are always funded, so a throwaway key will do
+        PRIVATE_KEYS = PRIVATE_KEYS or [Account.create().key.hex()]
+    else:
+        w3 = Web3(PooledHTTPProvider(
+            RPC_URLS, timeout=RPC_TIMEOUT, broadcast_fanout=RPC_BROADCAST_FANOUT, on_request=record_rpc
+        ))
+    for endpoint in w3.provider.endpoints:
+        rpc_endpoint_healthy.labels(endpoint=endpoint.name).set_function(lambda e=endpoint: float(e.healthy))
+    batch_reader = BatchReader(w3, RPC_URL, chunk_size=SOUL_STATE_BATCH_SIZE)
+    fee_oracle = FeeOracle(
+        w3, percentile=FEE_PRIORITY_PERCENTILE, min_priority_fee=Web3.to_wei(FEE_MIN_PRIORITY_GWEI, 'gwei')
+    )
+    fee_oracle_staleness_seconds.set_function(fee_oracle.staleness)
+    chain_monitor = ChainMonitor(w3, interval=CHAIN_MONITOR_INTERVAL)
+    chain_connected.set_function(lambda: float(chain_monitor.connected))
+    chain_head_block.set_function(lambda: chain_monitor.head_block or 0)
+    chain_block_age_seconds.set_function(lambda: chain_monitor.block_age() or 0)
+    chain_rpc_latency_seconds.set_function(lambda: chain_monitor.rpc_latency or 0)
+    receipt_watcher = ReceiptWatcher(w3, poll_interval=RECEIPT_POLL_INTERVAL)
+    
+    if PRIVATE_KEYS:
+        signer_pool = SignerPool(
+            w3, PRIVATE_KEYS, min_balance=Web3.to_wei(SIGNER_MIN_BALANCE_ETH, 'ether'),
+            on_send=lambda address: signer_tx_sent.labels(address=address).inc()
+        )
+        for signer in signer_pool.signers:
+            signer_pending.labels(address=signer.address).set_function(signer.pending)
+            signer_balance_eth.labels(address=signer.address).set_function(
+                lambda s=signer: float(Web3.from_wei(s.balance or 0, 'ether'))
             )
-            
-            if PRIVATE_KEY:
-                account = w3.eth.account.from_key(PRIVATE_KEY)
-            
-            return True
-    except Exception as e:
-        print(f"Contract loading error: {e}")
-    return False
+            signer_active.labels(address=signer.address).set_function(lambda s=signer: float(s.active))
+
+def apply_deployment(deployment):
+    """Swap in the contract from a (re)written contract.json (called by the loader's thread)"""
+    global contract, event_indexer
+    new_contract = w3.eth.contract(address=deployment['address'], abi=deployment['abi'])
+    if contract is not None and contract.address != new_contract.address:
+        view_cache.clear()
+    contract = new_contract
+    print(f"Contract loaded: {contract.address}")
+    
+    if event_indexer is None:
+        try:
+            event_indexer = EventIndexer(
+                w3, contract.address, INDEX_DB_PATH, start_block=INDEX_START_BLOCK,
+                chunk_size=INDEX_CHUNK_SIZE, confirmations=INDEX_CONFIRMATIONS
+            )
+        except Exception as e:
+            print(f"Event indexer disabled: {e}")
+    elif event_indexer.address != contract.address:
+        # The index database is tied to the address it was built for
+        print(f"Event index still follows {event_indexer.address}; restart with a fresh INDEX_DB_PATH to reindex")
+
+startup_timer = StartupTimer()
+contract_loader = ContractLoader(CONTRACT_PATH, apply_deployment, poll_interval=CONTRACT_POLL_INTERVAL, timer=startup_timer)
 
 def verify_token(authorization: Optional[str] = Header(None)):
     if authorization != f"Bearer {API_TOKEN}":
@@ -53,16 +161,94 @@ def verify_token(authorization: Optional[str] = Header(None)):
 
 @app.on_event("startup")
 async def startup():
-    # Wait for contract deployment
-    for _ in range(30):
-        if load_contract():
-            break
-        time.sleep(2)
+    # Serve immediately; the contract is loaded (and reloaded on change) in the background
+    setup_clients()
+    startup_timer.mark("clients_ready")
+    loops = [chain_monitor.run(), follow_view_cache(), follow_event_index(), follow_fees(), follow_signers()]
+    if sim_node:
+        # The simulated chain has the contract from genesis; there is no contract.json to wait for
+        apply_deployment(sim_node.deployment(SOUL_STATE_ABI))
+    else:
+        loops.append(contract_loader.run())
+    for loop in loops:
+        spawn(loop)
+    startup_timer.mark("serving")
+
+def spawn(coro):
+    """Run a coroutine in the background, keeping a reference until it finishes"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+async def follow_view_cache():
+    """Drop cached soul-state counts touched by SoulStateAnchored events in each new block"""
+    while True:
+        if contract:
+            try:
+                await run_in_threadpool(view_cache.sync, w3, contract.address)
+            except Exception as e:
+                print(f"View cache sync error: {e}")
+        await asyncio.sleep(CACHE_SYNC_INTERVAL)
+
+def refresh_fees():
+    if fee_oracle.refresh():
+        fees = fee_oracle.fees()
+        fee_base_fee_gwei.set(Web3.from_wei(fee_oracle.base_fee or 0, 'gwei'))
+        fee_max_fee_gwei.set(Web3.from_wei(fees.get('maxFeePerGas', fees.get('gasPrice')) or 0, 'gwei'))
+        fee_priority_fee_gwei.set(Web3.from_wei(fees.get('maxPriorityFeePerGas', 0), 'gwei'))
+
+async def follow_fees():
+    """Refresh cached EIP-1559 fees once per new block"""
+    while fee_oracle:
+        try:
+            await run_in_threadpool(refresh_fees)
+        except Exception as e:
+            print(f"Fee oracle error: {e}")
+        await asyncio.sleep(CACHE_SYNC_INTERVAL)
+
+async def follow_event_index():
+    """Backfill the local event index, then keep it at the chain head"""
+    while True:
+        if event_indexer:
+            try:
+                await run_in_threadpool(event_indexer.sync)
+                startup_timer.mark("index_synced")
+            except Exception as e:
+                print(f"Event indexer error: {e}")
+        await asyncio.sleep(CACHE_SYNC_INTERVAL)
+
+async def follow_signers():
+    """Track each signing account's mined nonce and balance once per block"""
+    while signer_pool:
+        try:
+            await run_in_threadpool(signer_pool.refresh)
+        except Exception as e:
+            print(f"Signer pool refresh error: {e}")
+        await asyncio.sleep(CACHE_SYNC_INTERVAL)
 
 @app.get("/")
 async def root():
     return {"message": "AnchorChain API running", "status": "ok"}
 
+@app.get("/live")
+async def live():
+    """Liveness: the event loop is serving requests"""
+    return {"status": "alive"}
+
+@app.get("/ready")
+async def ready(response: Response):
+    """Readiness: a contract is loaded and there is a key to send with"""
+    is_ready = contract is not None and signer_pool is not None
+    if not is_ready:
+        response.status_code = 503
+    return {
+        "ready": is_ready,
+        "contract": contract_loader.status(),
+        "signers": len(signer_pool) if signer_pool else 0,
+        "startup": startup_timer.status()
+    }
+
 @app.get("/health")
 async def health():
     contract_loaded = contract is not None
@@ -70,7 +256,8 @@ async def health():
         "status": "healthy",
         "contract_loaded": contract_loaded,
         "rpc_url": RPC_URL,
-        "chain_connected": w3.is_connected() if w3 else False
+        "chain_connected": chain_monitor.connected if chain_monitor else False,
+        "chain": chain_monitor.status() if chain_monitor else None
     }
 
 from pydantic import BaseModel
@@ -79,66 +266,362 @@ class AnchorRequest(BaseModel):
     soul_hash: str
     metadata: str = ""
 
+def send_transaction(function, gas: int, entity: Optional[str] = None):
+    """Build, sign and broadcast a contract call (blocking; run off the event loop).
+
+    Returns the tx hash and the sending account. ``anchorSoulState`` keeps
+    history per ``msg.sender``, so ``entity`` pins the send to that pool
+    account; otherwise the least-loaded one signs.
+    """
+    with signer_pool.allocate(entity) as (signer, nonce):
+        tx = function.build_transaction({
+            'from': signer.address,
+            'nonce': nonce,
+            'gas': gas,
+            **fee_oracle.fees()
+        })
+        
+        # Sign and send
+        signed_tx = signer.account.sign_transaction(tx)
+        return w3.eth.send_raw_transaction(signed_tx.rawTransaction), signer.address
+
+def send_anchor(hash_bytes: bytes, metadata: str, entity: Optional[str] = None):
+    return send_transaction(contract.functions.anchorSoulState(hash_bytes, metadata), 200000, entity)
+
+def require_entity(entity: Optional[str]):
+    """400 unless ``entity`` is None or one of the pool's signing accounts"""
+    if entity is not None and signer_pool.get(entity) is None:
+        raise HTTPException(status_code=400, detail=f"{entity} is not a signing account of this API")
+
+def known_to_node(tx_hash) -> bool:
+    """Whether the node still has ``tx_hash`` (mempool or chain); errors count as yes"""
+    try:
+        w3.eth.get_transaction(tx_hash)
+    except TransactionNotFound:
+        return False
+    except Exception:
+        return True
+    return True
+
+async def wait_receipt(tx_hash):
+    """Receipt from the shared head-following watcher, or None if not mined within its timeout"""
+    try:
+        return await receipt_watcher.wait(tx_hash)
+    except TimeExhausted:
+        return None
+
+async def track_receipt(tx_hash):
+    """Wait for a submitted anchor in the background and update the tracker.
+
+    A transaction the node still has is waited on again after a timeout; one
+    it no longer knows is marked ``unknown`` rather than ``failed``, as no
+    receipt ever said it failed.
+    """
+    while True:
+        try:
+            receipt = await wait_receipt(tx_hash)
+        except Exception as e:
+            tx_tracker.failed(tx_hash, e)
+            tx_err_counter.inc()
+            return
+        if receipt is not None:
+            break
+        if not await run_in_threadpool(known_to_node, tx_hash):
+            tx_tracker.unknown(tx_hash, "not mined and no longer known to the node")
+            return
+    tx_tracker.mined(tx_hash, receipt)
+    count_receipt(receipt)
+
+def count_receipt(receipt):
+    if receipt.status == 1:
+        tx_ok_counter.inc()
+    else:
+        tx_err_counter.inc()
+
 @app.post("/anchor")
 async def anchor_soul_state(
     request: AnchorRequest,
+    response: Response,
+    wait: bool = False,
+    entity: Optional[str] = None,
     _: str = Depends(verify_token)
 ):
+    """Anchor one soul state; its history is kept under ``entity``, the account that signed"""
     try:
-        if not contract or not account:
+        if not contract or not signer_pool:
             raise HTTPException(status_code=503, detail="Contract not available")
+        require_entity(entity)
         
         # Convert soul_hash to bytes32
         hash_bytes = Web3.keccak(text=request.soul_hash)
         
-        # Build transaction
-        tx = contract.functions.anchorSoulState(hash_bytes, request.metadata).build_transaction({
-            'from': account.address,
-            'nonce': w3.eth.get_transaction_count(account.address),
-            'gas': 200000,
-            'gasPrice': w3.to_wei('20', 'gwei')
-        })
+        tx_hash, entity = await run_in_threadpool(send_anchor, hash_bytes, request.metadata, entity)
+        tx_tracker.submit(tx_hash, soul_hash=request.soul_hash, entity=entity)
         
-        # Sign and send
-        signed_tx = w3.eth.account.sign_transaction(tx, PRIVATE_KEY)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = await wait_receipt(tx_hash) if wait else None
+        if receipt is None:
+            # Not waited for, or still unmined after the watcher's timeout: keep following it
+            spawn(track_receipt(tx_hash))
+            response.status_code = 202
+            return {
+                "transaction_hash": tx_hash.hex(),
+                "status": "pending",
+                "status_url": f"/tx/{tx_hash.hex()}",
+                "entity": entity
+            }
         
-        tx_ok_counter.inc()
+        tx_tracker.mined(tx_hash, receipt)
+        count_receipt(receipt)
         
         return {
             "transaction_hash": receipt.transactionHash.hex(),
             "block_number": receipt.blockNumber,
-            "status": "success",
-            "gas_used": receipt.gasUsed
+            "status": "success" if receipt.status == 1 else "failed",
+            "gas_used": receipt.gasUsed,
+            "entity": entity
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         tx_err_counter.inc()
         raise HTTPException(status_code=500, detail=str(e))
 
+class AnchorBatchRequest(BaseModel):
+    states: List[AnchorRequest]
+
+block_gas_limit = None
+
+def anchor_gas(metadata: str) -> int:
+    # Three struct slots, plus one slot per 32 bytes once metadata no longer fits inline
+    size = len(metadata.encode())
+    return BATCH_GAS_PER_ITEM + (22100 * ((size + 31) // 32) if size > 31 else 0)
+
+def chunk_by_gas(states: list) -> list:
+    """Split states into batches that each stay under half the block gas limit"""
+    global block_gas_limit
+    cap = BATCH_MAX_GAS
+    if not cap:
+        if block_gas_limit is None:
+            block_gas_limit = w3.eth.get_block('latest')['gasLimit']
+        cap = block_gas_limit // 2
+    chunks, current, gas = [], [], BATCH_GAS_BASE
+    for state in states:
+        cost = anchor_gas(state.metadata)
+        if current and gas + cost > cap:
+            chunks.append((current, gas))
+            current, gas = [], BATCH_GAS_BASE
+        current.append(state)
+        gas += cost
+    if current:
+        chunks.append((current, gas))
+    return chunks
+
+@app.post("/anchor/batch")
+async def anchor_soul_state_batch(
+    request: AnchorBatchRequest,
+    response: Response,
+    wait: bool = False,
+    entity: Optional[str] = None,
+    _: str = Depends(verify_token)
+):
+    """Anchor many soul states; without ``entity`` chunks may be signed by different pool accounts"""
+    try:
+        if not contract or not signer_pool:
+            raise HTTPException(status_code=503, detail="Contract not available")
+        if not request.states:
+            raise HTTPException(status_code=400, detail="No soul states given")
+        require_entity(entity)
+        
+        chunks = await run_in_threadpool(chunk_by_gas, request.states)
+        # Sent one at a time, in nonce order, and tracked as soon as each is
+        # broadcast, so a failing chunk does not hide the ones already sent
+        batches, sent = [], []
+        for chunk, gas in chunks:
+            batch = {"transaction_hash": None, "soul_hashes": [state.soul_hash for state in chunk]}
+            batches.append(batch)
+            try:
+                tx_hash, signer_address = await run_in_threadpool(
+                    send_transaction,
+                    contract.functions.anchorSoulStateBatch(
+                        [Web3.keccak(text=state.soul_hash) for state in chunk],
+                        [state.metadata for state in chunk]
+                    ),
+                    gas,
+                    entity
+                )
+            except Exception as e:
+                tx_err_counter.inc()
+                batch.update({"status": "error", "error": str(e)})
+                continue
+            tx_tracker.submit(tx_hash, count=len(chunk), entity=signer_address)
+            batch.update({"transaction_hash": tx_hash.hex(), "entity": signer_address})
+            sent.append((tx_hash, batch))
+        if not sent:
+            raise HTTPException(status_code=500, detail=batches[0]["error"])
+        failed = len(batches) - len(sent)
+        
+        if not wait:
+            for tx_hash, batch in sent:
+                batch["status"] = "pending"
+                spawn(track_receipt(tx_hash))
+            response.status_code = 202
+            return {"status": "pending", "count": len(request.states), "failed_batches": failed, "batches": batches}
+        
+        receipts = await asyncio.gather(*(wait_receipt(tx_hash) for tx_hash, _ in sent), return_exceptions=True)
+        for (tx_hash, batch), receipt in zip(sent, receipts):
+            if receipt is None:
+                spawn(track_receipt(tx_hash))
+                batch["status"] = "pending"
+                continue
+            if isinstance(receipt, Exception):
+                tx_tracker.failed(tx_hash, receipt)
+                tx_err_counter.inc()
+                batch.update({"status": "error", "error": str(receipt)})
+                continue
+            tx_tracker.mined(tx_hash, receipt)
+            count_receipt(receipt)
+            batch.update({
+                "status": "success" if receipt.status == 1 else "failed",
+                "block_number": receipt.blockNumber,
+                "gas_used": receipt.gasUsed
+            })
+        
+        if any(batch["status"] == "pending" for batch in batches):
+            response.status_code = 202
+        statuses = {batch["status"] for batch in batches}
+        if statuses <= {"success", "pending"}:
+            status = "pending" if "pending" in statuses else "success"
+        else:
+            status = "partial"
+        return {"status": status, "count": len(request.states), "failed_batches": failed,
+                "batches": batches}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        tx_err_counter.inc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/tx/{tx_hash}")
+async def transaction_status(tx_hash: str):
+    record = tx_tracker.get(tx_hash)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Transaction not tracked")
+    return record
+
+def require_index():
+    if not event_indexer:
+        raise HTTPException(status_code=503, detail="Event index not available")
+    return event_indexer
+
+@app.get("/index/status")
+async def index_status():
+    return require_index().status()
+
+@app.get("/index/entity/{address}")
+async def index_by_entity(address: str, limit: int = 100, offset: int = 0):
+    events = require_index().query(event="SoulStateAnchored", account=address, limit=limit, offset=offset)
+    return {"entity": address, "events": events}
+
+@app.get("/index/hash/{soul_hash}")
+async def index_by_hash(soul_hash: str, limit: int = 100, offset: int = 0):
+    # Anchored hashes are keccak256 of the submitted soul_hash string (see /anchor)
+    events = require_index().query(soul_hash=Web3.keccak(text=soul_hash).hex(), limit=limit, offset=offset)
+    return {"soul_hash": soul_hash, "events": events}
+
+@app.get("/index/events")
+async def index_by_time(since: int = None, until: int = None, event: str = None, limit: int = 100, offset: int = 0):
+    events = require_index().query(event=event, since=since, until=until, limit=limit, offset=offset)
+    return {"since": since, "until": until, "events": events}
+
+def soul_state_page(address: str, offset: int, limit: Optional[int]):
+    """Pin a block, then read the count and the index range to fetch at it.
+
+    The block is the chain monitor's head, so a page costs no head query
+    once the monitor has polled. The count is cached at ``latest`` with the
+    block it was read at and dropped by ``SoulStateAnchored`` events like any
+    other cached view; a count read at a newer block moves the pin forward,
+    so every index below it exists at the pinned block.
+    """
+    block = chain_monitor.head_block if chain_monitor and chain_monitor.head_block is not None else w3.eth.block_number
+    epoch = view_cache.epoch()
+    found, cached = view_cache.get('getSoulStateCount', (address,))
+    if found:
+        count, read_at = cached
+        block = max(block, read_at)
+    else:
+        count = contract.functions.getSoulStateCount(address).call(block_identifier=block)
+        view_cache.put('getSoulStateCount', (address,), (count, block), epoch=epoch)
+    end = count if limit is None else min(count, offset + limit)
+    return block, count, list(range(offset, max(offset, end)))
+
+def soul_state_chunks(address: str, indexes: list, block):
+    """Yield soul states chunk by chunk, serving cached indexes and batch-reading the rest"""
+    for start in range(0, len(indexes), batch_reader.chunk_size):
+        chunk = indexes[start:start + batch_reader.chunk_size]
+        epoch = view_cache.epoch()
+        states = {}
+        for i in chunk:
+            found, state = view_cache.get('getSoulState', (address, i))
+            if found:
+                states[i] = state
+        misses = [i for i in chunk if i not in states]
+        if misses:
+            fetched = batch_reader.call_many(contract, 'getSoulState', [(address, i) for i in misses], block=block)
+            for i, state in zip(misses, fetched):
+                view_cache.put('getSoulState', (address, i), state, epoch=epoch, invalidate=False)
+                states[i] = state
+        yield [states[i] for i in chunk]
+
+def format_soul_state(state):
+    return {
+        "hash": state[0].hex(),
+        "timestamp": state[1],
+        "metadata": state[2]
+    }
+
 @app.get("/soul-state/{address}")
-async def get_soul_states(address: str):
+async def get_soul_states(address: str, offset: int = 0, limit: Optional[int] = None, stream: bool = False):
     try:
         if not contract:
             raise HTTPException(status_code=503, detail="Contract not available")
         
-        count = contract.functions.getSoulStateCount(address).call()
-        states = []
+        block, count, indexes = await run_in_threadpool(soul_state_page, address, offset, limit)
+        next_offset = indexes[-1] + 1 if indexes and indexes[-1] + 1 < count else None
         
-        for i in range(count):
-            state = contract.functions.getSoulState(address, i).call()
-            states.append({
-                "hash": state[0].hex(),
-                "timestamp": state[1],
-                "metadata": state[2]
-            })
+        if stream:
+            def ndjson():
+                yield json.dumps({"address": address, "block": block, "count": count, "offset": offset,
+                                  "next_offset": next_offset}) + "\n"
+                for chunk in soul_state_chunks(address, indexes, block):
+                    yield "".join(json.dumps(format_soul_state(state)) + "\n" for state in chunk)
+            return StreamingResponse(ndjson(), media_type="application/x-ndjson")
         
-        return {"address": address, "states": states, "count": count}
+        states = await run_in_threadpool(
+            lambda: [state for chunk in soul_state_chunks(address, indexes, block) for state in chunk]
+        )
+        
+        return {
+            "address": address,
+            "block": block,
+            "states": [format_soul_state(state) for state in states],
+            "count": count,
+            "offset": offset,
+            "next_offset": next_offset
+        }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/rpc/status")
+async def rpc_status():
+    return {"endpoints": w3.provider.status() if w3 else []}
+
+@app.get("/signers/status")
+async def signers_status():
+    return {"signers": signer_pool.status() if signer_pool else []}
+
 @app.get("/metrics")
 async def metrics():
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -22,6 +22,20 @@ contract AnchorChain {
         emit SoulStateAnchored(msg.sender, _hash, block.timestamp);
     }
 
+    function anchorSoulStateBatch(bytes32[] calldata _hashes, string[] calldata _metadata) external {
+        require(_hashes.length == _metadata.length, "Length mismatch");
+        
+        for (uint256 i = 0; i < _hashes.length; i++) {
+            soulStates[msg.sender].push(SoulState({
+                hash: _hashes[i],
+                timestamp: block.timestamp,
+                metadata: _metadata[i]
+            }));
+            
+            emit SoulStateAnchored(msg.sender, _hashes[i], block.timestamp);
+        }
+    }
+
     function getSoulStateCount(address _entity) external view returns (uint256) {
         return soulStates[_entity].length;
     }
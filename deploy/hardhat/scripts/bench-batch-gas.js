@@ -0,0 +1,43 @@
+const hre = require("hardhat");
+
+// Gas per record for anchorSoulState vs anchorSoulStateBatch.
+// Run against a local Anvil node started with a high block gas limit so the
+// largest batches fit in one block:
+//   anvil --gas-limit 100000000
+//   npx hardhat run scripts/bench-batch-gas.js --network localhost
+const BATCH_SIZES = (process.env.BATCH_SIZES || "1,10,50,100,250,500").split(",").map(Number);
+const METADATA = process.env.BENCH_METADATA || "bench";
+
+function randomHashes(count) {
+  return Array.from({ length: count }, () => hre.ethers.hexlify(hre.ethers.randomBytes(32)));
+}
+
+async function main() {
+  const AnchorChain = await hre.ethers.getContractFactory("AnchorChain");
+  const anchorChain = await AnchorChain.deploy();
+  await anchorChain.waitForDeployment();
+
+  const single = await (await anchorChain.anchorSoulState(randomHashes(1)[0], METADATA)).wait();
+  const results = [{ mode: "single", size: 1, gasUsed: Number(single.gasUsed), gasPerRecord: Number(single.gasUsed) }];
+
+  for (const size of BATCH_SIZES) {
+    try {
+      const tx = await anchorChain.anchorSoulStateBatch(randomHashes(size), Array(size).fill(METADATA), { gasLimit: 90000000 });
+      const receipt = await tx.wait();
+      const gasUsed = Number(receipt.gasUsed);
+      results.push({ mode: "batch", size, gasUsed, gasPerRecord: Math.round(gasUsed / size) });
+    } catch (error) {
+      results.push({ mode: "batch", size, error: error.shortMessage || error.message });
+    }
+  }
+
+  console.table(results);
+  console.log(JSON.stringify(results));
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error(error);
+    process.exit(1);
+  });
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generator for the AnchorChain APIs.
+
+Requests are scheduled at --rps (fixed or Poisson arrivals) independently of
+when earlier ones finish, and latency is measured from the scheduled start,
+so a slow server shows up as latency instead of as a lower send rate.
+--concurrency switches to a closed loop of N workers. Every write uses a
+fresh soul hash derived from --namespace; arrivals and the target mix come
+from --seed, so two runs with the same flags send the same schedule. The
+upload target streams --upload-kb of soul state per request to
+/anchor/upload and reports bytes/s alongside requests/s. --chain-backend sim
+starts the chosen API locally on the in-process simulated chain
+(CHAIN_BACKEND=sim, seeded from --seed) instead of targeting --url.
+
+    python load_test.py --api anchorchain --targets anchor,verify --rps 50 --duration 30
+    python load_test.py --api sim --targets anchor --concurrency 500 --requests 20000 --output run.json
+    python load_test.py --api deploy --chain-backend sim --targets anchor,soul-state --rps 100 --duration 30
+    python load_test.py --api anchorchain --targets upload --upload-kb 4096 --concurrency 8 --requests 200
+    python load_test.py ... --compare baseline.json
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+# Targets each API variant serves, and where --chain-backend sim finds its ASGI app
+API_TARGETS = {
+    "anchorchain": (("anchor", "notarize", "verify", "record", "upload"), "anchorchain_api", "main:app"),
+    "deploy": (("anchor", "soul-state"), "deploy/api", "main:app"),
+    "sim": (("anchor",), "anchorchain/api", "anchorchain_api:app"),
+}
+
+
+def percentiles(values):
+    if not values:
+        return None
+    values = sorted(values)
+
+    def pick(p):
+        return round(values[min(len(values) - 1, int(p / 100 * len(values)))], 4)
+
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 4),
+        "p50": pick(50),
+        "p90": pick(90),
+        "p99": pick(99),
+        "max": round(values[-1], 4),
+    }
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.targets = args.targets.split(",")
+        self.headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+        self.results = defaultdict(lambda: {"latencies": [], "confirmations": [], "errors": Counter(), "ok": 0,
+                                            "bytes": 0, "hash_mb_s": []})
+        self.sequence = 0
+        self.payload = self.rng.randbytes(args.upload_kb * 1024) if "upload" in self.targets else b""
+
+    def soul_hash(self, index):
+        return hashlib.sha256(f"{self.args.namespace}:{index}".encode()).hexdigest()
+
+    def written_soul_hash(self):
+        """A soul hash already issued by this run, picked from the seeded sequence so runs replay exactly"""
+        return self.soul_hash(self.rng.randrange(1, self.sequence + 1) if self.sequence else 1)
+
+    def build(self, target):
+        """(method, path, body) for one request against ``target``; bytes bodies are sent raw"""
+        api = self.args.api
+        wait = "?wait=true" if self.args.wait else ""
+        if target == "verify":
+            return "POST", f"/verify/{self.written_soul_hash()}{wait}", None
+        if target == "record":
+            return "GET", f"/record/{self.written_soul_hash()}", None
+        if target == "soul-state":
+            return "GET", f"/soul-state/{self.args.entity}?limit={self.args.page_size}", None
+        if target == "upload":
+            # A unique prefix keeps every upload's digest fresh without regenerating the payload
+            self.sequence += 1
+            body = f"{self.args.namespace}:{self.sequence}\n".encode() + self.payload
+            return "POST", f"/anchor/upload?algorithm={self.args.upload_algorithm}{wait.replace('?', '&')}", body
+
+        self.sequence += 1
+        soul_hash = self.soul_hash(self.sequence)
+        if api == "anchorchain":
+            return "POST", f"/{target}/{soul_hash}{wait}", None
+        if api == "deploy":
+            return "POST", f"/anchor{wait}", {"soul_hash": soul_hash, "metadata": "load-test"}
+        body = {
+            "agentId": f"load-{self.sequence}",
+            "sourceEmbodimentId": "load-source",
+            "targetEmbodimentId": "load-target",
+            "identityHash": soul_hash,
+            "missionHash": "load-test",
+            "jurisdiction": "test",
+        }
+        return "POST", "/anchor", body
+
+    async def confirm(self, client, tx_hash, started):
+        """Poll /tx/{hash} until the transaction leaves pending; returns seconds from send"""
+        deadline = time.perf_counter() + self.args.confirm_timeout
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(self.args.confirm_poll)
+            try:
+                response = await client.get(f"/tx/{tx_hash}")
+            except httpx.HTTPError:
+                continue
+            if response.status_code == 200 and response.json().get("status") != "pending":
+                return time.perf_counter() - started
+        return None
+
+    async def one(self, client, target, scheduled):
+        method, path, body = self.build(target)
+        result = self.results[target]
+        try:
+            if isinstance(body, bytes):
+                response = await client.request(method, path, content=body, headers=self.headers)
+            else:
+                response = await client.request(method, path, json=body, headers=self.headers)
+        except httpx.HTTPError as e:
+            result["errors"][type(e).__name__] += 1
+            return
+        finally:
+            result["latencies"].append(time.perf_counter() - scheduled)
+
+        if response.status_code >= 400:
+            result["errors"][f"http_{response.status_code}"] += 1
+            return
+        result["ok"] += 1
+        data = response.json()
+        if isinstance(body, bytes):
+            result["bytes"] += len(body)
+            if (data.get("upload") or {}).get("throughput_mb_s") is not None:
+                result["hash_mb_s"].append(data["upload"]["throughput_mb_s"])
+
+        confirmation = data.get("confirmation_time", data.get("confirmationTime"))
+        tx_hash = data.get("tx_hash") or data.get("transaction_hash")
+        if confirmation is None and response.status_code == 202 and tx_hash and self.args.track_confirmations:
+            confirmation = await self.confirm(client, tx_hash, scheduled)
+        if confirmation is not None:
+            result["confirmations"].append(confirmation)
+
+    def next_target(self):
+        return self.rng.choice(self.targets)
+
+    async def open_loop(self, client):
+        tasks = []
+        interval = 1 / self.args.rps
+        start = time.perf_counter()
+        offset = 0.0
+        for _ in range(self.args.requests or 10 ** 12):
+            if self.args.arrivals == "poisson":
+                offset += self.rng.expovariate(self.args.rps)
+            else:
+                offset += interval
+            if self.args.duration and offset > self.args.duration:
+                break
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(self.one(client, self.next_target(), start + offset)))
+        await asyncio.gather(*tasks)
+
+    async def closed_loop(self, client):
+        start = time.perf_counter()
+        remaining = [self.args.requests or 10 ** 12]
+
+        async def worker():
+            while remaining[0] > 0 and (not self.args.duration or time.perf_counter() - start < self.args.duration):
+                remaining[0] -= 1
+                await self.one(client, self.next_target(), time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(self.args.concurrency)))
+
+    async def run(self):
+        limits = httpx.Limits(max_connections=self.args.max_connections, max_keepalive_connections=self.args.max_connections)
+        async with httpx.AsyncClient(base_url=self.args.url, timeout=self.args.timeout, limits=limits) as client:
+            started = time.perf_counter()
+            if self.args.concurrency:
+                await self.closed_loop(client)
+            else:
+                await self.open_loop(client)
+            elapsed = time.perf_counter() - started
+        return self.report(elapsed)
+
+    def report(self, elapsed):
+        targets = {}
+        for target, result in sorted(self.results.items()):
+            sent = len(result["latencies"])
+            targets[target] = {
+                "sent": sent,
+                "ok": result["ok"],
+                "errors": dict(result["errors"]),
+                "throughput_rps": round(result["ok"] / elapsed, 2),
+                "latency_s": percentiles(result["latencies"]),
+                "confirmation_s": percentiles(result["confirmations"]),
+            }
+            if result["bytes"]:
+                targets[target].update({
+                    "bytes": result["bytes"],
+                    "throughput_bytes_s": round(result["bytes"] / elapsed),
+                    "throughput_mb_s": round(result["bytes"] / 2 ** 20 / elapsed, 2),
+                    # Server-side hashing rate of each upload, as reported in its response
+                    "hash_mb_s": percentiles(result["hash_mb_s"]),
+                })
+        total_ok = sum(t["ok"] for t in targets.values())
+        total_bytes = sum(t.get("bytes", 0) for t in targets.values())
+        report = {
+            "commit": git_commit(),
+            "config": {k: v for k, v in vars(self.args).items() if k not in ("token", "compare", "output")},
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(total_ok / elapsed, 2),
+            "targets": targets,
+        }
+        if total_bytes:
+            report["throughput_mb_s"] = round(total_bytes / 2 ** 20 / elapsed, 2)
+        return report
+
+
+class LocalAPI:
+    """The API under test run with uvicorn on a free local port, chain simulated in-process"""
+
+    def __init__(self, api, seed, startup_timeout=60):
+        _, self.directory, self.app = API_TARGETS[api]
+        self.seed = seed
+        self.startup_timeout = startup_timeout
+        self.process = None
+
+    def __enter__(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        state = tempfile.mkdtemp(prefix="anchorchain-load-")
+        env = {
+            **os.environ, "CHAIN_BACKEND": "sim", "SIM_SEED": str(self.seed),
+            "INDEX_DB_PATH": os.path.join(state, "events.db"),
+            "ANCHOR_SNAPSHOT_PATH": os.path.join(state, "anchors.bin"),
+            "OUTBOX_DB_PATH": os.path.join(state, "outbox.db"),
+        }
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", self.app, "--port", str(port), "--log-level", "warning"],
+            cwd=os.path.join(os.path.dirname(os.path.abspath(__file__)), self.directory), env=env,
+            stdout=sys.stderr  # keep stdout for the report
+        )
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.time() + self.startup_timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"{self.app} in {self.directory} exited with {self.process.returncode}")
+            try:
+                if httpx.get(f"{url}/", timeout=1).status_code < 500:
+                    return url
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        self.__exit__()
+        raise RuntimeError(f"{self.app} in {self.directory} did not start within {self.startup_timeout}s")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def compare(report, baseline):
+    """Relative change of throughput and latency percentiles against a baseline report"""
+    changes = {"throughput_rps": delta(baseline.get("throughput_rps"), report["throughput_rps"])}
+    if "throughput_mb_s" in report:
+        changes["throughput_mb_s"] = delta(baseline.get("throughput_mb_s"), report["throughput_mb_s"])
+    for target, current in report["targets"].items():
+        previous = baseline.get("targets", {}).get(target)
+        if not previous or not previous.get("latency_s") or not current["latency_s"]:
+            continue
+        changes[target] = {p: delta(previous["latency_s"][p], current["latency_s"][p]) for p in ("p50", "p90", "p99")}
+    return {"baseline_commit": baseline.get("commit"), "changes": changes}
+
+
+def delta(before, after):
+    if not before:
+        return None
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AnchorChain API load generator")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--api", choices=sorted(API_TARGETS), default="anchorchain")
+    parser.add_argument("--chain-backend", choices=("node", "sim"), default="node",
+                        help="sim: start --api locally on the simulated chain instead of using --url")
+    parser.add_argument("--targets", default="anchor", help="comma-separated mix, picked uniformly per request")
+    parser.add_argument("--rps", type=float, default=10, help="open-loop arrival rate")
+    parser.add_argument("--arrivals", choices=("fixed", "poisson"), default="fixed")
+    parser.add_argument("--concurrency", type=int, default=0, help="closed loop with N workers instead of --rps")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of arrivals (0 = until --requests)")
+    parser.add_argument("--requests", type=int, default=0, help="stop after N requests (0 = until --duration)")
+    parser.add_argument("--wait", action="store_true", help="ask write endpoints to wait for the receipt")
+    parser.add_argument("--track-confirmations", action="store_true", help="poll /tx/{hash} for 202 responses")
+    parser.add_argument("--confirm-poll", type=float, default=0.5)
+    parser.add_argument("--confirm-timeout", type=float, default=120)
+    parser.add_argument("--entity", default="0x0000000000000000000000000000000000000000", help="address for soul-state reads")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--upload-kb", type=int, default=1024, help="soul-state size per upload request")
+    parser.add_argument("--upload-algorithm", choices=("sha256", "keccak"), default="sha256")
+    parser.add_argument("--token", default="demo-token-123")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--namespace", default=None, help="soul hash namespace (default: seed + start time)")
+    parser.add_argument("--output", help="write the JSON report here as well")
+    parser.add_argument("--compare", help="baseline JSON report to diff against")
+    args = parser.parse_args()
+
+    unknown = set(args.targets.split(",")) - set(API_TARGETS[args.api][0])
+    if unknown:
+        parser.error(f"--api {args.api} has no target(s) {', '.join(sorted(unknown))}")
+    if not args.duration and not args.requests:
+        parser.error("set --duration or --requests")
+    if args.namespace is None:
+        args.namespace = f"{args.seed}-{int(time.time())}"
+
+    if args.chain_backend == "sim":
+        with LocalAPI(args.api, args.seed) as args.url:
+            report = asyncio.run(LoadTest(args).run())
+    else:
+        report = asyncio.run(LoadTest(args).run())
+    if args.compare:
+        with open(args.compare) as f:
+            report["comparison"] = compare(report, json.load(f))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,5 @@
-__all__ = []
+from ._base import AnchorChainError, RetryPolicy
+from .async_client import AsyncAnchorChainClient
+from .client import AnchorChainClient
+
+__all__ = ["AnchorChainClient", "AsyncAnchorChainClient", "AnchorChainError", "RetryPolicy"]
@@ -0,0 +1,169 @@
+import json
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# Status codes worth another attempt for requests that are safe to repeat
+RETRY_STATUSES = (429, 502, 503, 504)
+# Status codes returned before the API acted on the request; retried for any request
+REJECTED_STATUSES = (429, 503)
+# Transport errors raised before the request reached the server; retried for any request
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class AnchorChainError(Exception):
+    """Non-2xx response from the AnchorChain API"""
+
+    def __init__(self, status_code: int, detail: Any, method: str = "", path: str = ""):
+        super().__init__(f"{method} {path} -> {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter: sleep ~ U(0, min(max_delay, base_delay * 2**attempt))"""
+
+    attempts: int = 4
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(self.max_delay, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def should_retry(self, attempt: int, response: Optional[httpx.Response] = None,
+                     error: Optional[Exception] = None, idempotent: bool = True) -> bool:
+        """Whether to try again after ``response`` or transport ``error``.
+
+        A request that is not ``idempotent`` may already have been acted on
+        after a read timeout or a 502/504, so it is only retried when it
+        provably was not: it never reached the server, or was refused.
+        """
+        if attempt + 1 >= self.attempts:
+            return False
+        if response is None:
+            return idempotent or isinstance(error, UNSENT_ERRORS)
+        return response.status_code in (RETRY_STATUSES if idempotent else REJECTED_STATUSES)
+
+
+def normalize_hash(soul_hash) -> str:
+    if isinstance(soul_hash, (bytes, bytearray)):
+        return bytes(soul_hash).hex()
+    return soul_hash[2:] if soul_hash.startswith("0x") else soul_hash
+
+
+def chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+Request = Tuple[str, str, Optional[dict], Optional[dict]]
+
+
+class Endpoints:
+    """Request shapes shared by the sync and async clients.
+
+    Each method returns ``(method, path, params, json)``; the clients only
+    differ in how they send them. ``anchor`` targets the JSON-body
+    ``/anchor`` of the deploy API, which reports the signing account as
+    ``entity``; ``notarize``/``verify`` the path-style
+    endpoints of ``anchorchain_api``. ``verify`` is a read unless
+    ``write=True`` asks for the on-chain ``verifyResurrection`` transaction.
+    """
+
+    @staticmethod
+    def is_idempotent(method: str, path: str, params: Optional[dict] = None) -> bool:
+        """Whether sending the request twice has the effect of sending it once.
+
+        ``anchorchain_api`` deduplicates notarized soul hashes and read-only
+        verification writes nothing. The deploy API's ``/anchor`` endpoints
+        and ``verify?write=true`` send a new transaction on every call.
+        """
+        if method in IDEMPOTENT_METHODS:
+            return True
+        if path.startswith("/notarize/"):
+            return True
+        if path.startswith("/verify/"):
+            return not (params or {}).get("write")
+        return False
+
+    @staticmethod
+    def _wait(wait: bool) -> Optional[dict]:
+        return {"wait": "true"} if wait else None
+
+    @classmethod
+    def _anchor_params(cls, wait: bool, entity: Optional[str]) -> Optional[dict]:
+        # Soul-state history is kept per signing account; ``entity`` pins writes to one
+        return {**(cls._wait(wait) or {}), "entity": entity} if entity else cls._wait(wait)
+
+    def anchor_request(self, soul_hash: str, metadata: str = "", wait: bool = False,
+                       entity: Optional[str] = None) -> Request:
+        return "POST", "/anchor", self._anchor_params(wait, entity), {"soul_hash": soul_hash, "metadata": metadata}
+
+    def anchor_batch_request(self, states: List[Dict[str, str]], wait: bool = False,
+                             entity: Optional[str] = None) -> Request:
+        return "POST", "/anchor/batch", self._anchor_params(wait, entity), {"states": states}
+
+    def notarize_request(self, soul_hash, wait: bool = False) -> Request:
+        return "POST", f"/notarize/{normalize_hash(soul_hash)}", self._wait(wait), None
+
+    def notarize_batch_request(self, soul_hashes: list, wait: bool = False) -> Request:
+        return "POST", "/notarize/batch", self._wait(wait), {"soul_hashes": [normalize_hash(h) for h in soul_hashes]}
+
+    def verify_request(self, soul_hash, wait: bool = False, write: bool = False) -> Request:
+        params = {**(self._wait(wait) or {}), "write": "true"} if write else self._wait(wait)
+        return "POST", f"/verify/{normalize_hash(soul_hash)}", params, None
+
+    def verify_batch_request(self, soul_hashes: list) -> Request:
+        return "POST", "/verify/batch", None, {"soul_hashes": [normalize_hash(h) for h in soul_hashes]}
+
+    def record_request(self, soul_hash) -> Request:
+        return "GET", f"/record/{normalize_hash(soul_hash)}", None, None
+
+    def soul_state_request(self, address: str, offset: int = 0, limit: int = 100) -> Request:
+        return "GET", f"/soul-state/{address}", {"offset": offset, "limit": limit}, None
+
+    def tx_status_request(self, tx_hash: str) -> Request:
+        return "GET", f"/tx/{tx_hash}", None, None
+
+    def tx_events_request(self, tx_hash: str, confirmations: Optional[int] = None) -> Request:
+        return "GET", f"/tx/{tx_hash}/events", {"confirmations": confirmations} if confirmations else None, None
+
+
+def client_kwargs(base_url: str, token: Optional[str], timeout: float, max_connections: int, http2: bool) -> dict:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return {
+        "base_url": base_url.rstrip("/"),
+        "headers": headers,
+        "timeout": timeout,
+        "limits": httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        "http2": http2,
+    }
+
+
+def sse_event(line: str) -> Optional[dict]:
+    """Milestone carried by one line of a Server-Sent Events stream, if it is a data line"""
+    return json.loads(line[len("data: "):]) if line.startswith("data: ") else None
+
+
+def parse(response: httpx.Response, method: str, path: str):
+    if response.status_code >= 400:
+        try:
+            detail = response.json().get("detail", response.text)
+        except ValueError:
+            detail = response.text
+        raise AnchorChainError(response.status_code, detail, method, path)
+    return response.json()
+
+
+def batch_unsupported(error: AnchorChainError) -> bool:
+    """A 404/405 from a batch endpoint means this API variant has none"""
+    return error.status_code in (404, 405)
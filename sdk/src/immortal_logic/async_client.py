@@ -0,0 +1,162 @@
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+from ._base import (
+    AnchorChainError, Endpoints, RetryPolicy, batch_unsupported, chunks, client_kwargs, parse, sse_event,
+)
+
+
+class AsyncAnchorChainClient(Endpoints):
+    """asyncio AnchorChain API client over one keep-alive connection pool.
+
+    Concurrent calls are pipelined over the pooled connections; the
+    ``*_many`` helpers cap in-flight requests at ``concurrency`` and use the
+    batch endpoints when the API has them.
+
+        async with AsyncAnchorChainClient("http://localhost:8000") as client:
+            results = await client.notarize_many(hashes)
+    """
+
+    def __init__(self, base_url: str = "http://localhost:8000", token: Optional[str] = None, timeout: float = 30,
+                 max_connections: int = 100, retry: Optional[RetryPolicy] = None, http2: bool = False):
+        self.retry = retry or RetryPolicy()
+        self._client = httpx.AsyncClient(**client_kwargs(base_url, token, timeout, max_connections, http2))
+        self._batch = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self._client.aclose()
+
+    async def request(self, method: str, path: str, params: Optional[dict] = None, json: Optional[dict] = None,
+                      idempotent: Optional[bool] = None):
+        """Send one request, retrying transport errors and 429/5xx with jittered backoff.
+
+        Requests that are not ``idempotent`` (by default per ``is_idempotent``)
+        are only retried when they never reached the API or were refused.
+        """
+        if idempotent is None:
+            idempotent = self.is_idempotent(method, path, params)
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.request(method, path, params=params, json=json)
+            except httpx.TransportError as e:
+                if not self.retry.should_retry(attempt, error=e, idempotent=idempotent):
+                    raise
+                response = None
+            if response is not None and not self.retry.should_retry(attempt, response, idempotent=idempotent):
+                return parse(response, method, path)
+            await asyncio.sleep(self.retry.delay(attempt, response.headers.get("Retry-After") if response is not None else None))
+            attempt += 1
+
+    async def _send(self, spec):
+        return await self.request(*spec)
+
+    async def health(self) -> dict:
+        return await self.request("GET", "/health")
+
+    async def metrics(self) -> str:
+        """Raw Prometheus exposition text"""
+        response = await self._client.get("/metrics")
+        response.raise_for_status()
+        return response.text
+
+    async def anchor(self, soul_hash: str, metadata: str = "", wait: bool = False, entity: Optional[str] = None) -> dict:
+        return await self._send(self.anchor_request(soul_hash, metadata, wait, entity))
+
+    async def notarize(self, soul_hash, wait: bool = False) -> dict:
+        return await self._send(self.notarize_request(soul_hash, wait))
+
+    async def verify(self, soul_hash, wait: bool = False, write: bool = False) -> dict:
+        return await self._send(self.verify_request(soul_hash, wait, write))
+
+    async def record(self, soul_hash) -> dict:
+        return await self._send(self.record_request(soul_hash))
+
+    async def soul_state(self, address: str, offset: int = 0, limit: int = 100) -> dict:
+        return await self._send(self.soul_state_request(address, offset, limit))
+
+    async def tx_status(self, tx_hash: str) -> dict:
+        return await self._send(self.tx_status_request(tx_hash))
+
+    async def wait_for_tx(self, tx_hash: str, timeout: float = 120, poll_interval: float = 1.0) -> dict:
+        """Poll /tx/{hash} until the transaction is mined or failed"""
+        deadline = time.time() + timeout
+        while True:
+            status = await self.tx_status(tx_hash)
+            if status.get("status") != "pending":
+                return status
+            if time.time() >= deadline:
+                raise TimeoutError(f"Transaction {tx_hash} still pending after {timeout}s")
+            await asyncio.sleep(poll_interval)
+
+    async def tx_events(self, tx_hash: str, confirmations: Optional[int] = None):
+        """Yield milestones from /tx/{hash}/events (broadcast … confirmation) until ``confirmations`` is reached"""
+        method, path, params, _ = self.tx_events_request(tx_hash, confirmations)
+        async with self._client.stream(method, path, params=params, timeout=None) as response:
+            if response.is_error:
+                await response.aread()
+                parse(response, method, path)
+            async for line in response.aiter_lines():
+                event = sse_event(line)
+                if event is not None:
+                    yield event
+
+    async def _bounded(self, calls, concurrency: int) -> list:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(call):
+            async with semaphore:
+                return await call()
+
+        return await asyncio.gather(*(run(call) for call in calls))
+
+    async def _many(self, batch_key, batch_spec, single, items: list, batch_size: int, concurrency: int) -> List[dict]:
+        """Submit ``items`` through the batch endpoint if it exists, else one request each"""
+        if self._batch.get(batch_key, True):
+            batches = list(chunks(items, batch_size))
+            try:
+                # Probe with the first chunk so an API without the endpoint fails fast
+                first = await self._send(batch_spec(batches[0])) if batches else None
+            except AnchorChainError as e:
+                if not batch_unsupported(e):
+                    raise
+                self._batch[batch_key] = False
+            else:
+                self._batch[batch_key] = True
+                rest = await self._bounded([lambda c=c: self._send(batch_spec(c)) for c in batches[1:]], concurrency)
+                return ([first] if first is not None else []) + rest
+        return await self._bounded([lambda i=i: single(i) for i in items], concurrency)
+
+    async def notarize_many(self, soul_hashes: Iterable, wait: bool = False, batch_size: int = 500,
+                            concurrency: int = 64) -> List[dict]:
+        return await self._many(
+            "notarize", lambda chunk: self.notarize_batch_request(chunk, wait),
+            lambda h: self.notarize(h, wait), list(soul_hashes), batch_size, concurrency
+        )
+
+    async def verify_many(self, soul_hashes: Iterable, batch_size: int = 1000, concurrency: int = 64) -> List[dict]:
+        """Read-only verification; returns the per-hash results in order"""
+        results = await self._many(
+            "verify", self.verify_batch_request, self.verify, list(soul_hashes), batch_size, concurrency
+        )
+        if results and "results" in results[0]:
+            return [r for batch in results for r in batch["results"]]
+        return results
+
+    async def anchor_many(self, states: Iterable[Dict[str, str]], wait: bool = False, batch_size: int = 200,
+                          concurrency: int = 64, entity: Optional[str] = None) -> List[dict]:
+        """``states`` are ``{"soul_hash": ..., "metadata": ...}`` dicts"""
+        return await self._many(
+            "anchor", lambda chunk: self.anchor_batch_request(chunk, wait, entity),
+            lambda s: self.anchor(s["soul_hash"], s.get("metadata", ""), wait, entity), list(states), batch_size,
+            concurrency
+        )
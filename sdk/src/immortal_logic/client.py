@@ -0,0 +1,151 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+from ._base import (
+    AnchorChainError, Endpoints, RetryPolicy, batch_unsupported, chunks, client_kwargs, parse, sse_event,
+)
+
+
+class AnchorChainClient(Endpoints):
+    """Blocking AnchorChain API client over one keep-alive connection pool.
+
+    Safe to share between threads; the ``*_many`` helpers fan out over
+    ``concurrency`` threads and use the batch endpoints when the API has them.
+
+        with AnchorChainClient("http://localhost:8000", token="...") as client:
+            client.notarize(soul_hash, wait=True)
+    """
+
+    def __init__(self, base_url: str = "http://localhost:8000", token: Optional[str] = None, timeout: float = 30,
+                 max_connections: int = 100, retry: Optional[RetryPolicy] = None, http2: bool = False):
+        self.retry = retry or RetryPolicy()
+        self._client = httpx.Client(**client_kwargs(base_url, token, timeout, max_connections, http2))
+        self._batch = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._client.close()
+
+    def request(self, method: str, path: str, params: Optional[dict] = None, json: Optional[dict] = None,
+                idempotent: Optional[bool] = None):
+        """Send one request, retrying transport errors and 429/5xx with jittered backoff.
+
+        Requests that are not ``idempotent`` (by default per ``is_idempotent``)
+        are only retried when they never reached the API or were refused.
+        """
+        if idempotent is None:
+            idempotent = self.is_idempotent(method, path, params)
+        attempt = 0
+        while True:
+            try:
+                response = self._client.request(method, path, params=params, json=json)
+            except httpx.TransportError as e:
+                if not self.retry.should_retry(attempt, error=e, idempotent=idempotent):
+                    raise
+                response = None
+            if response is not None and not self.retry.should_retry(attempt, response, idempotent=idempotent):
+                return parse(response, method, path)
+            time.sleep(self.retry.delay(attempt, response.headers.get("Retry-After") if response is not None else None))
+            attempt += 1
+
+    def _send(self, spec):
+        return self.request(*spec)
+
+    def health(self) -> dict:
+        return self.request("GET", "/health")
+
+    def metrics(self) -> str:
+        """Raw Prometheus exposition text"""
+        response = self._client.get("/metrics")
+        response.raise_for_status()
+        return response.text
+
+    def anchor(self, soul_hash: str, metadata: str = "", wait: bool = False, entity: Optional[str] = None) -> dict:
+        return self._send(self.anchor_request(soul_hash, metadata, wait, entity))
+
+    def notarize(self, soul_hash, wait: bool = False) -> dict:
+        return self._send(self.notarize_request(soul_hash, wait))
+
+    def verify(self, soul_hash, wait: bool = False, write: bool = False) -> dict:
+        return self._send(self.verify_request(soul_hash, wait, write))
+
+    def record(self, soul_hash) -> dict:
+        return self._send(self.record_request(soul_hash))
+
+    def soul_state(self, address: str, offset: int = 0, limit: int = 100) -> dict:
+        return self._send(self.soul_state_request(address, offset, limit))
+
+    def tx_status(self, tx_hash: str) -> dict:
+        return self._send(self.tx_status_request(tx_hash))
+
+    def wait_for_tx(self, tx_hash: str, timeout: float = 120, poll_interval: float = 1.0) -> dict:
+        """Poll /tx/{hash} until the transaction is mined or failed"""
+        deadline = time.time() + timeout
+        while True:
+            status = self.tx_status(tx_hash)
+            if status.get("status") != "pending":
+                return status
+            if time.time() >= deadline:
+                raise TimeoutError(f"Transaction {tx_hash} still pending after {timeout}s")
+            time.sleep(poll_interval)
+
+    def tx_events(self, tx_hash: str, confirmations: Optional[int] = None):
+        """Yield milestones from /tx/{hash}/events (broadcast … confirmation) until ``confirmations`` is reached"""
+        method, path, params, _ = self.tx_events_request(tx_hash, confirmations)
+        with self._client.stream(method, path, params=params, timeout=None) as response:
+            if response.is_error:
+                response.aread()
+                parse(response, method, path)
+            for line in response.iter_lines():
+                event = sse_event(line)
+                if event is not None:
+                    yield event
+
+    def _many(self, batch_key, batch_spec, single, items: list, batch_size: int, concurrency: int) -> List[dict]:
+        """Submit ``items`` through the batch endpoint if it exists, else one request each"""
+        results = []
+        if self._batch.get(batch_key, True):
+            try:
+                for chunk in chunks(items, batch_size):
+                    results.append(self._send(batch_spec(chunk)))
+                self._batch[batch_key] = True
+                return results
+            except AnchorChainError as e:
+                if results or not batch_unsupported(e):
+                    raise
+                self._batch[batch_key] = False
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(single, items))
+
+    def notarize_many(self, soul_hashes: Iterable, wait: bool = False, batch_size: int = 500,
+                      concurrency: int = 16) -> List[dict]:
+        return self._many(
+            "notarize", lambda chunk: self.notarize_batch_request(chunk, wait),
+            lambda h: self.notarize(h, wait), list(soul_hashes), batch_size, concurrency
+        )
+
+    def verify_many(self, soul_hashes: Iterable, batch_size: int = 1000, concurrency: int = 16) -> List[dict]:
+        """Read-only verification; returns the per-hash results in order"""
+        results = self._many(
+            "verify", self.verify_batch_request, self.verify, list(soul_hashes), batch_size, concurrency
+        )
+        if results and "results" in results[0]:
+            return [r for batch in results for r in batch["results"]]
+        return results
+
+    def anchor_many(self, states: Iterable[Dict[str, str]], wait: bool = False, batch_size: int = 200,
+                    concurrency: int = 16, entity: Optional[str] = None) -> List[dict]:
+        """``states`` are ``{"soul_hash": ..., "metadata": ...}`` dicts"""
+        return self._many(
+            "anchor", lambda chunk: self.anchor_batch_request(chunk, wait, entity),
+            lambda s: self.anchor(s["soul_hash"], s.get("metadata", ""), wait, entity), list(states), batch_size,
+            concurrency
+        )
@@ -2,11 +2,11 @@
 """
 Immortal Logic EPLS Demo - End-to-end resurrection drill
 """
-import requests
 import time
 import argparse
 import hashlib
-import json
+
+from immortal_logic import AnchorChainClient
 
 def generate_soul_hash(entity_id: str) -> str:
     """Generate a soul state hash"""
@@ -14,24 +14,18 @@ def generate_soul_hash(entity_id: str) -> str:
     data = f"{entity_id}:{timestamp}"
     return hashlib.sha256(data.encode()).hexdigest()
 
-def test_api_endpoint(base_url: str, token: str):
+def test_api_endpoint(client: AnchorChainClient):
     """Test the AnchorChain API"""
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    print(f"🔗 Testing AnchorChain API at {base_url}")
-    
     # Test health endpoint
     try:
-        response = requests.get(f"{base_url}/health")
-        print(f"✅ Health check: {response.json()}")
+        print(f"✅ Health check: {client.health()}")
     except Exception as e:
         print(f"❌ Health check failed: {e}")
         return False
     
     # Test metrics endpoint
     try:
-        response = requests.get(f"{base_url}/metrics")
-        print(f"✅ Metrics endpoint accessible (length: {len(response.text)})")
+        print(f"✅ Metrics endpoint accessible (length: {len(client.metrics())})")
     except Exception as e:
         print(f"❌ Metrics check failed: {e}")
     
@@ -40,21 +34,10 @@ def test_api_endpoint(base_url: str, token: str):
         soul_hash = generate_soul_hash("demo-entity-001")
         metadata = f"Demo resurrection event at {time.strftime('%Y-%m-%d %H:%M:%S')}"
         
-        payload = {
-            "soul_hash": soul_hash,
-            "metadata": metadata
-        }
-        
         print(f"📡 Anchoring soul state: {soul_hash[:16]}...")
-        response = requests.post(f"{base_url}/anchor", json=payload, headers=headers)
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"✅ Anchor successful: {result}")
-            return True
-        else:
-            print(f"❌ Anchor failed: {response.status_code} - {response.text}")
-            return False
+        result = client.anchor(soul_hash, metadata)
+        print(f"✅ Anchor successful: {result}")
+        return True
             
     except Exception as e:
         print(f"❌ Anchor test failed: {e}")
@@ -62,8 +45,8 @@ def test_api_endpoint(base_url: str, token: str):
 
 def main():
     parser = argparse.ArgumentParser(description="Immortal Logic EPLS Demo")
-    parser.add_argument("--mode", choices=["local", "onchain"], default="local",
-                       help="Demo mode: local (mock) or onchain (real blockchain)")
+    parser.add_argument("--mode", choices=["local", "dry", "onchain"], default="local",
+                       help="Demo mode: local/dry (mock) or onchain (real blockchain)")
     parser.add_argument("--api-url", default="http://localhost:8000",
                        help="AnchorChain API URL")
     parser.add_argument("--token", default="demo-token-123",
@@ -74,9 +57,11 @@ def main():
     print("🚀 Immortal Logic EPLS Demo Starting...")
     print(f"Mode: {args.mode}")
     print(f"API URL: {args.api_url}")
+    print(f"🔗 Testing AnchorChain API at {args.api_url}")
     
     # Run the test
-    success = test_api_endpoint(args.api_url, args.token)
+    with AnchorChainClient(args.api_url, token=args.token) as client:
+        success = test_api_endpoint(client)
     
     if success:
         print("\n✅ Demo completed successfully!")
@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+import pytest
+
+from immortal_logic import AnchorChainClient, AnchorChainError, AsyncAnchorChainClient, RetryPolicy
+
+SOUL_HASH = "ab" * 32
+NO_DELAY = RetryPolicy(attempts=4, base_delay=0, max_delay=0)
+
+
+def client(handler):
+    """Sync client whose requests are answered by ``handler`` instead of the network"""
+    sdk = AnchorChainClient("http://api", retry=NO_DELAY)
+    sdk._client = httpx.Client(base_url="http://api", transport=httpx.MockTransport(handler))
+    return sdk
+
+
+def replies(*outcomes):
+    """Handler that answers with ``outcomes`` in turn (a status code, or an exception to raise); records requests"""
+    seen = []
+
+    def handler(request):
+        seen.append((request.method, request.url.path))
+        outcome = outcomes[min(len(seen), len(outcomes)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={"tx_hash": "0x01", "status": "pending", "detail": "upstream"})
+
+    return handler, seen
+
+
+@pytest.mark.parametrize("outcome", [httpx.ReadTimeout("read timed out"), 502])
+def test_anchor_is_not_retried_once_it_may_have_reached_the_api(outcome):
+    handler, seen = replies(outcome, 200)
+
+    with pytest.raises((httpx.ReadTimeout, AnchorChainError)):
+        client(handler).anchor(SOUL_HASH)
+
+    assert seen == [("POST", "/anchor")]
+
+
+@pytest.mark.parametrize("outcome", [httpx.ConnectError("connection refused"), 429])
+def test_anchor_is_retried_when_it_never_reached_the_api(outcome):
+    handler, seen = replies(outcome, 200)
+
+    assert client(handler).anchor(SOUL_HASH)["tx_hash"] == "0x01"
+    assert seen == [("POST", "/anchor"), ("POST", "/anchor")]
+
+
+def test_async_anchor_is_not_retried_after_a_read_timeout():
+    handler, seen = replies(httpx.ReadTimeout("read timed out"), 200)
+
+    async def scenario():
+        sdk = AsyncAnchorChainClient("http://api", retry=NO_DELAY)
+        sdk._client = httpx.AsyncClient(base_url="http://api", transport=httpx.MockTransport(handler))
+        with pytest.raises(httpx.ReadTimeout):
+            await sdk.anchor(SOUL_HASH)
+
+    asyncio.run(scenario())
+    assert seen == [("POST", "/anchor")]
+
+
+def test_missing_batch_endpoint_falls_back_to_single_calls():
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        if request.url.path == "/notarize/batch":
+            return httpx.Response(404, json={"detail": "Not Found"})
+        return httpx.Response(202, json={"tx_hash": "0x" + request.url.path.rsplit("/", 1)[1]})
+
+    sdk = client(handler)
+    hashes = ["11" * 32, "22" * 32]
+
+    assert [r["tx_hash"] for r in sdk.notarize_many(hashes, concurrency=1)] == ["0x" + h for h in hashes]
+    # The batch endpoint is not asked again once it is known to be missing
+    sdk.notarize_many(hashes[:1], concurrency=1)
+    assert seen == ["/notarize/batch", f"/notarize/{hashes[0]}", f"/notarize/{hashes[1]}", f"/notarize/{hashes[0]}"]
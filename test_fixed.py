@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-import requests
 import hashlib
 import time
 
+from immortal_logic import AnchorChainClient
+
 def generate_proper_hash():
     """Generate hash in correct format for contract"""
     data = f"test_{int(time.time())}"
@@ -14,12 +15,8 @@ def test_with_proper_format():
     print(f"Testing with proper hash: {soul_hash}")
     
     try:
-        response = requests.post(f"http://localhost:8000/notarize/{soul_hash}")
-        print(f"Response: {response.status_code}")
-        if response.status_code != 200:
-            print(f"Error: {response.text}")
-        else:
-            print(f"Success: {response.json()}")
+        with AnchorChainClient("http://localhost:8000") as client:
+            print(f"Success: {client.notarize(soul_hash, wait=True)}")
     except Exception as e:
         print(f"Error: {e}")
 
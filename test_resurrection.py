@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
-import requests
 import hashlib
 import time
-import json
+
+from immortal_logic import AnchorChainClient, AnchorChainError
 
 API_BASE = "http://localhost:8000"
 
@@ -15,41 +15,32 @@ def test_resurrection_flow():
     """Test complete resurrection flow"""
     print("🔥 Starting Immortal Logic Resurrection Drill...")
     
-    # Check API status
-    response = requests.get(f"{API_BASE}/")
-    print(f"API Status: {response.json()}")
-    
-    # Generate soul hash
-    soul_hash = generate_soul_hash()
-    print(f"Generated Soul Hash: {soul_hash}")
-    
-    # Notarize resurrection
-    print("📝 Notarizing resurrection...")
-    notarize_response = requests.post(f"{API_BASE}/notarize", 
-                                    json={"soul_hash": soul_hash})
-    
-    if notarize_response.status_code == 200:
-        result = notarize_response.json()
-        print(f"✅ Notarization successful: {result['tx_hash']}")
-        print(f"Gas used: {result['gas_used']}")
-    else:
-        print(f"❌ Notarization failed: {notarize_response.text}")
-        return
-    
-    # Wait a moment
-    time.sleep(2)
-    
-    # Verify resurrection
-    print("🔍 Verifying resurrection...")
-    verify_response = requests.post(f"{API_BASE}/verify", 
-                                  json={"soul_hash": soul_hash})
-    
-    if verify_response.status_code == 200:
-        result = verify_response.json()
-        print(f"✅ Verification successful: {result['tx_hash']}")
-        print(f"Verified: {result['verified']}")
-    else:
-        print(f"❌ Verification failed: {verify_response.text}")
+    with AnchorChainClient(API_BASE) as client:
+        # Check API status
+        print(f"API Status: {client.request('GET', '/')}")
+        
+        # Generate soul hash
+        soul_hash = generate_soul_hash()
+        print(f"Generated Soul Hash: {soul_hash}")
+        
+        # Notarize resurrection
+        print("📝 Notarizing resurrection...")
+        try:
+            result = client.notarize(soul_hash, wait=True)
+            print(f"✅ Notarization successful: {result['tx_hash']}")
+            print(f"Gas used: {result['gas_used']}")
+        except AnchorChainError as e:
+            print(f"❌ Notarization failed: {e.detail}")
+            return
+        
+        # Verify resurrection
+        print("🔍 Verifying resurrection...")
+        try:
+            result = client.verify(soul_hash, wait=True, write=True)
+            print(f"✅ Verification successful: {result['tx_hash']}")
+            print(f"Verified: {result['verified']}")
+        except AnchorChainError as e:
+            print(f"❌ Verification failed: {e.detail}")
     
     print("🎯 Resurrection drill completed!")
 